@@ -18,7 +18,7 @@ st.set_page_config(
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from lexer import lexer
-from parser_1 import parser, source_text
+from parser_1 import parser
 from ast_1 import Program, Block, ConstDecl, VarDecl, Assign, If, While, For, Repeat, Compound, BinaryOp, UnaryOp, VarRef, Literal
 from errors import LexicalError, SyntaxError_
 from compiler import PascalCompiler
@@ -27,7 +27,7 @@ from compiler import PascalCompiler
 #Initialise l'état de la session Streamlit"""
 def init_session_state():
     if 'compiler' not in st.session_state:
-        st.session_state.compiler = PascalCompiler()
+        st.session_state.compiler = PascalCompiler(incremental=True, profile=True)
     if 'last_analysis' not in st.session_state:
         st.session_state.last_analysis = None
     if 'analysis_type' not in st.session_state:
@@ -39,8 +39,23 @@ def display_error(message):
     st.error(f"❌ {message}")
 
 
+#Affiche les mesures par phase de la dernière compilation"""
+def display_profile(stats):
+    if stats is None or not len(stats):
+        return
+    with st.expander(f"⏱️ Profilage par phase ({stats.wall * 1000:.2f} ms)"):
+        st.dataframe([phase.as_dict() for phase in stats], use_container_width=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Exporter en JSON", stats.to_json(indent=2),
+                               file_name="profil.json", mime="application/json")
+        with col2:
+            st.download_button("Exporter pour Prometheus", stats.to_prometheus(),
+                               file_name="profil.prom", mime="text/plain")
+
+
 #Affiche les résultats de l'analyse lexicale"""
-def display_lexical_results(tokens):
+def display_lexical_results(tokens, stats=None):
     st.success("✅ Analyse lexicale terminée avec succès!")
     
     # Statistiques
@@ -49,22 +64,21 @@ def display_lexical_results(tokens):
     with col1:
         st.metric("Total Tokens", len(tokens))
     with col2:
-        unique_types = len(set(token['type'] for token in tokens))
-        st.metric("Types de Tokens", unique_types)
+        # Comptages sur le tableau des types, sans parcourir les tokens en Python
+        st.metric("Types de Tokens", tokens.distinct_types())
     with col3:
-        identifiers = len([t for t in tokens if t['type'] == 'ID'])
-        st.metric("Identifiants", identifiers)
+        st.metric("Identifiants", tokens.count_type('ID'))
+    display_profile(stats)
     
     # Table des tokens
     st.subheader("🔍 Tokens Détectés")
-    token_data = []
-    for token in tokens:
-        token_data.append({
-            'Type': token['type'],
-            'Valeur': str(token['value']),
-            'Ligne': token['line'],
-            'Colonne': token['column']
-        })
+    columns = tokens.as_columns()
+    token_data = {
+        'Type': columns['type'],
+        'Valeur': [str(value) for value in columns['value']],
+        'Ligne': columns['line'],
+        'Colonne': columns['column']
+    }
     
     st.dataframe(token_data, use_container_width=True)
     
@@ -95,7 +109,7 @@ def display_syntax_results(ast):
 
 
 #Affiche l'AST sous forme arborescente"""
-def display_ast_results(ast_tree):
+def display_ast_results(ast_tree, tree_stats):
     st.success("✅ AST construit avec succès!")
     
     st.subheader("🌳 Arbre Syntaxique Abstrait")
@@ -106,10 +120,8 @@ def display_ast_results(ast_tree):
                 height=400,
                 help="Représentation hiérarchique de la structure du programme")
     
-    # Informations sur la structure
-    lines = ast_tree.split('\n')
-    node_count = len([line for line in lines if line.strip()])
-    depth = max(len(line) - len(line.lstrip()) for line in lines if line.strip()) // 2
+    # Informations sur la structure, calculées pendant le rendu de l'arbre
+    node_count, depth = tree_stats
     
     col1, col2 = st.columns(2)
     with col1:
@@ -118,6 +130,22 @@ def display_ast_results(ast_tree):
         st.metric("Profondeur maximale", depth)
 
 
+#Affiche la table des symboles après l'analyse sémantique"""
+def display_semantic_results(analyzer):
+    st.success("✅ Analyse sémantique terminée: aucune erreur de type!")
+
+    st.subheader("🧪 Table des Symboles")
+    symbol_data = []
+    for name, kind, type_name, value in analyzer.symbol_table.entries():
+        symbol_data.append({
+            'Nom': name,
+            'Nature': kind,
+            'Type': type_name,
+            'Valeur': '' if value is None else str(value)
+        })
+    st.dataframe(symbol_data, use_container_width=True)
+
+
 def main():
     # CSS personnalisé
     st.markdown("""
@@ -233,6 +261,16 @@ end."""
             else:
                 st.warning("Veuillez entrer du code Pascal à analyser.")
         
+        if st.button("🧪 Analyse Sémantique", use_container_width=True):
+            if code.strip():
+                st.session_state.compiler.set_source(code)
+                analyzer, error = st.session_state.compiler.semantic_analysis()
+                st.session_state.last_analysis = (analyzer, error)
+                st.session_state.analysis_type = "semantic"
+                st.rerun()
+            else:
+                st.warning("Veuillez entrer du code Pascal à analyser.")
+        
         if st.button("🌳 Construire l'AST", use_container_width=True):
             if code.strip():
                 st.session_state.compiler.set_source(code)
@@ -257,6 +295,7 @@ end."""
         - Analyse lexicale (tokenisation)
         - Analyse syntaxique (parsing)
         - Construction d'AST
+        - Vérification des types
         - Gestion d'erreurs détaillée
         
         **Syntaxe supportée:**
@@ -276,12 +315,17 @@ end."""
         if error:
             display_error(error)
         else:
+            stats = st.session_state.compiler.stats
             if st.session_state.analysis_type == "lexical":
-                display_lexical_results(result)
+                display_lexical_results(result, stats)
             elif st.session_state.analysis_type == "syntax":
                 display_syntax_results(result)
+            elif st.session_state.analysis_type == "semantic":
+                display_semantic_results(result)
             elif st.session_state.analysis_type == "ast":
-                display_ast_results(result)
+                display_ast_results(result, st.session_state.compiler.tree_stats)
+            if st.session_state.analysis_type != "lexical":
+                display_profile(stats)
     else:
         st.info("👋 Utilisez les boutons ci-dessus pour analyser votre code Pascal. Les résultats s'afficheront ici.")
     
@@ -1,51 +1,185 @@
 # arbre syntaxique abstrait
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Union, Any
+import io
 import json
 
 
 """Classe de base pour tous les nœuds AST"""
 class ASTNode:
+    # Pas de __dict__ par instance: chaque nœud ne stocke que ses champs
+    __slots__ = ()
     
     def serialize(self):
         """Sérialise l'AST en dictionnaire JSON-friendly"""
-        def process_value(value):
-            if isinstance(value, ASTNode):
-                return value.serialize()
-            elif isinstance(value, list):
-                return [process_value(item) for item in value if item is not None]
-            elif isinstance(value, (int, float, str, bool)) or value is None:
-                return value
-            else:
-                return str(value)
-        
-        result = {}
-        for key, value in asdict(self).items():
-            result[key] = process_value(value)
-        return result
+        return serialize_tree(self)
     
     def to_tree_string(self, level=0):
         """Convertit l'AST en représentation arborescente textuelle"""
+        out = io.StringIO()
+        render_tree(self, out, level)
+        return out.getvalue()
+
+    def tree_items(self, level):
+        """Lignes du nœud (str) et enfants à afficher ((nœud, niveau)), dans l'ordre"""
         raise NotImplementedError("Chaque nœud doit implémenter cette méthode")
 
-@dataclass
+
+def _child_items(items, child, level):
+    """Ajoute un enfant au niveau donné, ou 'None' à sa place"""
+    if child:
+        items.append((child, level))
+    else:
+        items.append(f"{'  ' * level}None\n")
+
+
+# Noms des champs de chaque classe de nœud, calculés une seule fois
+_FIELD_NAMES = {}
+
+def field_names(cls):
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
+def _json_scalar(value):
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    return str(value)
+
+
+_encode_string = json.encoder.encode_basestring_ascii
+
+def _json_text(value):
+    """Texte JSON d'une valeur scalaire, identique à json.dumps"""
+    cls = value.__class__
+    if cls is int:
+        return int.__repr__(value)
+    if cls is str:
+        return _encode_string(value)
+    if value is None:
+        return 'null'
+    if cls is bool:
+        return 'true' if value else 'false'
+    return json.dumps(_json_scalar(value))
+
+
+def serialize_tree(root):
+    """Convertit l'arbre en dictionnaires imbriqués, en un seul parcours sans récursion.
+    Les éléments None des listes sont omis."""
+    result = {}
+    stack = [(root, result)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, out = pop()
+        for name in _FIELD_NAMES.get(node.__class__) or field_names(node.__class__):
+            value = getattr(node, name)
+            if isinstance(value, ASTNode):
+                child = out[name] = {}
+                push((value, child))
+            elif isinstance(value, list):
+                items = out[name] = []
+                for item in value:
+                    if item is None:
+                        continue
+                    if isinstance(item, ASTNode):
+                        child = {}
+                        items.append(child)
+                        push((item, child))
+                    else:
+                        items.append(_json_scalar(item))
+            else:
+                out[name] = _json_scalar(value)
+    return result
+
+
+def write_json(root, out, flush_every=4096):
+    """Écrit directement le JSON de serialize() dans out (fichier, socket.makefile...),
+    sans construire les dictionnaires intermédiaires ni utiliser la récursion"""
+    buffer = []
+    stack = [root]
+    pop = stack.pop
+    while stack:
+        item = pop()
+        if item.__class__ is str:
+            buffer.append(item)
+            if len(buffer) >= flush_every:
+                out.write(''.join(buffer))
+                buffer.clear()
+            continue
+        # Morceaux du nœud dans l'ordre d'écriture: texte ou nœud enfant
+        pieces = []
+        separator = '{'
+        for name in _FIELD_NAMES.get(item.__class__) or field_names(item.__class__):
+            value = getattr(item, name)
+            prefix = f'{separator}"{name}": '
+            separator = ', '
+            if isinstance(value, ASTNode):
+                pieces.append(prefix)
+                pieces.append(value)
+            elif isinstance(value, list):
+                pieces.append(prefix + '[')
+                first = True
+                for element in value:
+                    if element is None:
+                        continue
+                    if not first:
+                        pieces.append(', ')
+                    first = False
+                    if isinstance(element, ASTNode):
+                        pieces.append(element)
+                    else:
+                        pieces.append(_json_text(element))
+                pieces.append(']')
+            else:
+                pieces.append(prefix + _json_text(value))
+        pieces.append('}' if separator == ', ' else '{}')
+        stack.extend(reversed(pieces))
+    if buffer:
+        out.write(''.join(buffer))
+
+
+def render_tree(root, out, level=0):
+    """Écrit l'arbre de root dans out (objet fichier) avec une pile explicite,
+    sans récursion ni recopie de texte. Retourne (nombre de nœuds, profondeur max)."""
+    write = out.write
+    count = 0
+    depth = 0
+    stack = [(root, level)]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        item = pop()
+        if item.__class__ is str:
+            write(item)
+            continue
+        node, node_level = item
+        count += 1
+        if node_level > depth:
+            depth = node_level
+        extend(reversed(node.tree_items(node_level)))
+    return count, depth - level
+
+@dataclass(slots=True)
 class Program(ASTNode):
     name: str
     block: 'Block'
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        result = f"{indent}Program(name='{self.name}')\n"
+        items = [f"{indent}Program(name='{self.name}')\n"]
         if self.block:
-            result += self.block.to_tree_string(level + 1)
+            items.append((self.block, level + 1))
         else:
-            result += f"{indent}  Block: None\n"
-        return result
+            items.append(f"{indent}  Block: None\n")
+        return items
 
-@dataclass
+@dataclass(slots=True)
 class Block(ASTNode):
     consts: List['ConstDecl'] = field(default_factory=list)
     vars: List['VarDecl'] = field(default_factory=list)
@@ -53,86 +187,82 @@ class Block(ASTNode):
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        result = f"{indent}Block:\n"
+        items = [f"{indent}Block:\n"]
         
         if self.consts:
-            result += f"{indent}  ConstDeclarations:\n"
-            for const in self.consts:
-                if const:
-                    result += const.to_tree_string(level + 2)
+            items.append(f"{indent}  ConstDeclarations:\n")
+            items.extend((const, level + 2) for const in self.consts if const)
         
         if self.vars:
-            result += f"{indent}  VarDeclarations:\n"
-            for var in self.vars:
-                if var:
-                    result += var.to_tree_string(level + 2)
+            items.append(f"{indent}  VarDeclarations:\n")
+            items.extend((var, level + 2) for var in self.vars if var)
         
         if self.statements:
-            result += f"{indent}  Statements:\n"
+            items.append(f"{indent}  Statements:\n")
             for stmt in self.statements:
                 if stmt:
-                    result += stmt.to_tree_string(level + 2)
+                    items.append((stmt, level + 2))
                 else:
-                    result += f"{indent}    [Empty Statement]\n"
+                    items.append(f"{indent}    [Empty Statement]\n")
         
-        return result
+        return items
 
-@dataclass
-class ConstDecl(ASTNode):
+class Declaration(ASTNode):
+    # Identifiant interné du nom (symbol_table.NAMES), posé par le parser;
+    # hors des champs du dataclass, recalculé par symbol_table.name_id s'il manque
+    __slots__ = ('name_id',)
+
+@dataclass(slots=True)
+class ConstDecl(Declaration):
     name: str
     value: 'Literal'
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
         if self.value:
-            return f"{indent}ConstDecl(name='{self.name}', value={self.value.value})\n"
+            return [f"{indent}ConstDecl(name='{self.name}', value={self.value.value})\n"]
         else:
-            return f"{indent}ConstDecl(name='{self.name}', value=None)\n"
+            return [f"{indent}ConstDecl(name='{self.name}', value=None)\n"]
 
-@dataclass
-class VarDecl(ASTNode):
+@dataclass(slots=True)
+class VarDecl(Declaration):
     name: str
     type: str
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        return f"{indent}VarDecl(name='{self.name}', type='{self.type}')\n"
+        return [f"{indent}VarDecl(name='{self.name}', type='{self.type}')\n"]
 
 class Statement(ASTNode):
-    pass
+    __slots__ = ()
 
 class Expression(ASTNode):
-    pass
+    # Type calculé par l'analyse sémantique (attribut absent tant qu'elle n'a pas eu lieu);
+    # hors des champs du dataclass: ni sérialisé, ni comparé
+    __slots__ = ('inferred_type',)
 
-@dataclass
+@dataclass(slots=True)
 class Assign(Statement):
     target: 'VarRef'
     value: Optional[Expression]
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        result = f"{indent}Assign:\n"
-        result += f"{indent}  target:\n"
-        if self.target:
-            result += self.target.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        result += f"{indent}  value:\n"
-        if self.value:
-            result += self.value.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        return result
+        items = [f"{indent}Assign:\n", f"{indent}  target:\n"]
+        _child_items(items, self.target, level + 2)
+        items.append(f"{indent}  value:\n")
+        _child_items(items, self.value, level + 2)
+        return items
 
-@dataclass
+@dataclass(slots=True)
 class If(Statement):
     condition: Expression
     then_stmt: Optional[Statement]
@@ -140,47 +270,33 @@ class If(Statement):
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        result = f"{indent}If:\n"
-        result += f"{indent}  condition:\n"
-        if self.condition:
-            result += self.condition.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        result += f"{indent}  then:\n"
-        if self.then_stmt:
-            result += self.then_stmt.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
+        items = [f"{indent}If:\n", f"{indent}  condition:\n"]
+        _child_items(items, self.condition, level + 2)
+        items.append(f"{indent}  then:\n")
+        _child_items(items, self.then_stmt, level + 2)
         if self.else_stmt:
-            result += f"{indent}  else:\n"
-            result += self.else_stmt.to_tree_string(level + 2)
-        return result
+            items.append(f"{indent}  else:\n")
+            items.append((self.else_stmt, level + 2))
+        return items
 
-@dataclass
+@dataclass(slots=True)
 class While(Statement):
     condition: Expression
     body: Optional[Statement]
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        result = f"{indent}While:\n"
-        result += f"{indent}  condition:\n"
-        if self.condition:
-            result += self.condition.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        result += f"{indent}  body:\n"
-        if self.body:
-            result += self.body.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        return result
+        items = [f"{indent}While:\n", f"{indent}  condition:\n"]
+        _child_items(items, self.condition, level + 2)
+        items.append(f"{indent}  body:\n")
+        _child_items(items, self.body, level + 2)
+        return items
 
-@dataclass
+@dataclass(slots=True)
 class For(Statement):
     var: Optional['VarRef']
     start: Optional[Expression]
@@ -190,66 +306,53 @@ class For(Statement):
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        result = f"{indent}For(var='{self.var.name if self.var else None}', direction='{self.direction}'):\n"
-        result += f"{indent}  start:\n"
-        if self.start:
-            result += self.start.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        result += f"{indent}  end:\n"
-        if self.end:
-            result += self.end.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        result += f"{indent}  body:\n"
-        if self.body:
-            result += self.body.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        return result
+        items = [f"{indent}For(var='{self.var.name if self.var else None}', direction='{self.direction}'):\n",
+                 f"{indent}  start:\n"]
+        _child_items(items, self.start, level + 2)
+        items.append(f"{indent}  end:\n")
+        _child_items(items, self.end, level + 2)
+        items.append(f"{indent}  body:\n")
+        _child_items(items, self.body, level + 2)
+        return items
 
-@dataclass
+@dataclass(slots=True)
 class Repeat(Statement):
     body: List[Optional['Statement']]
     condition: Optional[Expression]
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        result = f"{indent}Repeat:\n"
-        result += f"{indent}  body:\n"
+        items = [f"{indent}Repeat:\n", f"{indent}  body:\n"]
         for stmt in self.body:
             if stmt:
-                result += stmt.to_tree_string(level + 2)
+                items.append((stmt, level + 2))
             else:
-                result += f"{indent}    [Empty Statement]\n"
-        result += f"{indent}  condition:\n"
-        if self.condition:
-            result += self.condition.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        return result
+                items.append(f"{indent}    [Empty Statement]\n")
+        items.append(f"{indent}  condition:\n")
+        _child_items(items, self.condition, level + 2)
+        return items
 
-@dataclass
+@dataclass(slots=True)
 class Compound(Statement):
     statements: List[Optional['Statement']]
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        result = f"{indent}Compound:\n"
+        items = [f"{indent}Compound:\n"]
         for stmt in self.statements:
             if stmt:
-                result += stmt.to_tree_string(level + 1)
+                items.append((stmt, level + 1))
             else:
-                result += f"{indent}  [Empty Statement]\n"
-        return result
+                items.append(f"{indent}  [Empty Statement]\n")
+        return items
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOp(Expression):
     op: str
     left: Optional['Expression']
@@ -257,53 +360,65 @@ class BinaryOp(Expression):
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        result = f"{indent}BinaryOp(op='{self.op}'):\n"
-        result += f"{indent}  left:\n"
-        if self.left:
-            result += self.left.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        result += f"{indent}  right:\n"
-        if self.right:
-            result += self.right.to_tree_string(level + 2)
-        else:
-            result += f"{indent}    None\n"
-        return result
+        items = [f"{indent}BinaryOp(op='{self.op}'):\n", f"{indent}  left:\n"]
+        _child_items(items, self.left, level + 2)
+        items.append(f"{indent}  right:\n")
+        _child_items(items, self.right, level + 2)
+        return items
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOp(Expression):
     op: str
     operand: Optional['Expression']
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        result = f"{indent}UnaryOp(op='{self.op}'):\n"
-        if self.operand:
-            result += self.operand.to_tree_string(level + 1)
-        else:
-            result += f"{indent}  None\n"
-        return result
+        items = [f"{indent}UnaryOp(op='{self.op}'):\n"]
+        _child_items(items, self.operand, level + 1)
+        return items
+
+class Reference(Expression):
+    # Identifiant interné du nom référencé, comme pour Declaration
+    __slots__ = ('name_id',)
 
-@dataclass
-class VarRef(Expression):
+@dataclass(slots=True)
+class VarRef(Reference):
     name: str
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        return f"{indent}VarRef('{self.name}')\n"
+        return [f"{indent}VarRef('{self.name}')\n"]
 
-@dataclass
+@dataclass(slots=True)
 class Literal(Expression):
     value: Any
     lineno: int = 0
     col: int = 0
     
-    def to_tree_string(self, level=0):
+    def tree_items(self, level):
         indent = "  " * level
-        return f"{indent}Literal({self.value})\n"
\ No newline at end of file
+        return [f"{indent}Literal({self.value})\n"]
+
+# Champs enfants de chaque classe de nœud, dans l'ordre: (nom, True) pour une liste
+CHILD_FIELDS = {
+    Program: (('block', False),),
+    Block: (('consts', True), ('vars', True), ('statements', True)),
+    ConstDecl: (('value', False),),
+    VarDecl: (),
+    Assign: (('target', False), ('value', False)),
+    If: (('condition', False), ('then_stmt', False), ('else_stmt', False)),
+    While: (('condition', False), ('body', False)),
+    For: (('var', False), ('start', False), ('end', False), ('body', False)),
+    Repeat: (('body', True), ('condition', False)),
+    Compound: (('statements', True),),
+    BinaryOp: (('left', False), ('right', False)),
+    UnaryOp: (('operand', False),),
+    VarRef: (),
+    Literal: (),
+}
@@ -0,0 +1,274 @@
+"""
+Format binaire compact pour les AST de ast_1
+Table d'étiquettes des types de nœuds, entiers en varint, chaînes internées
+
+Disposition: b'PAST', version, table des chaînes, puis les nœuds en préordre.
+Chaque nœud s'écrit: étiquette, champs scalaires, puis enfants dans l'ordre
+(0 pour un enfant absent, nombre d'éléments avant chaque liste).
+"""
+import struct
+
+from ast_1 import (Program, Block, ConstDecl, VarDecl, Assign, If, While, For,
+                   Repeat, Compound, BinaryOp, UnaryOp, VarRef, Literal)
+
+MAGIC = b'PAST'
+FORMAT_VERSION = 1
+
+# Types de champ: 'str' (chaîne internée), 'pos' (entier >= 0), 'value' (littéral)
+# Enfants: (nom, True) pour une liste de nœuds, (nom, False) pour un nœud
+SCHEMA = (
+    (Program, (('name', 'str'), ('lineno', 'pos'), ('col', 'pos')), (('block', False),)),
+    (Block, (('lineno', 'pos'), ('col', 'pos')),
+     (('consts', True), ('vars', True), ('statements', True))),
+    (ConstDecl, (('name', 'str'), ('lineno', 'pos'), ('col', 'pos')), (('value', False),)),
+    (VarDecl, (('name', 'str'), ('type', 'str'), ('lineno', 'pos'), ('col', 'pos')), ()),
+    (Assign, (('lineno', 'pos'), ('col', 'pos')), (('target', False), ('value', False))),
+    (If, (('lineno', 'pos'), ('col', 'pos')),
+     (('condition', False), ('then_stmt', False), ('else_stmt', False))),
+    (While, (('lineno', 'pos'), ('col', 'pos')), (('condition', False), ('body', False))),
+    (For, (('direction', 'str'), ('lineno', 'pos'), ('col', 'pos')),
+     (('var', False), ('start', False), ('end', False), ('body', False))),
+    (Repeat, (('lineno', 'pos'), ('col', 'pos')), (('body', True), ('condition', False))),
+    (Compound, (('lineno', 'pos'), ('col', 'pos')), (('statements', True),)),
+    (BinaryOp, (('op', 'str'), ('lineno', 'pos'), ('col', 'pos')),
+     (('left', False), ('right', False))),
+    (UnaryOp, (('op', 'str'), ('lineno', 'pos'), ('col', 'pos')), (('operand', False),)),
+    (VarRef, (('name', 'str'), ('lineno', 'pos'), ('col', 'pos')), ()),
+    (Literal, (('value', 'value'), ('lineno', 'pos'), ('col', 'pos')), ()),
+)
+
+# L'étiquette 0 désigne un nœud absent (None)
+TAGS = {cls: tag for tag, (cls, _, _) in enumerate(SCHEMA, 1)}
+BY_TAG = (None,) + SCHEMA
+
+# Types de littéraux
+_NONE, _FALSE, _TRUE, _INT, _REAL, _STR = range(6)
+
+_double = struct.Struct('<d')
+
+
+class _ListHeader:
+    """Marqueur de pile: nombre d'éléments à écrire avant une liste d'enfants"""
+    __slots__ = ('count',)
+
+    def __init__(self, count):
+        self.count = count
+
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def dumps(root):
+    """Encode un AST (en général un Program) en bytes"""
+    strings = {}
+    body = bytearray()
+
+    def intern(text):
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if item is None:
+            body.append(0)
+            continue
+        if item.__class__ is _ListHeader:
+            _write_varint(body, item.count)
+            continue
+        tag = TAGS.get(item.__class__)
+        if tag is None:
+            raise TypeError(f"Nœud non encodable: {type(item).__name__}")
+        _, scalars, children = SCHEMA[tag - 1]
+        _write_varint(body, tag)
+        for name, kind in scalars:
+            value = getattr(item, name)
+            if kind == 'pos':
+                _write_varint(body, value)
+            elif kind == 'str':
+                _write_varint(body, intern(value))
+            else:
+                _write_value(body, value, intern)
+        pending = []
+        for name, is_list in children:
+            value = getattr(item, name)
+            if is_list:
+                pending.append(_ListHeader(len(value)))
+                pending.extend(value)
+            else:
+                pending.append(value)
+        stack.extend(reversed(pending))
+
+    header = bytearray(MAGIC)
+    header.append(FORMAT_VERSION)
+    _write_varint(header, len(strings))
+    for text in strings:
+        encoded = text.encode('utf-8')
+        _write_varint(header, len(encoded))
+        header += encoded
+    return bytes(header + body)
+
+
+def _write_value(out, value, intern):
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        # zigzag: les petits négatifs restent courts
+        _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+    elif isinstance(value, float):
+        out.append(_REAL)
+        out += _double.pack(value)
+    else:
+        out.append(_STR)
+        _write_varint(out, intern(str(value)))
+
+
+class _Reader:
+    __slots__ = ('data', 'pos', 'strings')
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.strings = []
+
+    def varint(self):
+        data = self.data
+        pos = self.pos
+        byte = data[pos]
+        pos += 1
+        result = byte & 0x7F
+        shift = 7
+        while byte & 0x80:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            shift += 7
+        self.pos = pos
+        return result
+
+    def value(self):
+        kind = self.data[self.pos]
+        self.pos += 1
+        if kind == _INT:
+            raw = self.varint()
+            return raw >> 1 if not raw & 1 else -((raw + 1) >> 1)
+        if kind == _REAL:
+            value = _double.unpack_from(self.data, self.pos)[0]
+            self.pos += 8
+            return value
+        if kind == _STR:
+            return self.strings[self.varint()]
+        if kind == _NONE:
+            return None
+        if kind in (_TRUE, _FALSE):
+            return kind == _TRUE
+        raise ValueError(f"Type de littéral inconnu: {kind}")
+
+
+def loads(data):
+    """Décode des bytes produits par dumps() en nœuds ast_1.
+    Lève ValueError si les données sont tronquées, corrompues ou suivies d'octets en trop."""
+    data = memoryview(data)
+    if bytes(data[:4]) != MAGIC:
+        raise ValueError("Format d'AST binaire invalide")
+    if len(data) < 5:
+        raise ValueError("AST binaire tronqué ou corrompu: en-tête incomplet")
+    if data[4] != FORMAT_VERSION:
+        raise ValueError(f"Version d'AST binaire non supportée: {data[4]}")
+    reader = _Reader(data)
+    reader.pos = 5
+    strings = reader.strings
+    varint = reader.varint
+
+    # Cadres en cours: [classe, arguments, enfants, index, liste en cours, restants]
+    stack = []
+    try:
+        for _ in range(varint()):
+            length = varint()
+            end = reader.pos + length
+            if end > len(data):
+                raise IndexError("chaîne au-delà de la fin des données")
+            strings.append(str(data[reader.pos:end], 'utf-8'))
+            reader.pos = end
+        while True:
+            # Lire un nœud (ou None)
+            tag = varint()
+            if tag == 0:
+                value = None
+            else:
+                cls, scalars, children = BY_TAG[tag]
+                kwargs = {}
+                for name, kind in scalars:
+                    if kind == 'pos':
+                        kwargs[name] = varint()
+                    elif kind == 'str':
+                        kwargs[name] = strings[varint()]
+                    else:
+                        kwargs[name] = reader.value()
+                if children:
+                    stack.append([cls, kwargs, children, 0, None, 0])
+                    value = _NEED_CHILD
+                else:
+                    value = cls(**kwargs)
+
+            # Remonter le nœud terminé vers son parent, puis avancer au prochain enfant
+            while True:
+                if value is not _NEED_CHILD:
+                    if not stack:
+                        if reader.pos != len(data):
+                            raise ValueError(f"AST binaire suivi de {len(data) - reader.pos} "
+                                             "octets en trop")
+                        return value
+                    frame = stack[-1]
+                    if frame[4] is not None:
+                        frame[4].append(value)
+                        frame[5] -= 1
+                    else:
+                        frame[1][frame[2][frame[3]][0]] = value
+                        frame[3] += 1
+                frame = stack[-1]
+                if frame[4] is not None:
+                    if frame[5] > 0:
+                        break
+                    frame[1][frame[2][frame[3]][0]] = frame[4]
+                    frame[4] = None
+                    frame[3] += 1
+                if frame[3] == len(frame[2]):
+                    stack.pop()
+                    value = frame[0](**frame[1])
+                    continue
+                if frame[2][frame[3]][1]:
+                    frame[4] = []
+                    frame[5] = varint()
+                    value = _NEED_CHILD
+                    continue
+                break
+    except (IndexError, TypeError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"AST binaire tronqué ou corrompu: {e}") from None
+
+
+# Marqueur interne: le cadre au sommet attend son prochain enfant
+_NEED_CHILD = object()
+
+
+def dump(root, out):
+    """Écrit l'AST encodé dans un fichier binaire"""
+    out.write(dumps(root))
+
+
+def load(source):
+    """Relit un AST depuis un fichier binaire ou des bytes"""
+    if hasattr(source, 'read'):
+        source = source.read()
+    return loads(source)
@@ -0,0 +1,133 @@
+"""
+Compilation par lots de fichiers Mini-Pascal
+Répartit les fichiers sur un pool de processus et écrit un résultat JSON par ligne
+
+Usage: python batch.py [-w N] [-o resultats.jsonl] [--cache-dir DOSSIER] [--all-errors] dossier_ou_motif [...]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Compilateur du processus courant, créé une seule fois par worker
+_compiler = None
+
+
+def _init_worker(cache_dir=None, recover=False):
+    """Initialise le worker: l'import charge les tables LALR une seule fois"""
+    global _compiler
+    from compiler import PascalCompiler
+    cache = None
+    if cache_dir:
+        from cache import CompilationCache
+        cache = CompilationCache(directory=cache_dir)
+    _compiler = PascalCompiler(cache=cache, recover=recover)
+
+
+def compile_file(path):
+    """Compile un fichier et retourne son résultat sous forme de dictionnaire"""
+    if _compiler is None:
+        _init_worker()
+    start = time.perf_counter()
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            source = f.read()
+    except OSError as e:
+        return {'file': path, 'success': False, 'tokens': 0,
+                'errors': [f"Lecture impossible: {e}"], 'read_ms': 0.0, 'compile_ms': 0.0}
+    read = time.perf_counter()
+    success = _compiler.compile(source)
+    done = time.perf_counter()
+    return {
+        'file': path,
+        'success': success,
+        'tokens': len(_compiler.tokens),
+        'errors': list(_compiler.errors),
+        'read_ms': round((read - start) * 1000, 3),
+        'compile_ms': round((done - read) * 1000, 3),
+    }
+
+
+def expand_inputs(inputs):
+    """Liste les fichiers .pas désignés par des dossiers, des motifs ou des chemins"""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                files.extend(os.path.join(root, name) for name in names
+                             if name.lower().endswith('.pas'))
+        elif glob.has_magic(item):
+            files.extend(path for path in glob.glob(item, recursive=True) if os.path.isfile(path))
+        else:
+            files.append(item)
+    # Ordre stable et sans doublons
+    return sorted(set(files))
+
+
+def run_batch(files, workers=None, out=sys.stdout, chunksize=None, cache_dir=None, recover=False):
+    """Compile les fichiers et écrit les résultats au fil de l'eau; retourne le bilan"""
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, min(64, len(files) // (workers * 4)))
+    summary = {'files': 0, 'succeeded': 0, 'failed': 0, 'tokens': 0}
+    start = time.perf_counter()
+
+    def record(result):
+        out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        summary['files'] += 1
+        summary['tokens'] += result['tokens']
+        summary['succeeded' if result['success'] else 'failed'] += 1
+
+    if workers == 1:
+        _init_worker(cache_dir, recover)
+        for path in files:
+            record(compile_file(path))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(cache_dir, recover)) as pool:
+            for result in pool.map(compile_file, files, chunksize=chunksize):
+                record(result)
+
+    elapsed = time.perf_counter() - start
+    summary['workers'] = workers
+    summary['seconds'] = round(elapsed, 3)
+    summary['files_per_second'] = round(summary['files'] / elapsed, 1) if elapsed else 0.0
+    summary['tokens_per_second'] = round(summary['tokens'] / elapsed, 1) if elapsed else 0.0
+    return summary
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Compilation par lots de programmes Mini-Pascal")
+    arg_parser.add_argument('inputs', nargs='+', help="fichiers, dossiers ou motifs glob (**/*.pas)")
+    arg_parser.add_argument('-w', '--workers', type=int, default=None,
+                            help="nombre de processus (défaut: nombre de cœurs)")
+    arg_parser.add_argument('-o', '--output', default='-',
+                            help="fichier JSON Lines de sortie (défaut: sortie standard)")
+    arg_parser.add_argument('--cache-dir', default=None,
+                            help="dossier du cache de compilation partagé par les workers")
+    arg_parser.add_argument('--all-errors', action='store_true',
+                            help="signaler toutes les erreurs lexicales et syntaxiques de chaque fichier")
+    args = arg_parser.parse_args(argv)
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("Aucun fichier .pas trouvé", file=sys.stderr)
+        return 1
+
+    if args.output == '-':
+        summary = run_batch(files, args.workers, sys.stdout, cache_dir=args.cache_dir,
+                            recover=args.all_errors)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            summary = run_batch(files, args.workers, out, cache_dir=args.cache_dir,
+                                recover=args.all_errors)
+
+    print(json.dumps(summary), file=sys.stderr)
+    return 0 if summary['failed'] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
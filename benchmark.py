@@ -0,0 +1,1205 @@
+"""
+Mesures de performance du compilateur Mini-Pascal
+Usage: python benchmark.py [nom_du_benchmark ...]
+"""
+import gc
+import sys
+import time
+
+
+def timed(func, *args, repeat=5, **kwargs):
+    """Retourne le meilleur temps (en secondes) de plusieurs exécutions"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def generate_program(statements=1000, per_line=1, name='bench'):
+    """Génère un programme Mini-Pascal valide de la taille demandée"""
+    lines = [f"program {name};", "const K = 3;", "var i, x, y : integer;", "begin"]
+    body = []
+    for n in range(statements):
+        kind = n % 4
+        if kind == 0:
+            body.append(f"x := x + {n} * K")
+        elif kind == 1:
+            body.append("if x > y then y := x - 1 else y := y + 2")
+        elif kind == 2:
+            body.append("for i := 1 to 3 do x := x + i div 2")
+        else:
+            body.append("while y > 100 do y := y mod 7")
+    for start in range(0, len(body), per_line):
+        lines.append("  " + "; ".join(body[start:start + per_line]) + ";")
+    lines.append("end.")
+    return "\n".join(lines)
+
+
+def bench_startup():
+    """Temps de construction du parser: tables précalculées contre régénération"""
+    import ply.yacc as yacc
+    import parser_1
+
+    def load_tables():
+        # Forcer la relecture du module de tables à chaque mesure
+        sys.modules.pop(parser_1.TABMODULE, None)
+        yacc.yacc(module=parser_1, debug=False, write_tables=False,
+                  tabmodule=parser_1.TABMODULE, outputdir=parser_1.TABDIR)
+
+    def rebuild_tables():
+        yacc.yacc(module=parser_1, debug=False, write_tables=False,
+                  tabmodule='_parsetab_absent', outputdir=parser_1.TABDIR)
+
+    loaded = timed(load_tables)
+    rebuilt = timed(rebuild_tables)
+    print(f"Grammaire {parser_1.GRAMMAR_HASH[:12]}")
+    print(f"  tables chargées   : {loaded * 1000:8.2f} ms")
+    print(f"  tables régénérées : {rebuilt * 1000:8.2f} ms  (x{rebuilt / loaded:.1f})")
+
+
+def bench_columns():
+    """Calcul des colonnes: rfind par token contre index des débuts de ligne"""
+    from lexer import lexer
+    from line_index import LineIndex
+
+    # Lignes longues: le cas où rfind parcourt le plus de texte par token
+    source = generate_program(4000, per_line=4000)
+    lexer.input(source)
+    positions = []
+    tok = lexer.token()
+    while tok:
+        positions.append(tok.lexpos)
+        tok = lexer.token()
+
+    def with_rfind():
+        for pos in positions:
+            pos - source.rfind('\n', 0, pos)
+
+    def with_index():
+        index = LineIndex(source)
+        for pos in positions:
+            index.column(pos)
+
+    old = timed(with_rfind)
+    new = timed(with_index)
+    print(f"{len(positions)} tokens, {len(source)} caractères")
+    print(f"  rfind        : {old * 1000:8.2f} ms")
+    print(f"  LineIndex    : {new * 1000:8.2f} ms  (x{old / new:.1f})")
+
+
+def bench_pipeline():
+    """Compilation complète: tokens rejoués dans le parser contre second passage du lexer"""
+    from compiler import PascalCompiler
+
+    source = generate_program(5000)
+    compiler = PascalCompiler()
+
+    def single_pass():
+        compiler.set_source('')
+        compiler.compile(source)
+
+    def two_passes():
+        compiler.set_source('')
+        compiler.set_source(source)
+        compiler.lexical_analysis()
+        compiler.token_buffer = None
+        compiler.syntactic_analysis()
+
+    new = timed(single_pass, repeat=3)
+    old = timed(two_passes, repeat=3)
+    print(f"{len(compiler.tokens)} tokens")
+    print(f"  lexer relancé     : {old * 1000:8.2f} ms")
+    print(f"  tokens rejoués    : {new * 1000:8.2f} ms  (x{old / new:.2f})")
+
+
+def bench_threads():
+    """Débit des compilations concurrentes (isolation: tests/test_threads.py)"""
+    from concurrent.futures import ThreadPoolExecutor
+    from compiler import PascalCompiler
+
+    sources = [generate_program(50 + 37 * n, per_line=1 + n % 3, name=f"p{n}") for n in range(16)]
+
+    def run(source):
+        PascalCompiler().compile(source)
+
+    jobs = sources * 8
+    sequential = timed(lambda: [run(source) for source in jobs], repeat=1)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        threaded = timed(lambda: list(pool.map(run, jobs)), repeat=1)
+    print(f"{len(jobs)} compilations")
+    print(f"  séquentiel : {sequential * 1000:8.1f} ms ({len(jobs) / sequential:.0f} programmes/s)")
+    print(f"  8 threads  : {threaded * 1000:8.1f} ms ({len(jobs) / threaded:.0f} programmes/s)")
+
+
+def bench_batch():
+    """Compilation par lots: débit selon le nombre de processus"""
+    import io
+    import os
+    import tempfile
+    import batch
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n in range(200):
+            with open(os.path.join(directory, f"prog{n}.pas"), 'w') as f:
+                f.write(generate_program(100 + n % 50, name=f"prog{n}"))
+        files = batch.expand_inputs([directory])
+        workers = 1
+        while True:
+            summary = batch.run_batch(files, workers, io.StringIO())
+            print(f"  {workers:2d} processus: {summary['files_per_second']:8.1f} fichiers/s, "
+                  f"{summary['tokens_per_second']:10.0f} tokens/s")
+            if workers >= (os.cpu_count() or 1):
+                break
+            workers = min(workers * 2, os.cpu_count() or 1)
+
+
+def bench_cache():
+    """Soumissions répétées: compilation complète contre cache mémoire et disque"""
+    import tempfile
+    from cache import CompilationCache
+    from compiler import PascalCompiler
+
+    source = generate_program(2000)
+    plain = PascalCompiler()
+
+    def compile_plain():
+        plain.set_source('')
+        plain.compile(source)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompilationCache(directory=directory)
+        cached = PascalCompiler(cache=cache)
+        cached.compile(source)
+
+        def memory_hit():
+            cached.compile(source)
+
+        def disk_hit():
+            cache.clear()
+            cached.compile(source)
+
+        miss = timed(compile_plain, repeat=3)
+        memory = timed(memory_hit)
+        disk = timed(disk_hit)
+        print(f"{len(source)} caractères, {len(cached.tokens)} tokens")
+        print(f"  sans cache   : {miss * 1000:8.2f} ms")
+        print(f"  cache mémoire: {memory * 1000:8.2f} ms  (x{miss / memory:.0f})")
+        print(f"  cache disque : {disk * 1000:8.2f} ms  (x{miss / disk:.1f})")
+        print(f"  compteurs    : {cache.stats()}")
+
+
+def _iter_nodes(root):
+    """Parcourt tous les nœuds d'un AST (pile explicite)"""
+    from dataclasses import fields
+    from ast_1 import ASTNode
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        for f in fields(node):
+            value = getattr(node, f.name)
+            if isinstance(value, ASTNode):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, ASTNode))
+
+
+def bench_ast_memory():
+    """Octets par nœud: nœuds à __slots__ contre objets à __dict__ (ancienne forme)"""
+    from dataclasses import fields
+    from compiler import PascalCompiler
+
+    compiler = PascalCompiler()
+    if not compiler.compile(generate_program(100000)):
+        raise AssertionError(compiler.errors)
+    nodes = list(_iter_nodes(compiler.ast))
+
+    # Équivalent des anciennes dataclasses: mêmes champs, stockés dans un __dict__
+    plain_classes = {}
+    def plain_copy(node):
+        cls = plain_classes.setdefault(type(node), type(type(node).__name__, (), {}))
+        copy = cls()
+        for f in fields(node):
+            setattr(copy, f.name, getattr(node, f.name))
+        return copy
+
+    slotted = sum(sys.getsizeof(node) for node in nodes)
+    plain = 0
+    for node in nodes:
+        copy = plain_copy(node)
+        plain += sys.getsizeof(copy) + sys.getsizeof(copy.__dict__)
+    print(f"{len(nodes)} nœuds (100000 instructions)")
+    print(f"  avec __dict__  : {plain / 2**20:8.1f} Mo ({plain / len(nodes):.0f} o/nœud)")
+    print(f"  avec __slots__ : {slotted / 2**20:8.1f} Mo ({slotted / len(nodes):.0f} o/nœud)")
+
+
+def _recursive_tree_string(node, level=0):
+    """Rendu à l'ancienne: récursion et concaténation à chaque niveau"""
+    result = ""
+    for item in node.tree_items(level):
+        if isinstance(item, str):
+            result += item
+        else:
+            result += _recursive_tree_string(*item)
+    return result
+
+
+def chain_program(terms):
+    """Programme avec une seule expression a+a+...+a (arbre très profond)"""
+    return ("program chain;\nvar x, a : integer;\nbegin\n  x := "
+            + "+".join(["a"] * terms) + "\nend.")
+
+
+def bench_render():
+    """Rendu textuel de l'AST: pile explicite contre récursion"""
+    import io
+    from ast_1 import render_tree
+    from compiler import PascalCompiler
+
+    for label, source in (("programme large", generate_program(5000)),
+                          ("chaîne a+a+...", chain_program(600)),
+                          ("chaîne a+a+... x5000", chain_program(5000))):
+        compiler = PascalCompiler()
+        compiler.compile(source)
+        ast = compiler.ast
+        stats = render_tree(ast, io.StringIO())
+        new = timed(render_tree, ast, io.StringIO())
+        try:
+            old = f"{timed(_recursive_tree_string, ast) * 1000:8.2f} ms"
+        except RecursionError:
+            old = "RecursionError"
+        print(f"{label}: {stats[0]} nœuds, profondeur {stats[1]}")
+        print(f"  récursif   : {old}")
+        print(f"  itératif   : {new * 1000:8.2f} ms")
+
+
+def _asdict_serialize(node):
+    """Sérialisation à l'ancienne: asdict puis nouvelle descente récursive"""
+    from dataclasses import asdict
+    from ast_1 import ASTNode
+
+    def process_value(value):
+        if isinstance(value, ASTNode):
+            return _asdict_serialize(value)
+        elif isinstance(value, list):
+            return [process_value(item) for item in value if item is not None]
+        elif isinstance(value, (int, float, str, bool)) or value is None:
+            return value
+        return str(value)
+    return {key: process_value(value) for key, value in asdict(node).items()}
+
+
+def bench_serialize():
+    """Sérialisation JSON de l'AST: asdict récursif contre parcours unique"""
+    import io
+    import json
+    from ast_1 import write_json
+    from compiler import PascalCompiler
+
+    for label, source in (("programme large", generate_program(5000)),
+                          ("chaîne a+a+... x5000", chain_program(5000))):
+        compiler = PascalCompiler()
+        compiler.compile(source)
+        ast = compiler.ast
+        try:
+            old = f"{timed(_asdict_serialize, ast, repeat=3) * 1000:8.2f} ms"
+        except RecursionError:
+            old = "RecursionError"
+        new = timed(ast.serialize, repeat=3)
+        streamed = timed(lambda: write_json(ast, io.StringIO()), repeat=3)
+        print(label)
+        print(f"  asdict récursif      : {old}")
+        print(f"  serialize (1 passage): {new * 1000:8.2f} ms")
+        print(f"  write_json (flux)    : {streamed * 1000:8.2f} ms")
+        try:
+            dumped = timed(lambda: json.dump(ast.serialize(), io.StringIO()), repeat=3)
+            print(f"  serialize + json.dump: {dumped * 1000:8.2f} ms")
+        except RecursionError:
+            print("  serialize + json.dump: RecursionError (module json)")
+
+
+# Programme couvrant tous les types de nœuds, y compris les enfants absents
+ALL_NODES_PROGRAM = ("program all; const A = 1; const D = 2.5; const C = true;\n"
+                     "var x : integer; var b : boolean; var r : real;\n"
+                     "begin ; x := -x; if not (x = 1) then begin end else x := A;;\n"
+                     "  repeat ; x := x div 2; until (x > 2) or b;\n"
+                     "  for x := 10 downto 1 do b := false; while b and true do r := r / D;\n"
+                     "  if b then x := x mod 3 end.")
+
+
+def bench_binary():
+    """AST binaire: taille, et rechargement contre reparsing et JSON"""
+    import io
+    import json
+    import pickle
+    import ast_binary
+    from ast_1 import write_json
+    from compiler import PascalCompiler
+
+    # Aller-retour et données invalides: tests/test_ast_binary.py
+    source = generate_program(5000)
+    compiler = PascalCompiler()
+    compiler.compile(source)
+    ast = compiler.ast
+    data = ast_binary.dumps(ast)
+    out = io.StringIO()
+    write_json(ast, out)
+    text = out.getvalue()
+    pickled = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def reparse():
+        compiler.set_source('')
+        compiler.compile(source)
+
+    print(f"taille: binaire {len(data) / 1024:.0f} Kio, JSON {len(text) / 1024:.0f} Kio, "
+          f"pickle {len(pickled) / 1024:.0f} Kio, source {len(source) / 1024:.0f} Kio")
+    print(f"  reparsing       : {timed(reparse, repeat=3) * 1000:8.2f} ms")
+    print(f"  ast_binary.dumps: {timed(ast_binary.dumps, ast) * 1000:8.2f} ms")
+    print(f"  ast_binary.loads: {timed(ast_binary.loads, data) * 1000:8.2f} ms")
+    print(f"  json.loads      : {timed(json.loads, text) * 1000:8.2f} ms  (dictionnaires seulement)")
+    print(f"  pickle.loads    : {timed(pickle.loads, pickled) * 1000:8.2f} ms")
+
+
+# Programmes dominés par les boucles numériques (moteurs d'exécution)
+LOOP_PROGRAMS = {
+    'boucles imbriquées': """program nested;
+var i, j, s : integer;
+begin
+  s := 0;
+  for i := 1 to 300 do
+    for j := 1 to 300 do
+      s := s + i * j mod 7
+end.""",
+    'collatz (while, div, mod)': """program collatz;
+var n, k, steps, total : integer;
+begin
+  total := 0;
+  for k := 1 to 3000 do
+  begin
+    n := k;
+    steps := 0;
+    while n <> 1 do
+    begin
+      if n mod 2 = 0 then n := n div 2 else n := 3 * n + 1;
+      steps := steps + 1
+    end;
+    total := total + steps
+  end
+end.""",
+    'série réelle (repeat)': """program series;
+const EPS = 0.0000001;
+var term, sum, x : real; var n : integer;
+begin
+  x := 0.5; sum := 0.0; n := 0;
+  repeat
+    n := n + 1;
+    term := 1.0 / (n * n);
+    sum := sum + term;
+    if not (sum < 2.0) and (x > 0.0) then x := x / 2.0
+  until (term < EPS) or (n >= 200000)
+end.""",
+}
+
+
+class _NaiveEvaluator:
+    """Évaluation récursive directe de l'AST, dispatch par getattr (référence)"""
+
+    def __init__(self, program):
+        from runtime import BINARY_OPS, UNARY_OPS, DEFAULT_VALUES, normalize_op
+        self.binary_ops, self.unary_ops, self.normalize_op = BINARY_OPS, UNARY_OPS, normalize_op
+        self.env = {var.name.lower(): DEFAULT_VALUES.get(var.type) for var in program.block.vars}
+        self.consts = {c.name.lower(): c.value.value for c in program.block.consts}
+        self.program = program
+
+    def run(self):
+        for stmt in self.program.block.statements:
+            self.execute(stmt)
+        return self.env
+
+    def execute(self, node):
+        if node is not None:
+            getattr(self, 'exec_' + type(node).__name__)(node)
+
+    def exec_Assign(self, node):
+        self.env[node.target.name.lower()] = self.eval(node.value)
+
+    def exec_If(self, node):
+        self.execute(node.then_stmt if self.eval(node.condition) else node.else_stmt)
+
+    def exec_While(self, node):
+        while self.eval(node.condition):
+            self.execute(node.body)
+
+    def exec_For(self, node):
+        step = 1 if node.direction == 'to' else -1
+        for value in range(self.eval(node.start), self.eval(node.end) + step, step):
+            self.env[node.var.name.lower()] = value
+            self.execute(node.body)
+
+    def exec_Repeat(self, node):
+        while True:
+            for stmt in node.body:
+                self.execute(stmt)
+            if self.eval(node.condition):
+                break
+
+    def exec_Compound(self, node):
+        for stmt in node.statements:
+            self.execute(stmt)
+
+    def eval(self, node):
+        return getattr(self, 'eval_' + type(node).__name__)(node)
+
+    def eval_Literal(self, node):
+        return node.value
+
+    def eval_VarRef(self, node):
+        name = node.name.lower()
+        return self.consts[name] if name in self.consts else self.env[name]
+
+    def eval_UnaryOp(self, node):
+        return self.unary_ops[self.normalize_op(node.op)](self.eval(node.operand))
+
+    def eval_BinaryOp(self, node):
+        return self.binary_ops[self.normalize_op(node.op)](self.eval(node.left), self.eval(node.right))
+
+
+def compile_loop_programs():
+    from compiler import PascalCompiler
+    programs = {}
+    for label, source in LOOP_PROGRAMS.items():
+        compiler = PascalCompiler()
+        if not compiler.compile(source):
+            raise AssertionError(compiler.errors)
+        programs[label] = compiler.ast
+    return programs
+
+
+def bench_interpreter():
+    """Instructions par seconde: fermetures précompilées contre évaluation récursive"""
+    from interpreter import Interpreter
+
+    for label, program in compile_loop_programs().items():
+        counting = Interpreter(program, count_steps=True)
+        expected = counting.run()
+        steps = counting.steps
+        engine = Interpreter(program)
+        if engine.run() != expected or _NaiveEvaluator(program).run() != {
+                k.lower(): v for k, v in expected.items()}:
+            raise AssertionError(f"résultats différents pour {label}")
+        naive = timed(lambda: _NaiveEvaluator(program).run(), repeat=1)
+        closures = timed(engine.run, repeat=3)
+        print(f"{label}: {steps} instructions")
+        print(f"  évaluation récursive : {steps / naive / 1e6:6.2f} M instr/s")
+        print(f"  fermetures           : {steps / closures / 1e6:6.2f} M instr/s  (x{naive / closures:.1f})")
+
+
+def bench_bytecode():
+    """Machine virtuelle à registres contre évaluation directe de l'AST et fermetures"""
+    import bytecode
+    from interpreter import Interpreter
+
+    for label, program in compile_loop_programs().items():
+        counting = Interpreter(program, count_steps=True)
+        expected = counting.run()
+        chunk = bytecode.compile_program(program)
+        if bytecode.run(chunk) != expected:
+            raise AssertionError(f"résultats différents pour {label}")
+        steps = counting.steps
+        naive = timed(lambda: _NaiveEvaluator(program).run(), repeat=1)
+        closures = timed(Interpreter(program).run, repeat=3)
+        vm = timed(bytecode.run, chunk, repeat=3)
+        print(f"{label}: {steps} instructions Pascal, {len(chunk)} instructions bytecode")
+        print(f"  évaluation de l'AST  : {steps / naive / 1e6:6.2f} M instr/s")
+        print(f"  fermetures           : {steps / closures / 1e6:6.2f} M instr/s")
+        print(f"  bytecode             : {steps / vm / 1e6:6.2f} M instr/s  (x{naive / vm:.1f} sur l'AST)")
+
+
+def bench_transpile():
+    """Source Python compilé contre évaluation récursive de l'AST; coût du cache de code"""
+    import transpile
+    from cache import source_key
+    from interpreter import Interpreter
+
+    for (label, program), source in zip(compile_loop_programs().items(), LOOP_PROGRAMS.values()):
+        counting = Interpreter(program, count_steps=True)
+        expected = counting.run()
+        steps = counting.steps
+        key = source_key(source)
+        transpile.clear_cache()
+        cold = timed(lambda: transpile.compile_program(program, key), repeat=1)
+        warm = timed(transpile.compile_program, program, key, repeat=3)
+        compiled = transpile.compile_program(program, key)
+        if transpile.run(compiled) != expected:
+            raise AssertionError(f"résultats différents pour {label}")
+        naive = timed(lambda: _NaiveEvaluator(program).run(), repeat=1)
+        closures = timed(Interpreter(program).run, repeat=3)
+        python = timed(transpile.run, compiled, repeat=3)
+        print(f"{label}: {steps} instructions, traduction {cold * 1000:.2f} ms "
+              f"(en cache: {warm * 1e6:.1f} µs)")
+        print(f"  évaluation récursive : {steps / naive / 1e6:6.2f} M instr/s")
+        print(f"  fermetures           : {steps / closures / 1e6:6.2f} M instr/s")
+        print(f"  Python compilé       : {steps / python / 1e6:6.2f} M instr/s  (x{naive / python:.1f})")
+
+
+def constant_program(statements=2000, name='constants'):
+    """Programme chargé en constantes: expressions pliables et branches mortes"""
+    lines = [f"program {name};", "const PI = 3.14159;", "const N = 64;", "const DEBUG = false;",
+             "var r, area : real; var i, k : integer;", "begin", "  r := 2.0;"]
+    for n in range(statements):
+        kind = n % 4
+        if kind == 0:
+            lines.append(f"  area := 2 * PI * r + (N div 4) * {n} * 1 - 0;")
+        elif kind == 1:
+            lines.append(f"  if DEBUG then k := k + {n} else k := (k + N mod 7) * 1;")
+        elif kind == 2:
+            lines.append("  while DEBUG and (k > N) do k := k - 1;")
+        else:
+            lines.append(f"  for i := 1 to N div 8 do k := k + 0 + i * (N - {n} + {n});")
+    lines.append("end.")
+    return "\n".join(lines)
+
+
+# Exemple "Calculs mathématiques" de l'application
+CALCULUS_EXAMPLE = """program calculus;
+const PI = 3.14159;
+var radius, area, circumference : real;
+begin
+    radius := 5.0;
+    area := PI * radius * radius;
+    circumference := 2 * PI * radius;
+
+    if area > 50 then
+        radius := radius / 2
+    else
+        radius := radius * 2;
+end."""
+
+
+def bench_optimize():
+    """Pliage des constantes: taille de l'arbre et coût des rendus avant/après"""
+    import io
+    from ast_1 import render_tree
+    from compiler import PascalCompiler
+    from interpreter import Interpreter
+    from optimizer import optimize
+
+    for label, source in (("programme de constantes", constant_program(2000)),
+                          ("exemple Calculs mathématiques", CALCULUS_EXAMPLE)):
+        compiler = PascalCompiler()
+        if not compiler.compile(source):
+            raise AssertionError(compiler.errors)
+        ast = compiler.ast
+        before_text = ast.to_tree_string()
+        optimized, report = optimize(ast)
+        if ast.to_tree_string() != before_text:
+            raise AssertionError("l'AST d'origine a été modifié")
+        if Interpreter(optimized).run() != Interpreter(ast).run():
+            raise AssertionError(f"résultats différents pour {label}")
+        before_nodes = render_tree(ast, io.StringIO())[0]
+        after_nodes = render_tree(optimized, io.StringIO())[0]
+        print(f"{label}: {before_nodes} -> {after_nodes} nœuds "
+              f"(-{100 * (before_nodes - after_nodes) / before_nodes:.0f} %), "
+              f"passe {timed(optimize, ast, repeat=3) * 1000:.2f} ms")
+        print("  " + str(report).splitlines()[0])
+        for name, func in (("to_tree_string", lambda tree: tree.to_tree_string()),
+                           ("serialize", lambda tree: tree.serialize())):
+            old = timed(func, ast, repeat=3)
+            new = timed(func, optimized, repeat=3)
+            print(f"  {name:15}: {old * 1000:8.2f} ms -> {new * 1000:8.2f} ms")
+
+
+def bench_semantic():
+    """Débit de l'analyse sémantique: premier passage puis AST déjà annoté"""
+    import io
+    from ast_1 import render_tree
+    from compiler import PascalCompiler
+    from semantic import SemanticAnalyzer
+
+    for label, source in (("programme large x20000", generate_program(20000)),
+                          ("constantes x20000", constant_program(20000)),
+                          ("chaîne a+a+... x5000", chain_program(5000))):
+        compiler = PascalCompiler()
+        compiler.set_source(source)
+        compiler.lexical_analysis()
+        ast, error = compiler.syntactic_analysis()
+        if error:
+            raise AssertionError(error)
+        nodes = render_tree(ast, io.StringIO())[0]
+        start = time.perf_counter()
+        errors = SemanticAnalyzer(ast).analyze()
+        first = time.perf_counter() - start
+        if errors:
+            raise AssertionError(errors[0])
+        again = timed(lambda: SemanticAnalyzer(ast).analyze(), repeat=3)
+        print(f"{label}: {nodes} nœuds")
+        print(f"  premier passage : {first * 1000:8.2f} ms  ({nodes / first / 1e6:.2f} M nœuds/s)")
+        print(f"  AST annoté      : {again * 1000:8.2f} ms  ({nodes / again / 1e6:.2f} M nœuds/s)")
+
+
+class _DictSymbolTable:
+    """Table d'origine: un dictionnaire par symbole, clé = nom tel qu'écrit"""
+
+    def __init__(self):
+        self.symbols = {}
+
+    def add_symbol(self, name, type, value=None):
+        self.symbols[name] = {'type': type, 'value': value}
+
+    def get_symbol(self, name):
+        return self.symbols.get(name)
+
+
+def declarations_program(count=20000, name='decls'):
+    """Beaucoup de déclarations, chacune relue par plusieurs instructions"""
+    lines = [f"program {name};"]
+    lines += [f"var v{n} : integer;" for n in range(count)]
+    lines.append("begin")
+    lines += [f"  v{n} := V{(n * 7) % count} + v{(n * 13) % count} * 2;" for n in range(count)]
+    lines.append("end.")
+    return "\n".join(lines)
+
+
+def bench_symbols():
+    """Table des symboles internée par slots contre dictionnaires par nom"""
+    import tracemalloc
+    from compiler import PascalCompiler
+    from semantic import SemanticAnalyzer
+    from symbol_table import SymbolTable, NAMES
+
+    count = 100000
+    names = [f"Variable_{n}" for n in range(count)]
+    idents = [NAMES.intern(name) for name in names]
+    probes = names * 5
+    probe_ids = idents * 5
+
+    def fill_dicts():
+        table = _DictSymbolTable()
+        for name in names:
+            table.add_symbol(name, 'integer')
+        return table
+
+    def fill_slots():
+        table = SymbolTable()
+        for ident in idents:
+            table.declare(ident, 'integer')
+        return table
+
+    for label, fill in (("dictionnaires", fill_dicts), ("slots internés", fill_slots)):
+        tracemalloc.start()
+        table = fill()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{label}: {count} symboles, {memory / 1024 / 1024:.1f} Mio, "
+              f"déclaration {timed(fill, repeat=3) * 1000:.1f} ms")
+    dicts, slots = fill_dicts(), fill_slots()
+    get = dicts.get_symbol
+    lookup = slots.lookup
+    print(f"  {len(probes)} recherches: dictionnaires par nom "
+          f"{timed(lambda: [get(name) for name in probes], repeat=3) * 1000:.1f} ms, "
+          f"slots par nom {timed(lambda: [slots.get_symbol(name) for name in probes], repeat=3) * 1000:.1f} ms, "
+          f"slots par identifiant {timed(lambda: [lookup(i) for i in probe_ids], repeat=3) * 1000:.1f} ms")
+
+    compiler = PascalCompiler()
+    compiler.set_source(declarations_program())
+    compiler.lexical_analysis()
+    ast, error = compiler.syntactic_analysis()
+    if error:
+        raise AssertionError(error)
+    analysis = timed(lambda: SemanticAnalyzer(ast).analyze(), repeat=1)
+    print(f"analyse sémantique, 20000 déclarations et 60000 références: {analysis * 1000:.1f} ms")
+
+
+def _analysis(compiler, source, serialize=True):
+    """Tokens et AST (JSON si serialize) de source, avec le compilateur donné"""
+    import io
+    import ast_1
+
+    compiler.set_source(source)
+    tokens, error = compiler.lexical_analysis()
+    if error:
+        return None, error
+    ast, error = compiler.syntactic_analysis()
+    if error:
+        return tokens, error
+    if not serialize:
+        return tokens, ast
+    out = io.StringIO()
+    ast_1.write_json(ast, out)
+    return tokens, out.getvalue()
+
+
+def bench_incremental():
+    """Latence modification -> résultat: réanalyse incrémentale contre analyse complète"""
+    from compiler import PascalCompiler
+
+    base = generate_program(5000, per_line=2)
+    lines = base.split("\n")
+    middle = len(lines) // 2
+    edits = {
+        "littéral modifié": base.replace("x := x + 2500 * K", "x := x + 2501 * K", 1),
+        "ligne insérée": "\n".join(lines[:middle] + ["  y := y + 1;"] + lines[middle:]),
+        "ligne supprimée": "\n".join(lines[:middle] + lines[middle + 1:]),
+        "commentaire sur deux lignes": "\n".join(
+            lines[:middle] + ["  {" + lines[middle]] + ["  }" + lines[middle + 1]]
+            + lines[middle + 2:]),
+    }
+    full = PascalCompiler()
+    print(f"{len(lines)} lignes, {len(base)} caractères")
+    for label, edited in edits.items():
+        incremental = PascalCompiler(incremental=True)
+        _analysis(incremental, base)
+        # Équivalence: mêmes tokens et même AST qu'une analyse complète, dans les deux sens
+        for source in (edited, base, edited):
+            if _analysis(incremental, source) != _analysis(PascalCompiler(), source):
+                raise AssertionError(f"{label}: résultat incrémental différent")
+        stats = incremental.incremental_stats
+
+        def alternate(compiler):
+            # Aller-retour: chaque set_source part de l'analyse précédente
+            _analysis(compiler, base, serialize=False)
+            _analysis(compiler, edited, serialize=False)
+
+        reference = timed(alternate, full, repeat=3) / 2
+        latency = timed(alternate, incremental, repeat=5) / 2
+        print(f"  {label}: complète {reference * 1000:.1f} ms, incrémentale "
+              f"{latency * 1000:.2f} ms (x{reference / latency:.0f}), "
+              f"{stats['relexed_tokens']} tokens relus, "
+              f"{stats['reparsed_statements']}/{stats['statements']} instructions reparsées")
+
+
+def bench_stream():
+    """Analyse lexicale en flux: mémoire bornée quelle que soit la taille du fichier"""
+    import io
+    import os
+    import tempfile
+    import tracemalloc
+    from compiler import PascalCompiler
+    from stream_lexer import StreamLexer, tokenize_file
+
+    # Équivalence, y compris pour des tokens et commentaires coupés entre deux morceaux
+    sample = generate_program(200, per_line=3).replace(
+        "begin\n", "begin\n  { commentaire { imbriqué\n  sur deux lignes }  x := 12.5 + 3;\n", 1)
+    compiler = PascalCompiler()
+    compiler.set_source(sample)
+    expected = [tuple(token.values()) for token in compiler.lexical_analysis()[0]]
+    for chunk_size in (1, 2, 3, 5, 16, 4096):
+        for data in (io.StringIO(sample), io.BytesIO(sample.encode('utf-8'))):
+            if [tuple(token) for token in StreamLexer(data, chunk_size)] != expected:
+                raise AssertionError(f"tokens différents avec des morceaux de {chunk_size}")
+
+    for statements in (10000, 40000):
+        source = generate_program(statements, per_line=4)
+        fd, path = tempfile.mkstemp(suffix='.pas')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(source)
+        try:
+            def in_memory():
+                with open(path, encoding='utf-8') as f:
+                    compiler.set_source(f.read())
+                return len(compiler.lexical_analysis()[0])
+
+            def streamed():
+                return sum(1 for _ in tokenize_file(path))
+
+            print(f"{len(source) / 1024 / 1024:.1f} Mio de source")
+            for label, run in (("en mémoire", in_memory), ("en flux", streamed)):
+                tracemalloc.start()
+                count = run()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                compiler.set_source('')
+                elapsed = timed(run, repeat=1)
+                print(f"  {label}: {count} tokens, pic {peak / 1024 / 1024:.1f} Mio, "
+                      f"{count / elapsed / 1e6:.2f} M tokens/s")
+        finally:
+            os.remove(path)
+
+
+def bench_dfa():
+    """Lexer à automate contre lexer PLY: tokens/s (comparaison: tests/test_dfa_lexer.py)"""
+    from lexer import lexer as ply_lexer
+    from dfa_lexer import DFALexer
+    from compiler import PascalCompiler
+
+    ply, dfa = ply_lexer.clone(), DFALexer()
+    source = generate_program(20000, per_line=3)
+    for label, lexer in (("PLY", ply), ("automate", dfa)):
+        def scan():
+            lexer.input(source)
+            lexer.lineno = 1
+            return sum(1 for _ in iter(lexer.token, None))
+        count = scan()
+        elapsed = timed(scan, repeat=5)
+        print(f"  {label}: {count} tokens, {count / elapsed / 1e6:.3f} M tokens/s")
+    program = generate_program(5000, per_line=3)
+    for backend in ('ply', 'dfa'):
+        compiler = PascalCompiler(lexer_backend=backend)
+        elapsed = timed(compiler.compile, program, repeat=3)
+        print(f"  compilation complète, 5000 instructions ({backend}): {elapsed * 1000:.0f} ms")
+
+
+def bench_token_store():
+    """Tokens par colonnes (TokenStore) contre un dictionnaire par token"""
+    import tracemalloc
+    from lexer import lexer as ply_lexer
+    from line_index import LineIndex
+    from token_store import TokenStore
+
+    source = generate_program(20000, per_line=3)
+    lexer = ply_lexer.clone()
+    lexer.input(source)
+    lexer.lineno = 1
+    buffer = list(iter(lexer.token, None))
+    column = LineIndex(source).column
+
+    def as_dicts():
+        return [{'type': tok.type, 'value': tok.value, 'line': tok.lineno,
+                 'column': column(tok.lexpos)} for tok in buffer]
+
+    def as_store():
+        return TokenStore.from_lextokens(buffer, column)
+
+    dicts, store = as_dicts(), as_store()
+    if store != dicts:
+        raise AssertionError("TokenStore différent des dictionnaires")
+    print(f"{len(buffer)} tokens, {len(store.values)} valeurs distinctes")
+    for label, build in (("dictionnaires", as_dicts), ("TokenStore", as_store)):
+        tracemalloc.start()
+        tokens = build()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del tokens
+        print(f"  {label}: {memory / 1024 / 1024:.1f} Mio, construction "
+              f"{timed(build, repeat=3) * 1000:.0f} ms")
+
+    def dict_stats():
+        return (len(dicts), len(set(token['type'] for token in dicts)),
+                len([t for t in dicts if t['type'] == 'ID']))
+
+    def store_stats():
+        return len(store), store.distinct_types(), store.count_type('ID')
+
+    if dict_stats() != store_stats():
+        raise AssertionError("statistiques différentes")
+    print(f"  statistiques de l'interface: dictionnaires {timed(dict_stats) * 1000:.1f} ms, "
+          f"comptages sur les tableaux {timed(store_stats) * 1000:.2f} ms")
+
+
+def erroneous_program(statements=2000, errors=20, name='errors'):
+    """Programme valide dont errors instructions, réparties, sont erronées;
+    retourne (lignes correctes, lignes erronées, indices des lignes erronées)"""
+    lines = generate_program(statements).split("\n")
+    body = range(4, len(lines) - 1)
+    step = len(body) // errors
+    broken = [body.start + step * n + step // 2 for n in range(errors)]
+    bad = list(lines)
+    for index in broken:
+        # Alternance d'erreurs syntaxiques et lexicales
+        bad[index] = "  x := := 1;" if index % 2 else "  x := x + $ 1;"
+    return lines, bad, broken
+
+
+def bench_recovery():
+    """Toutes les erreurs en une compilation (récupération) contre une compilation par erreur"""
+    from compiler import PascalCompiler
+
+    for count in (5, 20, 50):
+        good, bad, broken = erroneous_program(2000, count)
+        recovering = PascalCompiler(recover=True)
+        if recovering.compile("\n".join(bad)) or len(recovering.errors) != count:
+            raise AssertionError(f"{len(recovering.errors)} erreurs trouvées au lieu de {count}")
+        # Une instruction syntaxiquement fausse est omise; '$' est seulement ignoré
+        dropped = sum(1 for index in broken if index % 2)
+        if recovering.ast is None or len(recovering.ast.block.statements) != 2000 - dropped:
+            raise AssertionError("AST partiel incomplet")
+
+        def one_pass():
+            PascalCompiler(recover=True).compile("\n".join(bad))
+
+        def rerun_per_error():
+            # L'utilisateur corrige la première erreur signalée puis recompile
+            lines = list(bad)
+            for index in broken:
+                compiler = PascalCompiler()
+                if compiler.compile("\n".join(lines)):
+                    raise AssertionError("erreur non signalée")
+                lines[index] = good[index]
+            if not PascalCompiler().compile("\n".join(lines)):
+                raise AssertionError("programme corrigé invalide")
+
+        single = timed(one_pass, repeat=3)
+        reruns = timed(rerun_per_error, repeat=1)
+        print(f"{count} erreurs: une passe {single * 1000:.0f} ms, "
+              f"{count + 1} recompilations {reruns * 1000:.0f} ms (x{reruns / single:.1f})")
+
+
+def nested_program(depth, name='nested'):
+    """Instructions imbriquées sur depth niveaux: begin ... end et if ... then"""
+    return (f"program {name};\nvar x : integer;\nbegin\n  " + "begin " * depth + "x := 1"
+            + " end" * depth + ";\n  " + "if x > 0 then " * depth + "x := x + 1\nend.")
+
+
+class _RecursiveCounter:
+    """Visiteur récursif classique: visit_<Classe> cherché à chaque nœud"""
+
+    def __init__(self):
+        self.count = 0
+
+    def visit(self, node):
+        return getattr(self, 'visit_' + node.__class__.__name__, self.generic_visit)(node)
+
+    def generic_visit(self, node):
+        from ast_1 import CHILD_FIELDS
+
+        self.count += 1
+        for name, is_list in CHILD_FIELDS[node.__class__]:
+            value = getattr(node, name)
+            if is_list:
+                for item in value:
+                    if item is not None:
+                        self.visit(item)
+            elif value is not None:
+                self.visit(value)
+
+
+def bench_walker():
+    """Parcours de l'AST: visiteur récursif contre walker.Walker (pile explicite)"""
+    from ast_1 import CHILD_FIELDS
+    from compiler import PascalCompiler
+    from optimizer import optimize
+    from semantic import SemanticAnalyzer
+    from walker import Walker
+
+    class Counter(Walker):
+        def __init__(self):
+            self.count = 0
+
+        def count_node(self, node):
+            self.count += 1
+
+    # Un même crochet pour toutes les classes, ajouté à la table de dispatch
+    Counter._enter = dict.fromkeys(CHILD_FIELDS, Counter.count_node)
+
+    for label, source in (("programme large x20000", generate_program(20000)),
+                          ("chaîne a+a+... x5000", chain_program(5000)),
+                          ("imbrication x3000", nested_program(3000))):
+        compiler = PascalCompiler()
+        compiler.set_source(source)
+        compiler.lexical_analysis()
+        ast, error = compiler.syntactic_analysis()
+        if error:
+            raise AssertionError(error)
+        counter = Counter()
+        counter.walk(ast)
+        new = timed(lambda: Counter().walk(ast), repeat=3)
+        try:
+            recursive = _RecursiveCounter()
+            recursive.visit(ast)
+            if recursive.count != counter.count:
+                raise AssertionError((recursive.count, counter.count))
+            old = f"{timed(lambda: _RecursiveCounter().visit(ast), repeat=3) * 1000:8.2f} ms"
+        except RecursionError:
+            old = "RecursionError"
+        start = time.perf_counter()
+        errors = SemanticAnalyzer(ast).analyze()
+        semantic = time.perf_counter() - start
+        if errors:
+            raise AssertionError(errors[0])
+        optimized = timed(optimize, ast, repeat=3)
+        print(f"{label}: {counter.count} nœuds")
+        print(f"  visiteur récursif : {old}")
+        print(f"  Walker            : {new * 1000:8.2f} ms")
+        print(f"  analyse sémantique: {semantic * 1000:8.2f} ms")
+        print(f"  optimisation      : {optimized * 1000:8.2f} ms")
+
+
+def var_list_program(count, name='vars'):
+    """Une seule déclaration var avec count noms"""
+    return (f"program {name};\nvar " + ", ".join(f"v{i}" for i in range(count))
+            + " : integer;\nbegin\n  v0 := 1\nend.")
+
+
+def bench_parser():
+    """Analyse syntaxique seule (tokens déjà produits): temps par élément quand
+    la taille double, qui doit rester stable si les actions sont linéaires"""
+    from compiler import PascalCompiler
+
+    cases = (("liste var a, b, ...", var_list_program, "nom"),
+             ("déclarations var + affectations", lambda n: declarations_program(n), "décl."),
+             ("suite d'instructions", lambda n: generate_program(n), "instr."),
+             ("imbrication", lambda n: nested_program(n), "niveau"))
+    for label, make, unit in cases:
+        print(label)
+        previous = None
+        for size in (5000, 10000, 20000, 40000):
+            compiler = PascalCompiler()
+            compiler.set_source(make(size))
+            compiler.lexical_analysis()
+
+            def parse():
+                ast, error = compiler.syntactic_analysis()
+                if error:
+                    raise AssertionError(error)
+
+            elapsed = timed(parse, repeat=3)
+            ratio = f"  x{elapsed / previous:.2f}" if previous else ""
+            previous = elapsed
+            print(f"  {size:6}: {elapsed * 1000:8.1f} ms  ({elapsed / size * 1e6:5.2f} us/{unit}){ratio}")
+
+
+def _parse_objects(source):
+    from compiler import PascalCompiler
+
+    compiler = PascalCompiler()
+    compiler.set_source(source)
+    return compiler.syntactic_analysis()[0]
+
+
+def _parse_flat(source):
+    import flat_ast
+
+    return flat_ast.parse(source)
+
+
+def bench_flat_ast():
+    """AST à plat (tableaux typés) contre arbre d'objets: construction, mémoire, transfert"""
+    import io
+    import pickle
+    import tracemalloc
+    from concurrent.futures import ProcessPoolExecutor
+    import ast_binary
+    import flat_ast
+    from ast_1 import write_json
+
+    def as_json(tree):
+        out = io.StringIO()
+        write_json(tree, out)
+        return out.getvalue()
+
+    for source in (ALL_NODES_PROGRAM, generate_program(300), chain_program(3000)):
+        expected = as_json(_parse_objects(source))
+        flat = flat_ast.parse(source)
+        if as_json(flat.program) != expected or as_json(flat.to_tree()) != expected:
+            raise AssertionError("AST à plat différent de l'arbre d'objets")
+    print("vues et reconstruction identiques à l'arbre d'objets")
+
+    source = generate_program(20000)
+    for label, build in (("objets", _parse_objects), ("à plat", _parse_flat)):
+        tracemalloc.start()
+        build(source)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  construction {label:7}: {timed(build, source, repeat=3) * 1000:8.1f} ms, "
+              f"pic {peak / 2**20:6.1f} Mio")
+    tree = _parse_objects(source)
+    flat = _parse_flat(source)
+    tracemalloc.start()
+    kept = _parse_objects(source)
+    objects = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    print(f"  taille: objets {objects / 2**20:.1f} Mio, à plat {flat.nbytes / 2**20:.1f} Mio "
+          f"({len(flat)} lignes) + {len(flat.values)} valeurs")
+
+    def out_of_band():
+        # Les colonnes ne sont pas copiées: le chargement les lit dans les tampons
+        buffers = []
+        data = pickle.dumps(flat, protocol=5, buffer_callback=buffers.append)
+        return pickle.loads(data, buffers=buffers)
+
+    buffers = []
+    header = pickle.dumps(flat, protocol=5, buffer_callback=buffers.append)
+    cases = (
+        ("pickle objets", lambda: pickle.loads(pickle.dumps(tree, protocol=5))),
+        ("ast_binary", lambda: ast_binary.loads(ast_binary.dumps(tree))),
+        ("pickle à plat", lambda: pickle.loads(pickle.dumps(flat, protocol=5))),
+        ("pickle hors bande", out_of_band),
+        ("to_bytes/from_buffer", lambda: flat_ast.FlatAST.from_buffer(flat.to_bytes())),
+    )
+    print("transfert (sérialisation + chargement):")
+    for label, transfer in cases:
+        print(f"  {label:21}: {timed(transfer, repeat=3) * 1000:8.2f} ms")
+    print(f"  tailles: pickle objets {len(pickle.dumps(tree, protocol=5)) / 1024:.0f} Kio, "
+          f"à plat {len(flat.to_bytes()) / 1024:.0f} Kio, "
+          f"hors bande {len(header)} o + {sum(b.raw().nbytes for b in buffers) / 1024:.0f} Kio")
+
+    sources = [generate_program(2000, name=f"p{n}") for n in range(8)]
+    with ProcessPoolExecutor(1) as pool:
+        list(pool.map(len, sources))
+        for label, build in (("objets", _parse_objects), ("à plat", _parse_flat)):
+            elapsed = timed(lambda: list(pool.map(build, sources)), repeat=3)
+            print(f"  analyse dans un processus et retour ({label:6}): {elapsed * 1000:8.1f} ms")
+
+
+def bench_profile():
+    """Coût du profilage par phase: désactivé, temps seuls, avec pic mémoire"""
+    from compiler import PascalCompiler
+
+    source = generate_program(5000)
+
+    def run(compiler):
+        compiler.compile(source)
+        compiler.build_ast()
+        compiler.optimize()
+
+    last = None
+    for label, options in (("sans profilage", {}), ("profile", {'profile': True}),
+                           ("profile_memory", {'profile_memory': True})):
+        compiler = PascalCompiler(**options)
+        # Nouveau compilateur à chaque essai: pas de résultat réutilisé d'un essai à l'autre
+        elapsed = timed(lambda: run(PascalCompiler(**options)), repeat=3)
+        run(compiler)
+        if compiler.stats is not None:
+            last = compiler.stats
+        print(f"  {label:15}: {elapsed * 1000:8.1f} ms")
+    print(last)
+    print(last.to_prometheus(labels={'programme': 'bench'}), end='')
+
+
+BENCHMARKS = {
+    'startup': bench_startup,
+    'columns': bench_columns,
+    'pipeline': bench_pipeline,
+    'threads': bench_threads,
+    'batch': bench_batch,
+    'cache': bench_cache,
+    'ast_memory': bench_ast_memory,
+    'render': bench_render,
+    'serialize': bench_serialize,
+    'binary': bench_binary,
+    'interpreter': bench_interpreter,
+    'bytecode': bench_bytecode,
+    'transpile': bench_transpile,
+    'optimize': bench_optimize,
+    'semantic': bench_semantic,
+    'symbols': bench_symbols,
+    'incremental': bench_incremental,
+    'stream': bench_stream,
+    'dfa': bench_dfa,
+    'token_store': bench_token_store,
+    'recovery': bench_recovery,
+    'walker': bench_walker,
+    'parser': bench_parser,
+    'flat_ast': bench_flat_ast,
+    'profile': bench_profile,
+}
+
+
+def main(argv=None):
+    names = (argv if argv is not None else sys.argv[1:]) or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Benchmark inconnu: {name} (disponibles: {', '.join(BENCHMARKS)})")
+            return 1
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,457 @@
+"""
+Bytecode à registres pour Mini-Pascal: génération, machine virtuelle et désassembleur
+
+Chaque instruction occupe 4 entiers (opcode, a, b, c) dans un array('l').
+Registres: d'abord les variables (un par VarDecl), puis le pool de constantes
+(littéraux et ConstDecl, chargés au démarrage), puis les temporaires.
+"""
+import math
+from array import array
+
+from ast_1 import (Program, Assign, If, While, For, Repeat, Compound,
+                   BinaryOp, UnaryOp, VarRef, Literal)
+from errors import RuntimeError_
+from runtime import DEFAULT_VALUES, arithmetic_error, normalize_op, pascal_div, pascal_mod
+from symbol_table import name_id
+
+OPCODES = (
+    'MOVE',     # R[a] = R[b]
+    'ADD', 'SUB', 'MUL', 'DIVR', 'IDIV', 'MOD',     # R[a] = R[b] op R[c]
+    'EQ', 'NE', 'LT', 'LE', 'GT', 'GE',
+    'NEG', 'NOT',                                   # R[a] = op R[b]
+    'TOREAL',   # R[a] = float(R[b])
+    'JMP',      # pc = a
+    'JMPF',     # si non R[a]: pc = b
+    'JMPT',     # si R[a]: pc = b
+    # Comparaison et saut fusionnés: si non (R[a] op R[b]): pc = c
+    'JNEQ', 'JNNE', 'JNLT', 'JNLE', 'JNGT', 'JNGE',
+    'INC',      # R[a] = R[a] + 1
+    'DEC',      # R[a] = R[a] - 1
+    # Fin d'itération de for: R[a] += 1 (-1); si R[a] <= R[b] (>=): pc = c
+    'FORUP', 'FORDOWN',
+    'HALT',
+    'FORCHECK', # erreur si R[a] ou R[b] n'est pas entier (bornes d'un for)
+)
+for _number, _name in enumerate(OPCODES):
+    globals()[_name] = _number
+
+_BINARY_OPCODES = {
+    '+': ADD, '-': SUB, '*': MUL, '/': DIVR, 'div': IDIV, 'mod': MOD,
+    '=': EQ, '<>': NE, '<': LT, '<=': LE, '>': GT, '>=': GE,
+}
+_JUMP_IF_NOT = {'=': JNEQ, '<>': JNNE, '<': JNLT, '<=': JNLE, '>': JNGT, '>=': JNGE}
+
+
+class Chunk:
+    """Programme compilé: instructions, constantes et description des registres"""
+
+    def __init__(self, name):
+        self.name = name
+        self.code = array('l')
+        self.positions = array('l')      # (lineno, col) par instruction
+        self.constants = []
+        self.names = []                  # nom de chaque registre de variable
+        self.types = []
+        self.register_count = 0
+
+    @property
+    def constant_base(self):
+        return len(self.names)
+
+    def __len__(self):
+        return len(self.code) // 4
+
+
+class BytecodeCompiler:
+    """Traduit un Program en Chunk; une table par classe de nœud, précalculée"""
+
+    def __init__(self, program):
+        if not isinstance(program, Program):
+            raise TypeError("Le générateur de bytecode attend un nœud Program")
+        self.chunk = Chunk(program.name)
+        self.slots = {}
+        self.constants = {}       # nom de constante -> valeur
+        self._pool = {}           # (type, valeur) -> index dans le pool
+        self._next_temp = 0
+        self._max_temp = 0
+        self._temp_operands = []    # positions dans code des opérandes temporaires
+        self._position = (program.lineno, program.col)
+        self._statements = {
+            Assign: self._assign, If: self._if, While: self._while, For: self._for,
+            Repeat: self._repeat, Compound: self._compound,
+        }
+        self._program = program
+
+    def compile(self):
+        block = self._program.block
+        chunk = self.chunk
+        for const in block.consts:
+            key = name_id(const)
+            if key in self.constants:
+                raise RuntimeError_(f"Identificateur déjà déclaré: {const.name}", const.lineno, const.col)
+            self.constants[key] = const.value.value if const.value else None
+        for var in block.vars:
+            key = name_id(var)
+            if key in self.constants or key in self.slots:
+                raise RuntimeError_(f"Identificateur déjà déclaré: {var.name}", var.lineno, var.col)
+            self.slots[key] = len(chunk.names)
+            chunk.names.append(var.name)
+            chunk.types.append(var.type)
+        # Les constantes déclarées entrent dans le pool en premier
+        for value in self.constants.values():
+            self._constant(value)
+        self._sequence(block.statements)
+        self._emit(HALT)
+        # Les temporaires sont numérotés après le pool, connu seulement maintenant
+        base = chunk.constant_base + len(chunk.constants)
+        code = chunk.code
+        for index in self._temp_operands:
+            code[index] = base + (code[index] - _TEMP_BASE)
+        chunk.register_count = base + self._max_temp
+        return chunk
+
+    # Émission
+
+    def _emit(self, op, a=0, b=0, c=0):
+        chunk = self.chunk
+        pc = len(chunk.code) // 4
+        chunk.code.extend((op, a, b, c))
+        chunk.positions.extend(self._position)
+        for offset, operand in enumerate((a, b, c), 1):
+            if operand >= _TEMP_BASE and op not in _JUMP_OPERANDS.get(offset, ()):
+                self._temp_operands.append(pc * 4 + offset)
+        return pc
+
+    def _patch(self, pc, operand, value):
+        self.chunk.code[pc * 4 + operand] = value
+
+    def _here(self):
+        return len(self.chunk.code) // 4
+
+    def _temp(self):
+        register = _TEMP_BASE + self._next_temp
+        self._next_temp += 1
+        self._max_temp = max(self._max_temp, self._next_temp)
+        return register
+
+    def _release(self, count):
+        self._next_temp -= count
+
+    def _constant(self, value):
+        # bool est un int en Python: le type fait partie de la clé; -0.0 == 0.0:
+        # le signe d'un réel aussi
+        key = (type(value), value, math.copysign(1.0, value) if type(value) is float else 0)
+        index = self._pool.get(key)
+        if index is None:
+            index = self._pool[key] = len(self.chunk.constants)
+            self.chunk.constants.append(value)
+        return self.chunk.constant_base + index
+
+    # Instructions
+
+    def _sequence(self, statements):
+        for stmt in statements:
+            if stmt is not None:
+                self._position = (stmt.lineno, stmt.col)
+                self._statements[stmt.__class__](stmt)
+
+    def _statement(self, node):
+        if node is not None:
+            self._sequence((node,))
+
+    def _slot(self, ref, for_write=False):
+        key = name_id(ref)
+        if key in self.constants:
+            if for_write:
+                raise RuntimeError_(f"Affectation à la constante {ref.name}", ref.lineno, ref.col)
+            return self._constant(self.constants[key])
+        slot = self.slots.get(key)
+        if slot is None:
+            raise RuntimeError_(f"Variable non déclarée: {ref.name}", ref.lineno, ref.col)
+        return slot
+
+    def _assign(self, node):
+        target = self._slot(node.target, for_write=True)
+        self._expression(node.value, target)
+        if self.chunk.types[target] == 'real' and getattr(node.value, 'inferred_type', None) != 'real':
+            self._emit(TOREAL, target, target)
+
+    def _condition_jump(self, condition):
+        """Évalue la condition et émet un saut si elle est fausse; retourne son pc"""
+        if isinstance(condition, BinaryOp) and normalize_op(condition.op) in _JUMP_IF_NOT:
+            used = self._next_temp
+            left = self._expression(condition.left)
+            right = self._expression(condition.right)
+            pc = self._emit(_JUMP_IF_NOT[normalize_op(condition.op)], left, right, 0)
+            self._release(self._next_temp - used)
+            return pc, 3
+        used = self._next_temp
+        register = self._expression(condition)
+        pc = self._emit(JMPF, register, 0)
+        self._release(self._next_temp - used)
+        return pc, 2
+
+    def _if(self, node):
+        jump_else = self._condition_jump(node.condition)
+        self._statement(node.then_stmt)
+        if node.else_stmt is not None:
+            jump_end = self._emit(JMP, 0)
+            self._patch(*jump_else, self._here())
+            self._statement(node.else_stmt)
+            self._patch(jump_end, 1, self._here())
+        else:
+            self._patch(*jump_else, self._here())
+
+    def _while(self, node):
+        start = self._here()
+        jump_exit = self._condition_jump(node.condition)
+        self._statement(node.body)
+        self._emit(JMP, start)
+        self._patch(*jump_exit, self._here())
+
+    def _repeat(self, node):
+        start = self._here()
+        self._sequence(node.body)
+        jump = self._condition_jump(node.condition)
+        # Répéter tant que la condition est fausse: le saut « si faux » revient au début
+        self._patch(*jump, start)
+
+    def _for(self, node):
+        variable = self._slot(node.var, for_write=True)
+        counter = self._temp()
+        limit = self._temp()
+        self._expression(node.start, counter)
+        self._expression(node.end, limit)
+        # Bornes réelles possibles si l'analyse sémantique n'a pas validé l'AST
+        self._emit(FORCHECK, counter, limit)
+        upward = node.direction == 'to'
+        jump_exit = self._emit(JNLE if upward else JNGE, counter, limit, 0)
+        start = self._emit(MOVE, variable, counter)
+        self._statement(node.body)
+        self._emit(FORUP if upward else FORDOWN, counter, limit, start)
+        self._patch(jump_exit, 3, self._here())
+        self._release(2)
+
+    def _compound(self, node):
+        self._sequence(node.statements)
+
+    # Expressions: retourne le registre du résultat (target s'il est fourni)
+
+    def _expression(self, node, target=None):
+        if node is None:
+            raise RuntimeError_("Expression manquante", *self._position)
+        if isinstance(node, Literal):
+            register = self._constant(node.value)
+        elif isinstance(node, VarRef):
+            register = self._slot(node)
+        elif isinstance(node, BinaryOp):
+            return self._binary(node, target)
+        elif isinstance(node, UnaryOp):
+            return self._unary(node, target)
+        else:
+            raise RuntimeError_(f"Expression non supportée: {type(node).__name__}", *self._position)
+        if target is not None and target != register:
+            self._emit(MOVE, target, register)
+            return target
+        return register
+
+    def _binary(self, node, target):
+        op = normalize_op(node.op)
+        if op in ('and', 'or'):
+            # Court-circuit: le résultat passe par un temporaire, la cible
+            # pouvant être lue par l'opérande droit
+            result = self._temp()
+            self._expression(node.left, result)
+            jump = self._emit(JMPF if op == 'and' else JMPT, result, 0)
+            self._expression(node.right, result)
+            self._patch(jump, 2, self._here())
+            if target is None:
+                return result
+            self._release(1)
+            self._emit(MOVE, target, result)
+            return target
+        opcode = _BINARY_OPCODES.get(op)
+        if opcode is None:
+            raise RuntimeError_(f"Opérateur inconnu: {node.op}", node.lineno, node.col)
+        used = self._next_temp
+        left = self._expression(node.left)
+        right = self._expression(node.right)
+        self._release(self._next_temp - used)
+        if target is None:
+            target = self._temp()
+        previous = self._position
+        self._position = (node.lineno, node.col)
+        self._emit(opcode, target, left, right)
+        self._position = previous
+        return target
+
+    def _unary(self, node, target):
+        op = normalize_op(node.op)
+        used = self._next_temp
+        operand = self._expression(node.operand)
+        self._release(self._next_temp - used)
+        if target is None:
+            target = self._temp()
+        if op == 'uminus':
+            self._emit(NEG, target, operand)
+        elif op == 'not':
+            self._emit(NOT, target, operand)
+        else:
+            raise RuntimeError_(f"Opérateur inconnu: {node.op}", node.lineno, node.col)
+        return target
+
+
+# Les temporaires sont numérotés à partir de _TEMP_BASE pendant la génération,
+# puis renumérotés après le pool de constantes
+_TEMP_BASE = 1 << 24
+# Opérandes qui sont des adresses de saut (jamais renumérotés)
+_JUMP_OPERANDS = {1: (JMP,), 2: (JMPF, JMPT),
+                  3: (JNEQ, JNNE, JNLT, JNLE, JNGT, JNGE, FORUP, FORDOWN)}
+
+
+def compile_program(program):
+    """Compile un Program en Chunk"""
+    return BytecodeCompiler(program).compile()
+
+
+def run(chunk):
+    """Exécute un Chunk; retourne les variables finales"""
+    registers = [DEFAULT_VALUES.get(t) for t in chunk.types]
+    registers.extend(chunk.constants)
+    registers.extend([None] * (chunk.register_count - len(registers)))
+    code = chunk.code
+    # Décodage unique en tuples: une seule indexation par instruction exécutée
+    program = [tuple(code[i:i + 4]) for i in range(0, len(code), 4)]
+    pc = 0
+    try:
+        while True:
+            op, a, b, c = program[pc]
+            pc += 1
+            # Dispatch en arbre sur les plages d'opcodes: au plus ~6 comparaisons
+            if op < EQ:
+                if op < MUL:
+                    if op == ADD:
+                        registers[a] = registers[b] + registers[c]
+                    elif op == MOVE:
+                        registers[a] = registers[b]
+                    else:
+                        registers[a] = registers[b] - registers[c]
+                elif op == MUL:
+                    registers[a] = registers[b] * registers[c]
+                elif op == MOD:
+                    x, y = registers[b], registers[c]
+                    registers[a] = x % y if x >= 0 and y > 0 else pascal_mod(x, y)
+                elif op == IDIV:
+                    x, y = registers[b], registers[c]
+                    registers[a] = x // y if x >= 0 and y > 0 else pascal_div(x, y)
+                else:
+                    registers[a] = registers[b] / registers[c]
+            elif op < JMP:
+                if op < NEG:
+                    if op == EQ:
+                        registers[a] = registers[b] == registers[c]
+                    elif op == NE:
+                        registers[a] = registers[b] != registers[c]
+                    elif op == LT:
+                        registers[a] = registers[b] < registers[c]
+                    elif op == LE:
+                        registers[a] = registers[b] <= registers[c]
+                    elif op == GT:
+                        registers[a] = registers[b] > registers[c]
+                    else:
+                        registers[a] = registers[b] >= registers[c]
+                elif op == NEG:
+                    registers[a] = -registers[b]
+                elif op == NOT:
+                    registers[a] = not registers[b]
+                else:
+                    registers[a] = float(registers[b])
+            elif op < JNEQ:
+                if op == JMP:
+                    pc = a
+                elif op == JMPF:
+                    if not registers[a]:
+                        pc = b
+                elif registers[a]:
+                    pc = b
+            elif op < INC:
+                if op < JNLT:
+                    if op == JNEQ:
+                        if registers[a] != registers[b]:
+                            pc = c
+                    elif registers[a] == registers[b]:
+                        pc = c
+                elif op == JNLT:
+                    if not registers[a] < registers[b]:
+                        pc = c
+                elif op == JNLE:
+                    if not registers[a] <= registers[b]:
+                        pc = c
+                elif op == JNGT:
+                    if not registers[a] > registers[b]:
+                        pc = c
+                elif not registers[a] >= registers[b]:
+                    pc = c
+            elif op == FORUP:
+                value = registers[a] + 1
+                registers[a] = value
+                if value <= registers[b]:
+                    pc = c
+            elif op == FORDOWN:
+                value = registers[a] - 1
+                registers[a] = value
+                if value >= registers[b]:
+                    pc = c
+            elif op == INC:
+                registers[a] += 1
+            elif op == DEC:
+                registers[a] -= 1
+            elif op == HALT:
+                break
+            elif op == FORCHECK:
+                if not (isinstance(registers[a], int) and isinstance(registers[b], int)):
+                    lineno, col = chunk.positions[(pc - 1) * 2], chunk.positions[(pc - 1) * 2 + 1]
+                    raise RuntimeError_("Les bornes d'une boucle for doivent être entières",
+                                        lineno, col)
+            else:
+                raise RuntimeError_(f"Opcode inconnu: {op}")
+    except ArithmeticError as e:
+        # Division par zéro, ou dépassement (entier trop grand pour un réel)
+        lineno, col = chunk.positions[(pc - 1) * 2], chunk.positions[(pc - 1) * 2 + 1]
+        raise arithmetic_error(e, lineno, col) from None
+    return {name: registers[slot] for slot, name in enumerate(chunk.names)}
+
+
+def _register_name(chunk, register):
+    if register < len(chunk.names):
+        return chunk.names[register]
+    index = register - chunk.constant_base
+    if index < len(chunk.constants):
+        return f"#{chunk.constants[index]!r}"
+    return f"t{register - chunk.constant_base - len(chunk.constants)}"
+
+
+def disassemble(chunk):
+    """Représentation textuelle du bytecode, une instruction par ligne"""
+    lines = [f"; {chunk.name}: {len(chunk)} instructions, {chunk.register_count} registres"]
+    code = chunk.code
+    for pc in range(len(chunk)):
+        op, a, b, c = code[pc * 4:pc * 4 + 4]
+        name = OPCODES[op]
+        if op in (JMP,):
+            operands = f"-> {a}"
+        elif op in (JMPF, JMPT):
+            operands = f"{_register_name(chunk, a)} -> {b}"
+        elif op in _JUMP_OPERANDS[3]:
+            operands = f"{_register_name(chunk, a)}, {_register_name(chunk, b)} -> {c}"
+        elif op in (INC, DEC):
+            operands = _register_name(chunk, a)
+        elif op in (MOVE, NEG, NOT, TOREAL, FORCHECK):
+            operands = f"{_register_name(chunk, a)}, {_register_name(chunk, b)}"
+        elif op == HALT:
+            operands = ""
+        else:
+            operands = ", ".join(_register_name(chunk, r) for r in (a, b, c))
+        lineno = chunk.positions[pc * 2]
+        lines.append(f"{pc:5d}  {name:<8} {operands:<32} ; ligne {lineno}")
+    return "\n".join(lines)
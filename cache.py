@@ -0,0 +1,167 @@
+"""
+Cache des compilations, indexé par le contenu du source
+Un niveau mémoire (LRU) et, en option, un niveau disque borné en taille
+"""
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+from ast_1 import Program
+from lexer import LEXER_HASH
+from parser_1 import GRAMMAR_HASH
+from token_store import TokenStore
+
+# À incrémenter si la forme des entrées stockées change
+CACHE_FORMAT = 3
+
+
+def source_key(source_code):
+    """Clé d'un source: son contenu plus les versions du lexer et de la grammaire"""
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_FORMAT}:{LEXER_HASH}:{GRAMMAR_HASH}:".encode('ascii'))
+    digest.update(source_code.encode('utf-8', errors='surrogatepass'))
+    return digest.hexdigest()
+
+
+_ENTRY_KEYS = frozenset(('success', 'tokens', 'ast', 'errors'))
+
+
+def _valid_entry(entry):
+    """Vrai si entry a la forme des entrées écrites par put()"""
+    return (type(entry) is dict and entry.keys() == _ENTRY_KEYS
+            and type(entry['success']) is bool
+            and isinstance(entry['tokens'], TokenStore)
+            and (entry['ast'] is None or isinstance(entry['ast'], Program))
+            and type(entry['errors']) is list
+            and all(type(error) is str for error in entry['errors']))
+
+
+class CompilationCache:
+    """Résultats de compilation (succès, tokens, AST, erreurs) par source.
+    Les entrées rendues sont partagées: elles ne doivent pas être modifiées."""
+
+    def __init__(self, max_entries=256, directory=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def get(self, source_code, variant=''):
+        """Retourne l'entrée du source, ou None s'il n'a jamais été compilé.
+        variant distingue les compilations d'un même source avec d'autres options."""
+        key = source_key(source_code) + (f"-{variant}" if variant else '')
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry
+        entry = self._load(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return entry
+
+    def put(self, source_code, success, tokens, ast, errors, variant=''):
+        """Enregistre le résultat d'une compilation"""
+        key = source_key(source_code) + (f"-{variant}" if variant else '')
+        entry = {'success': success, 'tokens': tokens, 'ast': ast, 'errors': list(errors)}
+        with self._lock:
+            self._remember(key, entry)
+        if self.directory:
+            self._store(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            if not _valid_entry(entry):
+                raise ValueError("entrée de cache invalide")
+            # Date d'accès pour l'éviction LRU sur disque
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Fichier illisible, tronqué, d'un autre format ou qui référence un
+            # module absent: simple absence, et le fichier est supprimé
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _store(self, key, entry):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError, RecursionError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """Supprime les entrées les plus anciennes au-delà de max_disk_bytes"""
+        files = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith('.pickle'):
+                    stat = item.stat()
+                    files.append((stat.st_mtime, stat.st_size, item.path))
+                    total += stat.st_size
+        if total <= self.max_disk_bytes:
+            return
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self):
+        """Compteurs du cache"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._memory),
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
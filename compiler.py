@@ -2,90 +2,381 @@
 Module central du compilateur Mini-Pascal
 Coordonne lexer, parser et AST
 """
-from lexer import lexer, find_column
-from parser_1 import parser
-from errors import LexicalError, SyntaxError_
+import io
+import math
+from contextlib import nullcontext
+from functools import partial
+from lexer import lexer as shared_lexer
+import dfa_lexer
+from parser_1 import ParserContext, new_parser, partial_program, unexpected_eof
+from errors import LexicalError, SyntaxError_, RuntimeError_
+from semantic import SemanticAnalyzer
 import ast_1
+import incremental
+from token_store import TokenStore
+from profiling import Profiler, count_nodes
+
+# Moteurs d'analyse lexicale: même interface, mêmes tokens
+LEXER_BACKENDS = {'ply': shared_lexer, 'dfa': dfa_lexer.lexer}
 
 class PascalCompiler:
-    def __init__(self):
+    """Compilateur réentrant: chaque instance possède son lexer, son parser
+    et son contexte, plusieurs instances peuvent donc travailler en parallèle"""
+
+    def __init__(self, cache=None, incremental=False, lexer_backend='ply', recover=False,
+                 profile=False, profile_memory=False):
+        # cache: CompilationCache optionnel, partagé entre instances si besoin
+        self.cache = cache
+        # incremental: après une modification, ne relire et reparser que la zone touchée
+        self.incremental = incremental
+        self._previous = None      # incremental.Snapshot de la dernière analyse
+        self._pending = None       # (Snapshot, Relexed) en attente de reparsing
+        self._spans = None         # découpage de self.ast en instructions
+        # Dernière réanalyse incrémentale: tokens relus, instructions reparsées...
+        self.incremental_stats = None
+        # recover: continuer après une erreur lexicale ou syntaxique pour les signaler
+        # toutes en un passage; l'AST est alors partiel (instructions erronées omises)
+        self.recover = recover
+        self.lexical_errors = []
+        self.syntax_errors = []
+        # lexer_backend: 'ply' (expressions régulières) ou 'dfa' (automate écrit à la main)
+        if lexer_backend not in LEXER_BACKENDS:
+            raise ValueError(f"Moteur lexical inconnu: {lexer_backend}")
+        self.lexer = LEXER_BACKENDS[lexer_backend].clone()
+        self.parser = new_parser()
+        self.context = ParserContext()
+        self.lexer.context = self.context
         self.source_code = ""
-        self.tokens = []
+        self.tokens = TokenStore()
         self.ast = None
         self.errors = []
+        # Résultat du dernier compile() sur ce source (None: pas encore compilé)
+        self.compiled = None
+        # Tokens PLY de la dernière analyse lexicale, rejoués dans le parser
+        self.token_buffer = None
+        # (nombre de nœuds, profondeur maximale) du dernier rendu de l'AST
+        self.tree_stats = (0, 0)
+        # Rapport de la dernière optimisation (None: AST tel que parsé)
+        self.optimization = None
+        # profile: temps, tokens et nœuds de chaque phase dans self.stats;
+        # profile_memory: en plus, pic mémoire par phase (tracemalloc, plus lent)
+        self.profiler = Profiler(memory=profile_memory) if profile or profile_memory else None
+
+    @property
+    def stats(self):
+        """Mesures par phase (profiling.CompilationStats) depuis le dernier
+        set_source ou compile, ou None sans profilage"""
+        return self.profiler.stats if self.profiler is not None else None
+
+    def _phase(self, name):
+        """Contexte qui mesure la phase name si le profilage est actif"""
+        return self.profiler.phase(name) if self.profiler is not None else nullcontext()
+
+    def _counts(self, name, tokens=None, nodes=None):
+        """Renseigne les compteurs de la phase name (profilage actif seulement)"""
+        phase = self.profiler.stats.phases.get(name)
+        if phase is not None:
+            phase.tokens = tokens
+            phase.nodes = nodes
     
     def set_source(self, source_code):
         """Définit le code source à compiler"""
+        if source_code != self.source_code:
+            # Nouveau texte: les tokens et l'AST précédents ne sont plus valides,
+            # mais servent de point de départ à une réanalyse incrémentale
+            if self.incremental and not self.recover and self.token_buffer is not None:
+                # Un AST optimisé ne correspond plus au texte: seuls les tokens sont repris
+                ast = self.ast if self.optimization is None else None
+                self._previous = incremental.Snapshot(
+                    self.source_code, self.token_buffer, self.tokens, ast, self._spans)
+            self._pending = None
+            self._spans = None
+            self.tokens = TokenStore()
+            self.ast = None
+            self.compiled = None
+            self.optimization = None
+            self.token_buffer = None
+            self.context = ParserContext(source_code)
+            self.lexer.context = self.context
+        if self.profiler is not None:
+            # Seul point de remise à zéro: les mesures portent sur les analyses
+            # faites depuis le dernier set_source (ou compile)
+            self.profiler.reset(len(source_code.encode('utf-8', errors='surrogatepass')))
         self.source_code = source_code
-        # Met à jour le texte source global pour le parser
-        import parser_1
-        parser_1.source_text = source_code
     
     def compile(self, source_code):
-        """Exécute toutes les étapes de compilation"""
-        self.source_code = source_code
+        """Exécute toutes les étapes de compilation (un seul passage du lexer)"""
+        self.compiled = self._compile_cached(source_code)
+        return self.compiled
+
+    def _compile_cached(self, source_code):
+        """Compilation, servie par le cache s'il y en a un"""
+        self.set_source(source_code)
         self.errors = []
-        
+        self.optimization = None
+
+        if self.cache is not None:
+            # Les erreurs (et l'AST) dépendent du mode récupération
+            variant = 'recuperation' if self.recover else ''
+            with self._phase('cache'):
+                entry = self.cache.get(source_code, variant)
+            if entry is not None:
+                if self.profiler is not None:
+                    self._counts('cache', tokens=len(entry['tokens']))
+                self.tokens = entry['tokens']
+                self.ast = entry['ast']
+                self.errors = list(entry['errors'])
+                self.token_buffer = None
+                return entry['success']
+            success = self._compile()
+            self.cache.put(source_code, success, self.tokens, self.ast, self.errors, variant)
+            return success
+        return self._compile()
+
+    def _compile(self):
+        """Analyses lexicale, syntaxique et sémantique, sans passer par le cache"""
         # Étape 1: Analyse lexicale
         tokens, lex_error = self.lexical_analysis()
-        if lex_error:
+        if lex_error and not self.recover:
             self.errors.append(f"Erreur lexicale: {lex_error}")
             return False
             
         # Étape 2: Analyse syntaxique
         ast, parse_error = self.syntactic_analysis()
-        if parse_error:
+        if parse_error and not self.recover:
             self.errors.append(f"Erreur syntaxique: {parse_error}")
             return False
             
         self.ast = ast
-        return True
+
+        if lex_error or parse_error:
+            # Mode récupération: toutes les erreurs, dans l'ordre du texte
+            diagnostics = ([("Erreur lexicale", e) for e in self.lexical_errors]
+                           + [("Erreur syntaxique", e) for e in self.syntax_errors])
+            diagnostics.sort(key=lambda item: (item[1].lineno or math.inf, item[1].col or 0))
+            self.errors.extend(f"{kind}: {error}" for kind, error in diagnostics)
+            return False
+
+        # Étape 3: Analyse sémantique (toutes les erreurs en un passage)
+        with self._phase('semantic'):
+            semantic_errors = SemanticAnalyzer(ast).analyze()
+        if self.profiler is not None:
+            self._counts('semantic', nodes=count_nodes(ast))
+        for error in semantic_errors:
+            self.errors.append(f"Erreur sémantique: {error}")
+        return not semantic_errors
     
     def lexical_analysis(self):
         """Analyse lexicale - retourne des tokens avec informations de position"""
         try:
+            previous = self._previous
+            if previous is not None:
+                self._previous = None
+                with self._phase('lexical'):
+                    result = self._relex(previous)
+                if self.profiler is not None:
+                    self._counts('lexical', tokens=len(self.tokens))
+                return result
+            lexer = self.lexer
             lexer.input(self.source_code)
-            tokens_list = []
-            while True:
-                tok = lexer.token()
-                if not tok:
-                    break
-                # Calcul de la colonne
-                col = find_column(self.source_code, tok)
-                tokens_list.append({
-                    'type': tok.type,
-                    'value': tok.value,
-                    'line': tok.lineno,
-                    'column': col
-                })
+            lexer.lineno = 1
+            if self.recover:
+                # Les caractères invalides sont notés et ignorés
+                self.context.errors = []
+            with self._phase('lexical'):
+                buffer = list(iter(lexer.token, None))
+            # Tokens rangés par colonnes; les dictionnaires sont recréés à la lecture
+            with self._phase('columns'):
+                tokens_list = TokenStore.from_lextokens(buffer, self.context.line_index.column)
+            if self.profiler is not None:
+                self._counts('lexical', tokens=len(buffer))
+                self._counts('columns', tokens=len(buffer))
+            self.token_buffer = buffer
+            self.tokens = tokens_list
+            if self.recover:
+                self.lexical_errors = self.context.errors
+                self.context.errors = None
+                if self.lexical_errors:
+                    return tokens_list, "\n".join(str(e) for e in self.lexical_errors)
             return tokens_list, None
         except LexicalError as e:
+            self.token_buffer = None
             return None, str(e)
     
+    def _relex(self, previous):
+        """Analyse lexicale de la seule zone modifiée depuis previous"""
+        damage = incremental.text_damage(previous.source, self.source_code)
+        relexed = incremental.relex(self.lexer, previous.tokens, self.source_code, damage)
+        buffer = incremental.splice_tokens(previous.tokens, relexed)
+        self.tokens = incremental.splice_token_store(
+            previous.token_store, relexed, buffer, self.context.line_index)
+        self.token_buffer = buffer
+        self._pending = (previous, relexed)
+        self.incremental_stats = {
+            'relexed_tokens': len(relexed.middle),
+            'reused_tokens': len(buffer) - len(relexed.middle),
+            'reparsed_statements': None,
+            'statements': None,
+        }
+        return self.tokens, None
+
+    def _reparse(self):
+        """Reparse les instructions touchées; None si une analyse complète est nécessaire"""
+        previous, relexed = self._pending
+        self._pending = None
+        try:
+            result = incremental.reparse(self.parser, self.lexer, previous,
+                                         self.token_buffer, relexed)
+        except SyntaxError_:
+            # L'analyse complète donne le message d'erreur de référence
+            return None
+        if result is None:
+            return None
+        self.ast, self._spans, reparsed = result
+        self.incremental_stats['reparsed_statements'] = reparsed
+        self.incremental_stats['statements'] = len(self._spans)
+        return self.ast
+
     def syntactic_analysis(self):
         """Analyse syntaxique et construction AST"""
+        if self.token_buffer is None and (self.incremental or self.recover):
+            # Tokens conservés pour la prochaine réanalyse incrémentale,
+            # ou erreurs lexicales notées à part en mode récupération
+            _, error = self.lexical_analysis()
+            if error and not self.recover:
+                return None, error
+        with self._phase('syntactic'):
+            result = self._parse()
+        if self.profiler is not None:
+            tokens = len(self.token_buffer) if self.token_buffer is not None else None
+            self._counts('syntactic', tokens=tokens, nodes=count_nodes(result[0]))
+        return result
+
+    def _parse(self):
+        """Analyse syntaxique des tokens de la dernière analyse lexicale (ou du source)"""
         try:
-            lexer.input(self.source_code)
-            self.ast = parser.parse(self.source_code, lexer=lexer, debug=False)
+            lexer = self.lexer
+            if self.recover:
+                return self._parse_recovering()
+            if self._pending is not None and self._reparse() is not None:
+                return self.ast, None
+            if self.token_buffer is not None:
+                # Rejoue les tokens déjà produits au lieu de relancer le lexer
+                tokenfunc = partial(next, iter(self.token_buffer), None)
+                self.ast = self.parser.parse(lexer=lexer, debug=False, tokenfunc=tokenfunc)
+            else:
+                lexer.input(self.source_code)
+                lexer.lineno = 1
+                self.ast = self.parser.parse(lexer=lexer, debug=False)
+            if self.incremental and self.token_buffer is not None:
+                self._spans = incremental.statement_spans(self.token_buffer)
             return self.ast, None
         except SyntaxError_ as e:
             return None, str(e)
         except Exception as e:
             return None, f"Erreur lors de l'analyse syntaxique: {str(e)}"
     
-    def build_ast(self):
-        """Construit et retourne la représentation textuelle de l'AST"""
+    def _parse_recovering(self):
+        """Analyse syntaxique qui note toutes les erreurs; retourne (AST partiel, erreurs)"""
+        context = self.context
+        errors = context.errors = []
+        context.parser = self.parser
         try:
+            tokenfunc = partial(next, iter(self.token_buffer), None)
+            self.ast = self.parser.parse(lexer=self.lexer, debug=False, tokenfunc=tokenfunc)
+            if self.ast is None:
+                # PLY abandonne en silence une fin de fichier atteinte pendant une reprise
+                raise unexpected_eof()
+        except SyntaxError_ as e:
+            # Fin de fichier inattendue: l'erreur est notée, l'AST garde ce qui était complet
+            errors.append(e)
+            self.ast = partial_program(self.parser, context)
+        finally:
+            context.errors = None
+            context.parser = context.recovered = None
+        self.syntax_errors = errors
+        if errors:
+            return self.ast, "\n".join(str(e) for e in errors)
+        return self.ast, None
+
+    def semantic_analysis(self):
+        """Vérifie les types de l'AST; retourne (analyseur, erreurs ou None)"""
+        ast = self.ast
+        if ast is None:
             ast, error = self.syntactic_analysis()
             if error:
                 return None, error
-            if ast and hasattr(ast, 'to_tree_string'):
-                return ast.to_tree_string(), None
+        with self._phase('semantic'):
+            analyzer = SemanticAnalyzer(ast)
+            errors = analyzer.analyze()
+        if self.profiler is not None:
+            self._counts('semantic', nodes=count_nodes(ast))
+        if errors:
+            return analyzer, "\n".join(str(error) for error in errors)
+        return analyzer, None
+
+    def build_ast(self):
+        """Construit et retourne la représentation textuelle de l'AST"""
+        try:
+            ast = self.ast
+            if ast is None:
+                ast, error = self.syntactic_analysis()
+                if error:
+                    return None, error
+            if ast and hasattr(ast, 'tree_items'):
+                out = io.StringIO()
+                with self._phase('rendering'):
+                    self.tree_stats = ast_1.render_tree(ast, out)
+                if self.profiler is not None:
+                    self._counts('rendering', nodes=count_nodes(ast))
+                return out.getvalue(), None
             else:
                 return None, "AST non disponible ou invalide"
         except Exception as e:
             return None, f"Erreur lors de la construction de l'AST: {str(e)}"
     
+    def optimize(self):
+        """Remplace l'AST par sa version optimisée; retourne le rapport.
+        L'AST d'origine (éventuellement partagé par le cache) n'est pas modifié."""
+        if self.ast is None:
+            return None
+        if self.optimization is None:
+            from optimizer import optimize
+            with self._phase('optimization'):
+                self.ast, self.optimization = optimize(self.ast)
+            if self.profiler is not None:
+                self._counts('optimization', nodes=count_nodes(self.ast))
+        return self.optimization
+
+    def execute(self, engine='interpreter'):
+        """Exécute l'AST compilé; retourne les variables finales.
+        engine: 'interpreter' (fermetures), 'bytecode' (machine virtuelle)
+        ou 'python' (source Python compilé, mis en cache par source)"""
+        if self.ast is None:
+            return None, "AST non disponible"
+        if self.compiled is False:
+            # AST non validé (types, bornes des for...): les moteurs ne le vérifient pas tous
+            return None, "Compilation échouée: le programme ne peut pas être exécuté"
+        with self._phase('execution'):
+            return self._execute(engine)
+
+    def _execute(self, engine):
+        try:
+            if engine == 'bytecode':
+                import bytecode
+                return bytecode.run(bytecode.compile_program(self.ast)), None
+            if engine == 'python':
+                import transpile
+                from cache import source_key
+                key = source_key(self.source_code) if self.source_code else None
+                if key is not None and self.optimization is not None:
+                    key += ':optimisé'
+                return transpile.run(transpile.compile_program(self.ast, key)), None
+            from interpreter import Interpreter
+            return Interpreter(self.ast).run(), None
+        except RuntimeError_ as e:
+            return None, f"Erreur d'exécution: {e}"
+    
     def get_ast_tree(self):
         """Retourne la représentation textuelle de l'AST"""
         if self.ast and hasattr(self.ast, 'to_tree_string'):
@@ -96,4 +387,8 @@ class PascalCompiler:
         """Retourne l'AST en format JSON"""
         if self.ast and hasattr(self.ast, 'serialize'):
             return self.ast.serialize()
-        return {}
\ No newline at end of file
+        return {}
+
+    def write_ast_json(self, out):
+        """Écrit l'AST en JSON directement dans un objet fichier"""
+        ast_1.write_json(self.ast, out)
\ No newline at end of file
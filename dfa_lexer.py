@@ -0,0 +1,260 @@
+"""
+Lexer à automate écrit à la main, alternative au lexer PLY: mêmes types de tokens,
+mêmes valeurs, mêmes positions et mêmes messages d'erreur
+
+Le premier caractère d'un token donne sa classe dans une table précalculée, qui
+choisit directement la transition; les suites d'un même genre (fin d'identificateur,
+chiffres) sont parcourues en C par de petites expressions ancrées, sans l'alternative
+géante ni les callbacks de PLY. Les mots réservés passent par un hachage parfait.
+
+L'interface est celle d'un lexer PLY (input, token, lineno, lexpos, clone): il se
+branche sur parser_1.parser avec parse(lexer=...) ou parse(tokenfunc=lexer.token).
+"""
+import copy
+import re
+
+import ply.lex as lex
+
+from errors import LexicalError
+from lexer import reserved
+from line_index import get_line_index
+from symbol_table import NAMES
+
+# Classes de caractères
+(_OTHER, _BLANK, _NEWLINE, _LETTER, _DIGIT, _LBRACE,
+ _SINGLE, _COLON, _LESS, _GREATER) = range(10)
+
+_SINGLES = {
+    '+': 'PLUS', '-': 'MINUS', '*': 'MULT', '/': 'DIVIDE', '=': 'EQUAL',
+    '(': 'LPAREN', ')': 'RPAREN', ';': 'SEMI', ',': 'COMMA', '.': 'DOT',
+}
+
+
+def _class_table():
+    """Classe de chaque caractère ASCII; les autres sont classés à la demande"""
+    table = dict.fromkeys(map(chr, range(128)), _OTHER)
+    table.update(dict.fromkeys(' \t', _BLANK))
+    table['\n'] = _NEWLINE
+    table.update(dict.fromkeys('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_', _LETTER))
+    table.update(dict.fromkeys('0123456789', _DIGIT))
+    table['{'] = _LBRACE
+    table.update(dict.fromkeys(_SINGLES, _SINGLE))
+    table[':'] = _COLON
+    table['<'] = _LESS
+    table['>'] = _GREATER
+    return table
+
+
+_CLASSES = _class_table()
+
+# Suites parcourues en C (mêmes ensembles de caractères que les règles PLY:
+# \d accepte tous les chiffres Unicode, un identificateur seulement l'ASCII)
+_IDENT_TAIL = re.compile(r'[a-zA-Z0-9_]*')
+_NUMBER = re.compile(r'\d+(\.\d+)?')
+
+
+# Paramètres trouvés par _perfect_hash pour les mots réservés actuels
+_PRECOMPUTED = (6, 12, 40)
+
+
+def _perfect_hash(words):
+    """Paramètres (a, b, taille) d'un hachage sans collision sur words:
+    (a * premier caractère + b * dernier + longueur) % taille"""
+    a, b, size = _PRECOMPUTED
+    if len({(a * ord(w[0]) + b * ord(w[-1]) + len(w)) % size for w in words}) == len(words):
+        return _PRECOMPUTED
+    # Mots réservés modifiés: nouvelle recherche
+    for size in range(len(words), 8 * len(words)):
+        for a in range(1, 32):
+            for b in range(1, 32):
+                slots = {(a * ord(w[0]) + b * ord(w[-1]) + len(w)) % size for w in words}
+                if len(slots) == len(words):
+                    return a, b, size
+    raise ValueError("Aucun hachage parfait trouvé pour les mots réservés")
+
+
+_HASH_A, _HASH_B, _HASH_SIZE = _perfect_hash(list(reserved))
+# Case -> (mot, type du token); None si la case est vide
+_KEYWORDS = [None] * _HASH_SIZE
+for _word, _type in reserved.items():
+    _KEYWORDS[(_HASH_A * ord(_word[0]) + _HASH_B * ord(_word[-1]) + len(_word)) % _HASH_SIZE] = (_word, _type)
+_MIN_KEYWORD = min(map(len, reserved))
+_MAX_KEYWORD = max(map(len, reserved))
+del _word, _type
+
+
+def keyword_type(key):
+    """Type du mot réservé key (en minuscules), ou None pour un identificateur"""
+    if _MIN_KEYWORD <= len(key) <= _MAX_KEYWORD:
+        entry = _KEYWORDS[(_HASH_A * ord(key[0]) + _HASH_B * ord(key[-1]) + len(key)) % _HASH_SIZE]
+        if entry is not None and entry[0] == key:
+            return entry[1]
+    return None
+
+
+class DFALexer:
+    """Lexer table-driven compatible avec l'interface du lexer PLY"""
+
+    def __init__(self):
+        self.lexdata = ''
+        self.lexpos = 0
+        self.lexlen = 0
+        self.lineno = 1
+        self._tokens = None
+        # Contexte de la compilation (ParserContext), pour les colonnes d'erreur
+        self.context = None
+
+    def clone(self):
+        """Copie indépendante, comme lex.Lexer.clone(): elle reprend à lexpos / lineno
+        avec son propre générateur (partager celui de l'original volerait ses tokens)"""
+        clone = copy.copy(self)
+        clone._tokens = None
+        return clone
+
+    def input(self, text):
+        self.lexdata = text
+        self.lexpos = 0
+        self.lexlen = len(text)
+        self._tokens = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
+
+    def _error(self, pos, lineno):
+        """Lève l'erreur, ou la note si le contexte collecte les erreurs
+        (le caractère est alors ignoré, comme avec le lexer PLY)"""
+        if self.context is not None:
+            col = self.context.line_index.column(pos)
+        else:
+            col = get_line_index(self.lexdata).column(pos)
+        error = LexicalError(
+            f"Caractère non reconnu '{self.lexdata[pos]}' à la ligne {lineno}, colonne {col}",
+            lineno, col)
+        errors = getattr(self.context, 'errors', None)
+        if errors is None:
+            raise error
+        errors.append(error)
+
+    def token(self):
+        """Token suivant (LexToken), ou None à la fin du texte"""
+        tokens = self._tokens
+        if tokens is None:
+            # Démarre à lexpos / lineno, éventuellement modifiés après input()
+            tokens = self._tokens = self._scan()
+        return next(tokens, None)
+
+    def _scan(self):
+        """Générateur des tokens; lexpos et lineno sont mis à jour à chaque token"""
+        text = self.lexdata
+        pos = self.lexpos
+        length = self.lexlen
+        lineno = self.lineno
+        classes = _CLASSES
+        keywords, hash_a, hash_b = _KEYWORDS, _HASH_A, _HASH_B
+        while pos < length:
+            char = text[pos]
+            kind = classes.get(char)
+            if kind is None:
+                kind = _DIGIT if char.isdecimal() else _OTHER
+            if kind == _BLANK:
+                pos += 1
+                continue
+            if kind == _NEWLINE:
+                pos += 1
+                lineno += 1
+                continue
+            tok = lex.LexToken()
+            tok.lineno = lineno
+            tok.lexpos = pos
+            tok.lexer = self
+            if kind == _LETTER:
+                end = _IDENT_TAIL.match(text, pos + 1).end()
+                value = text[pos:end]
+                key = value.lower()
+                kind = None
+                if _MIN_KEYWORD <= end - pos <= _MAX_KEYWORD:
+                    # Hachage parfait (voir keyword_type), écrit en ligne
+                    entry = keywords[(hash_a * ord(key[0]) + hash_b * ord(key[-1]) + end - pos)
+                                     % _HASH_SIZE]
+                    if entry is not None and entry[0] == key:
+                        kind = entry[1]
+                if kind is None:
+                    tok.type = 'ID'
+                    tok.name_id = NAMES.intern_folded(key)
+                elif kind == 'BOOL_CONST':
+                    tok.type = kind
+                    value = key == 'true'
+                else:
+                    tok.type = kind
+                pos = end
+            elif kind == _SINGLE:
+                tok.type = _SINGLES[char]
+                value = char
+                pos += 1
+            elif kind == _DIGIT:
+                match = _NUMBER.match(text, pos)
+                value = match.group()
+                if match.lastindex:
+                    tok.type = 'REAL_CONST'
+                    value = float(value)
+                else:
+                    tok.type = 'INT_CONST'
+                    value = int(value)
+                pos = match.end()
+            elif kind == _LBRACE:
+                close = text.find('}', pos + 1)
+                if close < 0:
+                    self.lineno = lineno
+                    self._error(pos, lineno)
+                    pos += 1
+                    continue
+                lineno += text.count('\n', pos, close)
+                pos = close + 1
+                continue
+            elif kind == _COLON:
+                if text.startswith('=', pos + 1):
+                    tok.type, value = 'ASSIGN', ':='
+                    pos += 2
+                else:
+                    tok.type, value = 'COLON', ':'
+                    pos += 1
+            elif kind == _LESS:
+                following = text[pos + 1:pos + 2]
+                if following == '>':
+                    tok.type, value = 'NEQ', '<>'
+                    pos += 2
+                elif following == '=':
+                    tok.type, value = 'LEQ', '<='
+                    pos += 2
+                else:
+                    tok.type, value = 'LT', '<'
+                    pos += 1
+            elif kind == _GREATER:
+                if text.startswith('=', pos + 1):
+                    tok.type, value = 'GEQ', '>='
+                    pos += 2
+                else:
+                    tok.type, value = 'GT', '>'
+                    pos += 1
+            else:
+                self.lexpos = pos
+                self.lineno = lineno
+                self._error(pos, lineno)
+                pos += 1
+                continue
+            tok.value = value
+            self.lexpos = pos
+            self.lineno = lineno
+            yield tok
+        self.lexpos = pos
+        self.lineno = lineno
+
+
+# Lexer du module, à cloner comme lexer.lexer
+lexer = DFALexer()
@@ -1,4 +1,6 @@
 # Gestion des erreurs lexicales et syntaxiques
+from line_index import get_line_index
+
 class LexicalError(Exception):
     def __init__(self, message, lineno=None, col=None):
         super().__init__(message)
@@ -11,11 +13,23 @@ class SyntaxError_(Exception):
         self.lineno = lineno
         self.col = col
 
+class SemanticError(Exception):
+    def __init__(self, message, lineno=None, col=None):
+        super().__init__(message)
+        self.lineno = lineno
+        self.col = col
+
+class RuntimeError_(Exception):
+    def __init__(self, message, lineno=None, col=None):
+        super().__init__(message)
+        self.lineno = lineno
+        self.col = col
+
 """Formate une ligne avec marqueur de position d'erreur"""
-def format_error_line(source, lineno, col): 
-    lines = source.split('\n')
-    if 0 < lineno <= len(lines):
-        line_text = lines[lineno - 1]
+def format_error_line(source, lineno, col, line_index=None): 
+    index = line_index if line_index is not None else get_line_index(source)
+    if 0 < lineno <= index.line_count():
+        line_text = index.line_text(lineno)
         marker = ' ' * (col - 1) + '^'
         return f"{line_text}\n{marker}"
     return ''
\ No newline at end of file
@@ -0,0 +1,442 @@
+"""
+AST à plat: les nœuds rangés dans des tableaux typés parallèles, une ligne par nœud,
+plutôt qu'en objets de ast_1; une couche de vues expose les mêmes attributs
+
+Chaque nœud a un genre (classe de ast_1, liste ou enfant absent), un premier enfant
+et un frère suivant (indices, -1 si aucun), sa ligne, sa colonne, un indice dans la
+table des valeurs (nom ou valeur d'un littéral) et un dans celle des chaînes
+(opérateur, type d'une variable, sens d'une boucle for). Les enfants suivent l'ordre
+de ast_1.CHILD_FIELDS: une liste d'enfants est un nœud LIST, un enfant absent un
+nœud NONE, pour que chaque champ garde sa position.
+
+Le parser écrit directement dans les tableaux (FlatBuilder remplace les classes de
+ast_1 dans ses actions). Les nœuds sont numérotés en post-ordre: les enfants avant
+leur parent, la racine en dernier.
+
+Les tableaux passent d'un processus à l'autre sans copie: pickle protocole 5
+(tampons hors bande) ou to_bytes() / FlatAST.from_buffer() sur une mémoire partagée.
+"""
+import pickle
+import struct
+from array import array
+
+from ast_1 import (ASTNode, Declaration, Reference, Program, Block, ConstDecl, VarDecl,
+                   Assign, If, While, For, Repeat, Compound, BinaryOp, UnaryOp, VarRef,
+                   Literal, CHILD_FIELDS, _FIELD_NAMES, field_names)
+from lexer import lexer as shared_lexer
+from parser_1 import ParserContext, new_parser
+from symbol_table import NAMES
+
+# Genres: enfant absent, liste d'enfants, puis les classes de ast_1
+NONE, LIST = 0, 1
+CLASSES = tuple(CHILD_FIELDS)
+KINDS = {cls: kind for kind, cls in enumerate(CLASSES, 2)}
+
+# Champs scalaires rangés dans la table des valeurs, et dans celle des chaînes
+_VALUE_FIELDS = ('name', 'value')
+_STRING_FIELDS = ('op', 'type', 'direction')
+
+# Colonnes: (attribut, code de type de array)
+COLUMNS = (('kinds', 'B'), ('first_child', 'i'), ('next_sibling', 'i'),
+           ('linenos', 'I'), ('cols', 'I'), ('value_ids', 'i'), ('string_ids', 'i'))
+
+MAGIC = b'FAST'
+FORMAT_VERSION = 1
+# En-tête de to_bytes(): magie, version, racine, nombre de nœuds, taille des tables
+_HEADER = struct.Struct('<4sHxxiII')
+_ALIGN = 8
+
+
+def _key(value):
+    # Les chaînes sont leur propre clé; 1, 1.0 et True restent distincts
+    return value if value.__class__ is str else (value.__class__, value)
+
+
+class FlatAST:
+    """Arbre en colonnes: kinds en array('B'), liens et indices en array('i'),
+    lignes et colonnes en array('I'). Après un chargement sans copie, les colonnes
+    sont des memoryview en lecture seule sur le tampon reçu."""
+
+    __slots__ = tuple(name for name, _ in COLUMNS) + ('values', 'strings', 'root')
+
+    def __init__(self):
+        for name, code in COLUMNS:
+            setattr(self, name, array(code))
+        self.values = []        # noms et valeurs des littéraux, sans doublon
+        self.strings = []       # opérateurs, types, sens des boucles, sans doublon
+        self.root = -1
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __repr__(self):
+        return f"<FlatAST: {len(self)} nœuds, {len(self.values)} valeurs distinctes>"
+
+    @property
+    def nbytes(self):
+        """Taille des colonnes en octets (hors tables de valeurs)"""
+        return sum(memoryview(getattr(self, name)).nbytes for name, _ in COLUMNS)
+
+    def children(self, index):
+        """Indices des enfants d'un nœud, dans l'ordre"""
+        result = []
+        child = self.first_child[index]
+        following = self.next_sibling
+        while child >= 0:
+            result.append(child)
+            child = following[child]
+        return result
+
+    def node(self, index):
+        """Vue sur le nœud index (None pour un enfant absent, liste de vues pour une liste)"""
+        kind = self.kinds[index]
+        if kind == NONE:
+            return None
+        if kind == LIST:
+            return [self.node(child) for child in self.children(index)]
+        return _VIEWS[kind](self, index)
+
+    @property
+    def program(self):
+        """Vue sur la racine"""
+        return self.node(self.root) if self.root >= 0 else None
+
+    # Conversions avec les objets de ast_1
+
+    @classmethod
+    def from_tree(cls, root):
+        """Met à plat un arbre de ast_1 (parcours itératif, enfants avant parents)"""
+        builder = FlatBuilder()
+        results = []
+        stack = [(root, False)]
+        while stack:
+            node, done = stack.pop()
+            if node is None:
+                results.append(None)
+                continue
+            if node.__class__ is _ListMarker:
+                items = results[len(results) - node.count:]
+                del results[len(results) - node.count:]
+                results.append(items)
+                continue
+            fields = CHILD_FIELDS[node.__class__]
+            if not done:
+                stack.append((node, True))
+                for name, is_list in reversed(fields):
+                    value = getattr(node, name)
+                    if is_list:
+                        stack.append((_ListMarker(len(value)), True))
+                        stack.extend((item, False) for item in reversed(value))
+                    else:
+                        stack.append((value, False))
+                continue
+            arguments = {}
+            if fields:
+                for (name, _), value in zip(fields, results[len(results) - len(fields):]):
+                    arguments[name] = value
+                del results[len(results) - len(fields):]
+            for name in field_names(node.__class__):
+                if name not in arguments:
+                    arguments[name] = getattr(node, name)
+            results.append(getattr(builder, node.__class__.__name__)(**arguments))
+        return builder.finish(results[0])
+
+    def to_tree(self):
+        """Objets de ast_1 équivalents, en un passage: les enfants précèdent leur parent"""
+        kinds, values, strings = self.kinds, self.values, self.strings
+        value_ids, string_ids = self.value_ids, self.string_ids
+        linenos, cols = self.linenos, self.cols
+        built = [None] * len(kinds)
+        for index in range(len(kinds)):
+            kind = kinds[index]
+            if kind == NONE:
+                continue
+            if kind == LIST:
+                built[index] = [built[child] for child in self.children(index)]
+                continue
+            cls = CLASSES[kind - 2]
+            arguments = dict(zip((name for name, _ in CHILD_FIELDS[cls]),
+                                 (built[child] for child in self.children(index))))
+            for name in _SCALARS[cls]:
+                if name in _VALUE_FIELDS:
+                    arguments[name] = values[value_ids[index]]
+                else:
+                    arguments[name] = strings[string_ids[index]]
+            node = built[index] = cls(lineno=linenos[index], col=cols[index], **arguments)
+            if cls in _NAMED:
+                node.name_id = NAMES.intern(node.name)
+        return built[self.root] if self.root >= 0 else None
+
+    # Transfert entre processus
+
+    def __reduce_ex__(self, protocol):
+        columns = [getattr(self, name) for name, _ in COLUMNS]
+        if protocol >= 5:
+            # Tampons hors bande si le pickler a un buffer_callback, sinon copiés en bande
+            columns = [pickle.PickleBuffer(column) for column in columns]
+        return _rebuild, (tuple(columns), self.values, self.strings, self.root)
+
+    def to_bytes(self):
+        """Un seul bloc: en-tête, tables picklées, puis les colonnes alignées"""
+        tables = pickle.dumps((self.values, self.strings), protocol=pickle.HIGHEST_PROTOCOL)
+        parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, self.root, len(self), len(tables)), tables]
+        size = _HEADER.size + len(tables)
+        for name, _ in COLUMNS:
+            padding = -size % _ALIGN
+            data = memoryview(getattr(self, name)).cast('B')
+            parts.append(b'\0' * padding)
+            parts.append(data)
+            size += padding + data.nbytes
+        return b''.join(parts)
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """FlatAST dont les colonnes sont des vues sur buffer (bytes, mmap,
+        SharedMemory.buf...), sans copie; buffer doit rester valide"""
+        data = memoryview(buffer).cast('B')
+        magic, version, root, count, tables_size = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Ce n'est pas un AST à plat")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Version de format non supportée: {version}")
+        flat = cls.__new__(cls)
+        offset = _HEADER.size
+        flat.values, flat.strings = pickle.loads(data[offset:offset + tables_size])
+        offset += tables_size
+        for name, code in COLUMNS:
+            offset += -offset % _ALIGN
+            size = count * array(code).itemsize
+            setattr(flat, name, data[offset:offset + size].cast(code))
+            offset += size
+        flat.root = root
+        return flat
+
+
+def _rebuild(columns, values, strings, root):
+    flat = FlatAST.__new__(FlatAST)
+    for (name, code), column in zip(COLUMNS, columns):
+        if not isinstance(column, array):
+            # Tampon reçu (bytes, PickleBuffer hors bande...): vue typée sans copie
+            column = memoryview(column).cast('B').cast(code)
+        setattr(flat, name, column)
+    flat.values, flat.strings, flat.root = values, strings, root
+    return flat
+
+
+class _ListMarker:
+    """Marqueur de pile de from_tree: les count derniers résultats forment une liste"""
+    __slots__ = ('count',)
+
+    def __init__(self, count):
+        self.count = count
+
+
+# Champs scalaires de chaque classe (hors ligne et colonne), dans l'ordre des champs
+_SCALARS = {cls: tuple(name for name in field_names(cls)
+                       if (name in _VALUE_FIELDS or name in _STRING_FIELDS)
+                       and name not in dict(CHILD_FIELDS[cls]))
+            for cls in CLASSES}
+
+# Classes dont les nœuds portent un identifiant interné (name_id)
+_NAMED = tuple(cls for cls in CLASSES if issubclass(cls, (Declaration, Reference)))
+
+
+class FlatBuilder:
+    """Fabrique de nœuds pour les actions du parser (voir parser_1.ObjectNodes):
+    chaque constructeur ajoute une ligne aux tableaux et rend son indice"""
+
+    def __init__(self):
+        self.ast = FlatAST()
+        self._value_index = {}
+        self._string_index = {}
+
+    def finish(self, root):
+        """FlatAST terminé, de racine root"""
+        self.ast.root = root if root is not None else -1
+        return self.ast
+
+    def _intern(self, table, index, value):
+        key = _key(value)
+        found = index.get(key)
+        if found is None:
+            found = index[key] = len(table)
+            table.append(value)
+        return found
+
+    def _add(self, kind, children, lineno=0, col=0, value=-1, string=-1):
+        flat = self.ast
+        index = len(flat.kinds)
+        flat.kinds.append(kind)
+        flat.linenos.append(lineno)
+        flat.cols.append(col)
+        flat.value_ids.append(value)
+        flat.string_ids.append(string)
+        flat.next_sibling.append(-1)
+        if children:
+            following = flat.next_sibling
+            previous = children[0]
+            for child in children[1:]:
+                following[previous] = child
+                previous = child
+            flat.first_child.append(children[0])
+        else:
+            flat.first_child.append(-1)
+        return index
+
+    def _child(self, node):
+        # Enfant absent: un nœud NONE garde la place du champ
+        return node if node is not None else self._add(NONE, ())
+
+    def _list(self, items):
+        return self._add(LIST, [self._child(item) for item in items])
+
+    def _value(self, value):
+        return self._intern(self.ast.values, self._value_index, value)
+
+    def _string(self, value):
+        return self._intern(self.ast.strings, self._string_index, value)
+
+    def named(self, node, ident):
+        # Les identifiants internés sont propres au processus: recalculés par les vues
+        return node
+
+    # Mêmes noms et mêmes arguments que les classes de ast_1
+
+    def Program(self, name, block, lineno=0, col=0):
+        return self._add(KINDS[Program], [self._child(block)], lineno, col,
+                         self._value(name))
+
+    def Block(self, consts=(), vars=(), statements=(), lineno=0, col=0):
+        return self._add(KINDS[Block],
+                         [self._list(consts), self._list(vars), self._list(statements)],
+                         lineno, col)
+
+    def ConstDecl(self, name, value, lineno=0, col=0):
+        return self._add(KINDS[ConstDecl], [self._child(value)], lineno, col,
+                         self._value(name))
+
+    def VarDecl(self, name, type, lineno=0, col=0):
+        return self._add(KINDS[VarDecl], (), lineno, col,
+                         self._value(name), self._string(type))
+
+    def Assign(self, target, value, lineno=0, col=0):
+        return self._add(KINDS[Assign], [self._child(target), self._child(value)],
+                         lineno, col)
+
+    def If(self, condition, then_stmt, else_stmt=None, lineno=0, col=0):
+        return self._add(KINDS[If], [self._child(condition), self._child(then_stmt),
+                                             self._child(else_stmt)], lineno, col)
+
+    def While(self, condition, body, lineno=0, col=0):
+        return self._add(KINDS[While], [self._child(condition), self._child(body)],
+                         lineno, col)
+
+    def For(self, var, start, direction, end, body, lineno=0, col=0):
+        return self._add(KINDS[For], [self._child(var), self._child(start),
+                                              self._child(end), self._child(body)],
+                         lineno, col, string=self._string(direction))
+
+    def Repeat(self, body, condition, lineno=0, col=0):
+        return self._add(KINDS[Repeat], [self._list(body), self._child(condition)],
+                         lineno, col)
+
+    def Compound(self, statements, lineno=0, col=0):
+        return self._add(KINDS[Compound], [self._list(statements)], lineno, col)
+
+    def BinaryOp(self, op, left, right, lineno=0, col=0):
+        return self._add(KINDS[BinaryOp], [self._child(left), self._child(right)],
+                         lineno, col, string=self._string(op))
+
+    def UnaryOp(self, op, operand, lineno=0, col=0):
+        return self._add(KINDS[UnaryOp], [self._child(operand)], lineno, col,
+                         string=self._string(op))
+
+    def VarRef(self, name, lineno=0, col=0):
+        return self._add(KINDS[VarRef], (), lineno, col, self._value(name))
+
+    def Literal(self, value, lineno=0, col=0):
+        return self._add(KINDS[Literal], (), lineno, col, self._value(value))
+
+
+# Vues: mêmes noms d'attributs que les classes de ast_1, lus dans les tableaux
+
+class NodeView(ASTNode):
+    """Nœud d'un FlatAST; chaque accès à un enfant crée une nouvelle vue"""
+    __slots__ = ('flat', 'index')
+
+    def __init__(self, flat, index):
+        self.flat = flat
+        self.index = index
+
+    @property
+    def lineno(self):
+        return self.flat.linenos[self.index]
+
+    @property
+    def col(self):
+        return self.flat.cols[self.index]
+
+    def __eq__(self, other):
+        return (isinstance(other, NodeView) and self.flat is other.flat
+                and self.index == other.index)
+
+    def __hash__(self):
+        return hash((id(self.flat), self.index))
+
+    def __repr__(self):
+        return f"<{type(self).__name__} #{self.index}>"
+
+
+def _child_property(position):
+    def get(self):
+        flat = self.flat
+        child = flat.first_child[self.index]
+        for _ in range(position):
+            child = flat.next_sibling[child]
+        return flat.node(child)
+    return property(get)
+
+
+def _value_property(self):
+    return self.flat.values[self.flat.value_ids[self.index]]
+
+
+def _string_property(self):
+    return self.flat.strings[self.flat.string_ids[self.index]]
+
+
+def _name_id_property(self):
+    return NAMES.intern(self.name)
+
+
+def _view_class(cls):
+    """Sous-classe de NodeView pour une classe de ast_1"""
+    namespace = {'__slots__': (), 'tree_items': cls.tree_items,
+                 '__doc__': f"Vue sur un nœud {cls.__name__} d'un FlatAST"}
+    for position, (name, _) in enumerate(CHILD_FIELDS[cls]):
+        namespace[name] = _child_property(position)
+    for name in _SCALARS[cls]:
+        namespace[name] = property(_value_property if name in _VALUE_FIELDS
+                                   else _string_property)
+    if cls in _NAMED:
+        namespace['name_id'] = property(_name_id_property)
+    view = type(cls.__name__, (NodeView,), namespace)
+    # serialize() et write_json() lisent les champs dans l'ordre de la classe d'origine
+    _FIELD_NAMES[view] = field_names(cls)
+    return view
+
+
+_VIEWS = [None, None] + [_view_class(cls) for cls in CLASSES]
+VIEW_CLASSES = {cls: _VIEWS[kind] for cls, kind in KINDS.items()}
+
+
+def parse(source_text, lexer=None):
+    """Analyse syntaxique directement vers un FlatAST (lève LexicalError / SyntaxError_)"""
+    lexer = (lexer or shared_lexer).clone()
+    context = ParserContext(source_text)
+    builder = context.nodes = FlatBuilder()
+    lexer.context = context
+    lexer.input(source_text)
+    lexer.lineno = 1
+    root = new_parser().parse(lexer=lexer, debug=False)
+    return builder.finish(root)
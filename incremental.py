@@ -0,0 +1,265 @@
+"""
+Réanalyse incrémentale pour l'éditeur: après une modification du source,
+seule la zone touchée est relexée et seules les instructions touchées sont reparsées
+
+La relecture repart du début d'un token (jamais au milieu d'un commentaire { ... })
+et s'arrête dès qu'un token relu retombe sur un token de l'ancienne analyse,
+au même endroit du texte inchangé qui suit la modification.
+"""
+from bisect import bisect_left
+from dataclasses import replace
+from functools import partial
+from operator import attrgetter
+
+import ply.lex as lex
+
+from ast_1 import CHILD_FIELDS, field_names
+
+_lexpos = attrgetter('lexpos')
+_EXTRA = ('name_id', 'inferred_type')
+
+# Jetons qui ouvrent / ferment un niveau d'imbrication d'instructions
+_OPENERS = ('BEGIN', 'REPEAT')
+_CLOSERS = ('END', 'UNTIL')
+
+
+class Snapshot:
+    """Résultat d'une analyse précédente, point de départ de la suivante"""
+    __slots__ = ('source', 'tokens', 'token_store', 'ast', 'spans')
+
+    def __init__(self, source, tokens, token_store, ast=None, spans=None):
+        self.source = source
+        self.tokens = tokens              # LexToken de l'analyse
+        self.token_store = token_store    # TokenStore de PascalCompiler.tokens
+        self.ast = ast
+        self.spans = spans                # (début, fin) en indices de tokens -> instruction
+
+
+class Relexed:
+    """Tokens relus: prefix tokens repris tels quels, middle relus,
+    puis l'ancienne suite à partir de old_resume, décalée de delta / lines"""
+    __slots__ = ('prefix', 'middle', 'old_resume', 'delta', 'lines', 'resync_line')
+
+    def __init__(self, prefix, middle, old_resume, delta, lines, resync_line):
+        self.prefix = prefix
+        self.middle = middle
+        self.old_resume = old_resume
+        self.delta = delta
+        self.lines = lines
+        self.resync_line = resync_line
+
+    @property
+    def suffix_start(self):
+        """Indice, dans la nouvelle suite, du premier token repris après la zone relue"""
+        return self.prefix + len(self.middle)
+
+
+def text_damage(old, new):
+    """(début, fin dans l'ancien texte, fin dans le nouveau) de la zone modifiée"""
+    limit = min(len(old), len(new))
+    # Préfixe commun par dichotomie: les comparaisons de tranches se font en C
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[low:middle] == new[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    start = low
+    # Suffixe commun, sans chevaucher le préfixe
+    low, high = 0, limit - start
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle:len(old) - low] == new[len(new) - middle:len(new) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return start, len(old) - low, len(new) - low
+
+
+def relex(lexer, old_tokens, new_text, damage):
+    """Relit la zone modifiée; retourne un Relexed. Lève LexicalError comme le lexer."""
+    start, old_end, new_end = damage
+    delta = new_end - old_end
+    # Dernier token commençant avant la modification: rien avant lui n'a changé
+    prefix = bisect_left(old_tokens, start, key=_lexpos) - 1
+    lexer.input(new_text)
+    if prefix >= 0:
+        lexer.lexpos = old_tokens[prefix].lexpos
+        lexer.lineno = old_tokens[prefix].lineno
+    else:
+        prefix = 0
+        lexer.lineno = 1
+    old_index = bisect_left(old_tokens, old_end, key=_lexpos)
+    middle = []
+    while True:
+        tok = lexer.token()
+        if tok is None:
+            return Relexed(prefix, middle, len(old_tokens), delta, 0, 0)
+        middle.append(tok)
+        if tok.lexpos < new_end:
+            continue
+        # Texte inchangé: on cherche l'ancien token à la même position
+        target = tok.lexpos - delta
+        while old_index < len(old_tokens) and old_tokens[old_index].lexpos < target:
+            old_index += 1
+        if old_index == len(old_tokens):
+            continue
+        old = old_tokens[old_index]
+        if old.lexpos == target and old.type == tok.type:
+            return Relexed(prefix, middle, old_index + 1, delta, tok.lineno - old.lineno, tok.lineno)
+
+
+def splice_tokens(old_tokens, relexed):
+    """Nouvelle suite de LexToken; les anciens tokens repris sont décalés sur place"""
+    suffix = old_tokens[relexed.old_resume:]
+    delta, lines = relexed.delta, relexed.lines
+    if delta or lines:
+        for tok in suffix:
+            tok.lexpos += delta
+            tok.lineno += lines
+    return old_tokens[:relexed.prefix] + relexed.middle + suffix
+
+
+def splice_token_store(old_store, relexed, tokens, line_index):
+    """TokenStore de la nouvelle suite de tokens, à partir de celui de l'ancienne"""
+    resume = relexed.suffix_start
+    return old_store.splice(relexed.prefix, relexed.old_resume, tokens[relexed.prefix:resume],
+                            tokens[resume:], line_index.column, relexed.lines, relexed.resync_line)
+
+
+def statement_spans(tokens):
+    """Instructions du bloc principal: liste de (début, fin) en indices de tokens,
+    une par instruction non vide, ou None si le programme n'a pas la forme attendue"""
+    count = len(tokens)
+    if count < 2 or tokens[-1].type != 'DOT' or tokens[-2].type != 'END':
+        return None
+    begin = 0
+    while begin < count and tokens[begin].type != 'BEGIN':
+        begin += 1
+    end = count - 2
+    if begin >= end:
+        return None
+    spans = []
+    depth = 0
+    first = begin + 1
+    for index in range(begin + 1, end):
+        kind = tokens[index].type
+        if kind in _OPENERS:
+            depth += 1
+        elif kind in _CLOSERS:
+            depth -= 1
+        elif kind == 'SEMI' and depth == 0:
+            if index > first:
+                spans.append((first, index))
+            first = index + 1
+    if end > first:
+        spans.append((first, end))
+    return spans
+
+
+def _synthetic(kind, value, lexer):
+    tok = lex.LexToken()
+    tok.type, tok.value, tok.lineno, tok.lexpos = kind, value, 1, 0
+    tok.lexer = lexer
+    return tok
+
+
+def parse_statements(parser, lexer, tokens):
+    """Analyse une suite d'instructions en l'enveloppant dans un programme minimal"""
+    wrapped = [_synthetic('PROGRAM', 'program', lexer), _synthetic('ID', 'incremental', lexer),
+               _synthetic('SEMI', ';', lexer), _synthetic('BEGIN', 'begin', lexer)]
+    wrapped.extend(tokens)
+    wrapped.append(_synthetic('END', 'end', lexer))
+    wrapped.append(_synthetic('DOT', '.', lexer))
+    program = parser.parse(lexer=lexer, debug=False, tokenfunc=partial(next, iter(wrapped), None))
+    return program.block.statements
+
+
+def _shifted(node, lines):
+    """Copie superficielle d'un nœud, ligne décalée"""
+    cls = node.__class__
+    copy = cls(*[getattr(node, name) for name in field_names(cls)])
+    copy.lineno += lines
+    # Attributs hors champs: identifiant de nom et type inféré
+    for attribute in _EXTRA:
+        value = getattr(node, attribute, None)
+        if value is not None:
+            setattr(copy, attribute, value)
+    return copy
+
+
+def shift_lines(root, lines):
+    """Copie d'un sous-arbre avec des numéros de ligne décalés (l'original est intact)"""
+    copy = _shifted(root, lines)
+    stack = [copy]
+    while stack:
+        node = stack.pop()
+        for name, is_list in CHILD_FIELDS[node.__class__]:
+            value = getattr(node, name)
+            if is_list:
+                items = [_shifted(item, lines) if item is not None else None for item in value]
+                setattr(node, name, items)
+                stack.extend(item for item in items if item is not None)
+            elif value is not None:
+                child = _shifted(value, lines)
+                setattr(node, name, child)
+                stack.append(child)
+    return copy
+
+
+def reparse(parser, lexer, snapshot, tokens, relexed):
+    """Nouvel AST qui réutilise les instructions intactes de snapshot.ast.
+    Retourne (ast, découpage en instructions, nombre d'instructions reparsées),
+    ou None s'il faut tout reparser."""
+    old_ast, old_spans = snapshot.ast, snapshot.spans
+    spans = statement_spans(tokens)
+    if old_ast is None or old_spans is None or spans is None:
+        return None
+    old_statements = old_ast.block.statements
+    if len(old_statements) != len(old_spans):
+        return None
+    # Les déclarations et le begin du bloc doivent précéder la zone relue
+    if not spans or spans[0][0] > relexed.prefix or old_spans and old_spans[0][0] != spans[0][0]:
+        return None
+    reused = dict(zip(old_spans, old_statements))
+    resume = relexed.suffix_start
+    offset = resume - relexed.old_resume
+    statements = []
+    damaged = []            # instructions à reparser, en attente
+    reparsed = 0
+
+    def flush():
+        nonlocal reparsed
+        if damaged:
+            parsed = parse_statements(parser, lexer, tokens[damaged[0][0]:damaged[-1][1]])
+            if len(parsed) != len(damaged):
+                raise _Mismatch
+            statements.extend(parsed)
+            reparsed += len(parsed)
+            damaged.clear()
+
+    try:
+        for span in spans:
+            first, last = span
+            statement = None
+            if last <= relexed.prefix:
+                statement = reused.get(span)
+            elif first >= resume and tokens[first].lineno != relexed.resync_line:
+                statement = reused.get((first - offset, last - offset))
+                if statement is not None and relexed.lines:
+                    statement = shift_lines(statement, relexed.lines)
+            if statement is None:
+                damaged.append(span)
+            else:
+                flush()
+                statements.append(statement)
+        flush()
+    except _Mismatch:
+        return None
+    block = replace(old_ast.block, statements=statements)
+    return replace(old_ast, block=block), spans, reparsed
+
+
+class _Mismatch(Exception):
+    """Le découpage en instructions ne correspond pas à l'analyse"""
@@ -0,0 +1,307 @@
+"""
+Interpréteur Mini-Pascal
+Chaque nœud de l'AST est compilé une seule fois en fermeture Python;
+les variables vivent dans une liste indexée par slot (un slot par déclaration).
+"""
+from ast_1 import (Program, Assign, If, While, For, Repeat, Compound,
+                   BinaryOp, UnaryOp, VarRef, Literal)
+from errors import RuntimeError_
+from runtime import BINARY_OPS, UNARY_OPS, DEFAULT_VALUES, arithmetic_error, normalize_op
+from symbol_table import name_id
+
+
+def _noop():
+    pass
+
+
+# Opérateurs les plus fréquents écrits en ligne: évite un appel à operator.*
+_INLINE_BINARY = {
+    '+': lambda left, right: lambda: left() + right(),
+    '-': lambda left, right: lambda: left() - right(),
+    '*': lambda left, right: lambda: left() * right(),
+    '=': lambda left, right: lambda: left() == right(),
+    '<>': lambda left, right: lambda: left() != right(),
+    '<': lambda left, right: lambda: left() < right(),
+    '<=': lambda left, right: lambda: left() <= right(),
+    '>': lambda left, right: lambda: left() > right(),
+    '>=': lambda left, right: lambda: left() >= right(),
+    'and': lambda left, right: lambda: left() and right(),
+    'or': lambda left, right: lambda: left() or right(),
+}
+
+# Mêmes opérateurs avec un opérande droit constant
+_INLINE_BINARY_CONST = {
+    '+': lambda left, c: lambda: left() + c,
+    '-': lambda left, c: lambda: left() - c,
+    '*': lambda left, c: lambda: left() * c,
+    '=': lambda left, c: lambda: left() == c,
+    '<>': lambda left, c: lambda: left() != c,
+    '<': lambda left, c: lambda: left() < c,
+    '<=': lambda left, c: lambda: left() <= c,
+    '>': lambda left, c: lambda: left() > c,
+    '>=': lambda left, c: lambda: left() >= c,
+}
+
+# Opérateurs qui convertissent un entier en réel quand les types diffèrent
+_MIXED_OVERFLOW = ('+', '-', '*')
+_VALUE_TYPES = {int: 'integer', float: 'real', bool: 'boolean'}
+
+
+class Interpreter:
+    """Compile un Program en fermetures puis l'exécute.
+    count_steps=True compte les instructions exécutées (plus lent)."""
+
+    def __init__(self, program, count_steps=False):
+        if not isinstance(program, Program):
+            raise TypeError("L'interpréteur attend un nœud Program")
+        self.program = program
+        self.count_steps = count_steps
+        self.steps = 0
+        self._counter = [0]
+        self.slots = {}        # identifiant de nom -> slot
+        self.names = []        # nom déclaré de chaque slot
+        self.types = []        # type déclaré de chaque slot
+        self.constants = {}    # identifiant de nom -> valeur
+        self.store = []
+        self._initial = []
+        # Tables de compilation précalculées, indexées par classe de nœud
+        self._statements = {
+            Assign: self._assign,
+            If: self._if,
+            While: self._while,
+            For: self._for,
+            Repeat: self._repeat,
+            Compound: self._compound,
+        }
+        self._expressions = {
+            BinaryOp: self._binary,
+            UnaryOp: self._unary,
+            VarRef: self._var,
+            Literal: self._literal,
+        }
+        self._body = self._block(program.block)
+
+    def run(self):
+        """Exécute le programme depuis un état initial; retourne les variables"""
+        self.store[:] = self._initial
+        self._counter[0] = 0
+        self._body()
+        self.steps = self._counter[0]
+        return self.variables()
+
+    def variables(self):
+        return {name: self.store[slot] for slot, name in enumerate(self.names)}
+
+    # Déclarations
+
+    def _block(self, block):
+        for const in block.consts:
+            key = name_id(const)
+            if key in self.constants or key in self.slots:
+                raise RuntimeError_(f"Identificateur déjà déclaré: {const.name}", const.lineno, const.col)
+            self.constants[key] = const.value.value if const.value else None
+        for var in block.vars:
+            key = name_id(var)
+            if key in self.constants or key in self.slots:
+                raise RuntimeError_(f"Identificateur déjà déclaré: {var.name}", var.lineno, var.col)
+            self.slots[key] = len(self.names)
+            self.names.append(var.name)
+            self.types.append(var.type)
+            self._initial.append(DEFAULT_VALUES.get(var.type))
+        self.store.extend(self._initial)
+        return self._sequence(block.statements)
+
+    # Instructions
+
+    def _statement(self, node):
+        if node is None:
+            return _noop
+        compiled = self._statements[node.__class__](node)
+        if self.count_steps:
+            counter = self._counter
+            inner = compiled
+
+            def compiled():
+                counter[0] += 1
+                inner()
+        return compiled
+
+    def _sequence(self, statements):
+        compiled = tuple(self._statement(stmt) for stmt in statements if stmt is not None)
+        if not compiled:
+            return _noop
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def run():
+            for stmt in compiled:
+                stmt()
+        return run
+
+    def _slot(self, ref, for_write=False):
+        key = name_id(ref)
+        if key in self.constants:
+            if for_write:
+                raise RuntimeError_(f"Affectation à la constante {ref.name}", ref.lineno, ref.col)
+            return None
+        slot = self.slots.get(key)
+        if slot is None:
+            raise RuntimeError_(f"Variable non déclarée: {ref.name}", ref.lineno, ref.col)
+        return slot
+
+    def _assign(self, node):
+        slot = self._slot(node.target, for_write=True)
+        value = self._expression(node.value)
+        store = self.store
+        # Valeur déjà réelle d'après l'analyse sémantique: pas de conversion
+        if self.types[slot] == 'real' and self._static_type(node.value) != 'real':
+            lineno, col = node.lineno, node.col
+
+            def run():
+                try:
+                    store[slot] = float(value())
+                except OverflowError as e:
+                    # Entier trop grand pour un réel
+                    raise arithmetic_error(e, lineno, col) from None
+        else:
+            def run():
+                store[slot] = value()
+        return run
+
+    def _if(self, node):
+        condition = self._expression(node.condition)
+        then_stmt = self._statement(node.then_stmt)
+        if node.else_stmt is None:
+            def run():
+                if condition():
+                    then_stmt()
+        else:
+            else_stmt = self._statement(node.else_stmt)
+
+            def run():
+                if condition():
+                    then_stmt()
+                else:
+                    else_stmt()
+        return run
+
+    def _while(self, node):
+        condition = self._expression(node.condition)
+        body = self._statement(node.body)
+
+        def run():
+            while condition():
+                body()
+        return run
+
+    def _for(self, node):
+        slot = self._slot(node.var, for_write=True)
+        start = self._expression(node.start)
+        end = self._expression(node.end)
+        body = self._statement(node.body)
+        store = self.store
+        step = 1 if node.direction == 'to' else -1
+        lineno, col = node.lineno, node.col
+
+        def run():
+            first, last = start(), end()
+            try:
+                values = range(first, last + step, step)
+            except TypeError:
+                raise RuntimeError_("Les bornes d'une boucle for doivent être entières",
+                                    lineno, col) from None
+            for value in values:
+                store[slot] = value
+                body()
+        return run
+
+    def _repeat(self, node):
+        body = self._sequence(node.body)
+        condition = self._expression(node.condition)
+
+        def run():
+            while True:
+                body()
+                if condition():
+                    break
+        return run
+
+    def _compound(self, node):
+        return self._sequence(node.statements)
+
+    # Expressions
+
+    def _expression(self, node):
+        if node is None:
+            raise RuntimeError_("Expression manquante")
+        return self._expressions[node.__class__](node)
+
+    def _literal(self, node):
+        value = node.value
+        return lambda: value
+
+    def _var(self, node):
+        slot = self._slot(node)
+        if slot is None:
+            value = self.constants[name_id(node)]
+            return lambda: value
+        store = self.store
+        return lambda: store[slot]
+
+    def _constant_value(self, node):
+        """Valeur si le nœud est un littéral ou une constante, sinon None"""
+        if isinstance(node, Literal):
+            return node.value
+        if isinstance(node, VarRef):
+            return self.constants.get(name_id(node))
+        return None
+
+    def _static_type(self, node):
+        """Type connu avant l'exécution ('integer', 'real'...), sinon None"""
+        value = self._constant_value(node)
+        if value is not None:
+            return _VALUE_TYPES.get(value.__class__)
+        if isinstance(node, VarRef):
+            slot = self.slots.get(name_id(node))
+            return None if slot is None else self.types[slot]
+        # Les nœuds recréés par l'optimiseur perdent l'annotation sémantique
+        return getattr(node, 'inferred_type', None)
+
+    def _binary(self, node):
+        op = normalize_op(node.op)
+        left = self._expression(node.left)
+        # Entier mêlé à un réel: la conversion peut déborder, passage par le chemin gardé
+        mixed = op in _MIXED_OVERFLOW and (
+            self._static_type(node.left) is None
+            or self._static_type(node.left) != self._static_type(node.right))
+        constant = self._constant_value(node.right)
+        if constant is not None and op in _INLINE_BINARY_CONST and not mixed:
+            return _INLINE_BINARY_CONST[op](left, constant)
+        right = self._expression(node.right)
+        if op in _INLINE_BINARY and not mixed:
+            return _INLINE_BINARY[op](left, right)
+        function = BINARY_OPS.get(op)
+        if function is None:
+            raise RuntimeError_(f"Opérateur inconnu: {node.op}", node.lineno, node.col)
+        lineno, col = node.lineno, node.col
+
+        # '/', div, mod et opérations mixtes: division par zéro ou dépassement
+        # deviennent une erreur d'exécution Pascal
+        def run():
+            try:
+                return function(left(), right())
+            except ArithmeticError as e:
+                raise arithmetic_error(e, lineno, col) from None
+        return run
+
+    def _unary(self, node):
+        op = normalize_op(node.op)
+        operand = self._expression(node.operand)
+        if op == 'uminus':
+            return lambda: -operand()
+        if op == 'not':
+            return lambda: not operand()
+        function = UNARY_OPS.get(op)
+        if function is None:
+            raise RuntimeError_(f"Opérateur inconnu: {node.op}", node.lineno, node.col)
+        return lambda: function(operand())
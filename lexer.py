@@ -1,5 +1,8 @@
+import hashlib
 import ply.lex as lex
 from errors import LexicalError
+from line_index import get_line_index
+from symbol_table import NAMES
 
 # Liste complète des tokens
 tokens = (
@@ -74,7 +77,7 @@ def t_REAL_CONST(t):
     try:
         t.value = float(t.value)
     except ValueError:
-        raise LexicalError(f"Valeur réelle invalide: {t.value}", t.lineno, find_column(t.lexer.lexdata, t))
+        raise LexicalError(f"Valeur réelle invalide: {t.value}", t.lineno, _column(t))
     return t
 
 def t_INT_CONST(t):
@@ -82,34 +85,57 @@ def t_INT_CONST(t):
     try:
         t.value = int(t.value)
     except ValueError:
-        raise LexicalError(f"Valeur entière invalide: {t.value}", t.lineno, find_column(t.lexer.lexdata, t))
+        raise LexicalError(f"Valeur entière invalide: {t.value}", t.lineno, _column(t))
     return t
 
 def t_ID(t):
     r'[a-zA-Z_][a-zA-Z0-9_]*'
-    t.type = reserved.get(t.value.lower(), 'ID')
-    if t.type == 'BOOL_CONST':
-        t.value = (t.value.lower() == 'true')
+    key = t.value.lower()
+    t.type = reserved.get(key, 'ID')
+    if t.type == 'ID':
+        # Identifiant interné: les étapes suivantes ne hachent plus la chaîne
+        t.name_id = NAMES.intern_folded(key)
+    elif t.type == 'BOOL_CONST':
+        t.value = (key == 'true')
     return t
 
 def t_newline(t):
     r'\n+'
     t.lexer.lineno += len(t.value)
 
-"""Calcule la colonne précise d'un token"""
+"""Calcule la colonne précise d'un token (index des lignes partagé par texte)"""
 def find_column(input_text, token):
-    last_cr = input_text.rfind('\n', 0, token.lexpos)
-    if last_cr < 0:
-        last_cr = -1
-    column = token.lexpos - last_cr
-    return column
+    return get_line_index(input_text).column(token.lexpos)
+
+def _column(t):
+    """Colonne d'un token, via le contexte de la compilation s'il y en a un"""
+    context = getattr(t.lexer, 'context', None)
+    if context is not None:
+        return context.column(t)
+    return find_column(t.lexer.lexdata, t)
 
 def t_error(t):
-    col = find_column(t.lexer.lexdata, t)
-    raise LexicalError(
+    col = _column(t)
+    error = LexicalError(
         f"Caractère non reconnu '{t.value[0]}' à la ligne {t.lineno}, colonne {col}",
         t.lineno, col
     )
+    errors = getattr(getattr(t.lexer, 'context', None), 'errors', None)
+    if errors is None:
+        raise error
+    # Mode récupération: l'erreur est notée et le caractère ignoré
+    errors.append(error)
+    t.lexer.skip(1)
+
+def lexer_signature():
+    """Empreinte sha256 du lexer (tokens, mots-clés et expressions régulières)"""
+    parts = [' '.join(tokens), repr(sorted(reserved.items()))]
+    for name, rule in sorted(globals().items()):
+        if name.startswith('t_'):
+            parts.append(f"{name}={rule.__doc__ if callable(rule) else rule}")
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+LEXER_HASH = lexer_signature()
 
 # Construire le lexer
 lexer = lex.lex()
\ No newline at end of file
@@ -0,0 +1,56 @@
+# Index des débuts de ligne d'un texte source
+
+from bisect import bisect_right
+
+
+class LineIndex:
+    """Positions des débuts de ligne, pour passer d'un offset à (ligne, colonne)"""
+
+    def __init__(self, text):
+        self.text = text
+        starts = [0]
+        find = text.find
+        pos = find('\n')
+        while pos >= 0:
+            starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+        self.starts = starts
+        # Dernière ligne trouvée: les tokens arrivent dans l'ordre du texte
+        self._last = 0
+
+    def line_of(self, lexpos):
+        """Numéro de ligne (à partir de 0) contenant l'offset lexpos"""
+        starts = self.starts
+        last = self._last
+        if starts[last] <= lexpos and (last + 1 == len(starts) or lexpos < starts[last + 1]):
+            return last
+        last = bisect_right(starts, lexpos) - 1
+        self._last = last
+        return last
+
+    def column(self, lexpos):
+        """Colonne (à partir de 1) de l'offset lexpos"""
+        return lexpos - self.starts[self.line_of(lexpos)] + 1
+
+    def line_count(self):
+        return len(self.starts)
+
+    def line_text(self, lineno):
+        """Texte de la ligne lineno (à partir de 1), sans le saut de ligne"""
+        start = self.starts[lineno - 1]
+        if lineno < len(self.starts):
+            return self.text[start:self.starts[lineno] - 1]
+        return self.text[start:]
+
+
+# Index du dernier texte demandé: construit une seule fois par compilation
+_cached = LineIndex('')
+
+def get_line_index(text):
+    """Retourne l'index du texte, en réutilisant le précédent si c'est le même"""
+    global _cached
+    index = _cached
+    if index.text is not text and index.text != text:
+        index = LineIndex(text)
+        _cached = index
+    return index
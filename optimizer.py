@@ -0,0 +1,171 @@
+"""
+Optimisation de l'AST: propagation des constantes, pliage et simplifications
+
+L'arbre d'entrée n'est jamais modifié (il peut être partagé par le cache):
+seuls les nœuds qui changent sont recopiés, les sous-arbres intacts sont réutilisés.
+"""
+from ast_1 import Program, Assign, For, UnaryOp, Literal, CHILD_FIELDS
+from runtime import BINARY_OPS, normalize_op
+from symbol_table import name_id
+from walker import Transformer, REMOVED
+
+# Champs jamais réécrits: une cible d'affectation reste une variable
+_TARGETS = {(Assign, 'target'), (For, 'var')}
+
+_ARITHMETIC = ('+', '-', '*', '/')
+_COMPARISONS = ('=', '<>', '<', '<=', '>', '>=')
+
+
+def _is_number(value):
+    return value.__class__ is int or value.__class__ is float
+
+
+def _fold(op, left, right):
+    """Valeur de left op right si le pliage respecte le typage Pascal, sinon None"""
+    if op in _ARITHMETIC:
+        if not (_is_number(left) and _is_number(right)):
+            return None
+    elif op in ('div', 'mod'):
+        if left.__class__ is not int or right.__class__ is not int:
+            return None
+    elif op in ('and', 'or'):
+        if left.__class__ is not bool or right.__class__ is not bool:
+            return None
+    elif op in _COMPARISONS:
+        if not ((_is_number(left) and _is_number(right))
+                or (left.__class__ is bool and right.__class__ is bool)):
+            return None
+    else:
+        return None
+    try:
+        return BINARY_OPS[op](left, right)
+    except (ZeroDivisionError, OverflowError):
+        # Laissé à l'exécution, qui signale l'erreur à sa position
+        return None
+
+
+def _literal(node):
+    """Valeur d'un littéral, ou REMOVED si le nœud n'en est pas un"""
+    return node.value if node.__class__ is Literal else REMOVED
+
+
+class OptimizationReport:
+    """Modifications appliquées: (type, ligne, colonne, description) dans l'ordre"""
+
+    KINDS = ('constante', 'pliage', 'simplification', 'branche morte')
+
+    def __init__(self):
+        self.changes = []
+
+    def add(self, kind, node, detail):
+        self.changes.append((kind, node.lineno, node.col, detail))
+
+    def counts(self):
+        counts = dict.fromkeys(self.KINDS, 0)
+        for kind, _, _, _ in self.changes:
+            counts[kind] += 1
+        return counts
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __str__(self):
+        lines = [f"{len(self.changes)} modification(s): "
+                 + ', '.join(f"{kind} {count}" for kind, count in self.counts().items())]
+        for kind, lineno, col, detail in self.changes:
+            lines.append(f"  ligne {lineno}, colonne {col}: {kind}: {detail}")
+        return '\n'.join(lines)
+
+
+class Optimizer(Transformer):
+    """Réécrit l'arbre en post-ordre, sans récursion (chaînes profondes acceptées)"""
+
+    children = {cls: tuple((name, is_list) for name, is_list in fields
+                           if (cls, name) not in _TARGETS)
+                for cls, fields in CHILD_FIELDS.items()}
+
+    def __init__(self, program):
+        if not isinstance(program, Program):
+            raise TypeError("L'optimiseur attend un nœud Program")
+        self.program = program
+        self.report = OptimizationReport()
+        self.constants = {}
+        for const in program.block.consts:
+            if const.value is not None:
+                self.constants.setdefault(name_id(const), const.value.value)
+
+    def optimize(self):
+        """Retourne le Program optimisé (le même objet si rien n'a changé)"""
+        return self.transform(self.program)
+
+    # Règles, appliquées après la réécriture des enfants
+
+    def leave_VarRef(self, node):
+        key = name_id(node)
+        if key not in self.constants:
+            return node
+        value = self.constants[key]
+        self.report.add('constante', node, f"{node.name} -> {value!r}")
+        return Literal(value, node.lineno, node.col)
+
+    def leave_BinaryOp(self, node):
+        op = normalize_op(node.op)
+        left, right = _literal(node.left), _literal(node.right)
+        if left is not REMOVED and right is not REMOVED:
+            value = _fold(op, left, right)
+            if value is not None:
+                self.report.add('pliage', node, f"{left!r} {node.op} {right!r} -> {value!r}")
+                return Literal(value, node.lineno, node.col)
+            return node
+        # Identités sur des entiers (un réel changerait le type du résultat)
+        if right.__class__ is int:
+            if (op in ('+', '-') and right == 0) or (op in ('*', 'div') and right == 1):
+                self.report.add('simplification', node, f"x {node.op} {right} -> x")
+                return node.left
+        if left.__class__ is int:
+            if (op == '+' and left == 0) or (op == '*' and left == 1):
+                self.report.add('simplification', node, f"{left} {node.op} x -> x")
+                return node.right
+        # Court-circuit: l'opérande droit n'est jamais évalué
+        if left.__class__ is bool and op in ('and', 'or'):
+            if left == (op == 'and'):
+                self.report.add('simplification', node, f"{left} {node.op} x -> x")
+                return node.right
+            self.report.add('simplification', node, f"{left} {node.op} x -> {left}")
+            return node.left
+        return node
+
+    def leave_UnaryOp(self, node):
+        op = normalize_op(node.op)
+        operand = _literal(node.operand)
+        if op == 'uminus' and _is_number(operand):
+            self.report.add('pliage', node, f"-{operand!r} -> {-operand!r}")
+            return Literal(-operand, node.lineno, node.col)
+        if op == 'not' and operand.__class__ is bool:
+            self.report.add('pliage', node, f"not {operand} -> {not operand}")
+            return Literal(not operand, node.lineno, node.col)
+        inner = node.operand
+        if inner.__class__ is UnaryOp and normalize_op(inner.op) == op:
+            self.report.add('simplification', node, f"{node.op} {inner.op} x -> x")
+            return inner.operand
+        return node
+
+    def leave_If(self, node):
+        condition = _literal(node.condition)
+        if condition.__class__ is not bool:
+            return node
+        kept = node.then_stmt if condition else node.else_stmt
+        self.report.add('branche morte', node, f"condition toujours {condition}")
+        return kept if kept is not None else REMOVED
+
+    def leave_While(self, node):
+        if _literal(node.condition) is False:
+            self.report.add('branche morte', node, "boucle jamais exécutée")
+            return REMOVED
+        return node
+
+
+def optimize(program):
+    """Retourne (Program optimisé, OptimizationReport)"""
+    optimizer = Optimizer(program)
+    return optimizer.optimize(), optimizer.report
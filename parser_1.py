@@ -1,10 +1,76 @@
+import copy
+import hashlib
+import os
+import sys
+import tempfile
 import ply.yacc as yacc
 from lexer import tokens, lexer, find_column
+from line_index import LineIndex
 from ast_1 import *
 from errors import SyntaxError_, format_error_line
+from symbol_table import NAMES
 
-# Stockage du texte source pour messages d'erreur
-source_text = ''
+
+class ParserContext:
+    """État propre à une compilation: texte source et index de ses lignes.
+    Il est porté par le lexer de la compilation (lexer.context), ce qui le rend
+    accessible aux actions (p.lexer) comme à p_error (token.lexer)."""
+
+    def __init__(self, source_text=''):
+        self.source_text = source_text
+        self.line_index = LineIndex(source_text)
+        # Mode récupération: liste où le lexer et p_error ajoutent leurs erreurs
+        # au lieu de les lever (None: arrêt à la première erreur)
+        self.errors = None
+        # Parser de l'analyse en cours et dernier token fautif absorbé par
+        # statement : error (voir p_statement_error et p_error)
+        self.parser = None
+        self.recovered = None
+        # Fabrique des nœuds: objets de ast_1, ou tableaux de flat_ast.FlatBuilder
+        self.nodes = ObjectNodes
+
+    def column(self, token):
+        return self.line_index.column(token.lexpos)
+
+
+def new_parser():
+    """Copie du parser qui partage les tables LALR mais pas l'état d'analyse"""
+    return copy.copy(parser)
+
+
+def _column(p, n):
+    """Colonne du n-ième symbole de la règle dans le texte en cours d'analyse"""
+    context = getattr(p.lexer, 'context', None)
+    if context is None:
+        # Lexer partagé utilisé directement: le texte est celui du lexer
+        return find_column(p.lexer.lexdata, p.slice[n])
+    return context.column(p.slice[n])
+
+
+def _name_id(p, n):
+    """Identifiant interné du token ID n (posé par le lexer, sinon calculé)"""
+    ident = getattr(p.slice[n], 'name_id', None)
+    return ident if ident is not None else NAMES.intern(p[n])
+
+
+def _named(node, ident):
+    node.name_id = ident
+    return node
+
+
+class ObjectNodes:
+    """Fabrique de nœuds par défaut: les classes de ast_1.
+    Les actions construisent leurs nœuds par _nodes(p), qui peut aussi être
+    un flat_ast.FlatBuilder (mêmes noms, mêmes arguments)."""
+    Program, Block, ConstDecl, VarDecl = Program, Block, ConstDecl, VarDecl
+    Assign, If, While, For, Repeat, Compound = Assign, If, While, For, Repeat, Compound
+    BinaryOp, UnaryOp, VarRef, Literal = BinaryOp, UnaryOp, VarRef, Literal
+    named = staticmethod(_named)
+
+
+def _nodes(p):
+    """Fabrique de nœuds de l'analyse en cours"""
+    return getattr(getattr(p.lexer, 'context', None), 'nodes', ObjectNodes)
 
 # Priorité des opérateurs (corrigée)
 precedence = (
@@ -21,50 +87,69 @@ precedence = (
 
 def p_program(p):
     '''program : PROGRAM ID SEMI block DOT'''
-    p[0] = Program(name=p[2], block=p[4], lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+    nodes = _nodes(p)
+    p[0] = nodes.Program(name=p[2], block=p[4], lineno=p.lineno(1), col=_column(p, 1))
 
 def p_block(p):
     '''block : declarations BEGIN statements END'''
-    consts = p[1].get('consts', [])
-    vars_ = p[1].get('vars', [])
+    nodes = _nodes(p)
+    consts, vars_ = p[1]
     stmts = p[3]
-    p[0] = Block(consts=consts, vars=vars_, statements=stmts, 
-                lineno=p.lineno(2), col=find_column(source_text, p.slice[2]))
+    p[0] = nodes.Block(consts=consts, vars=vars_, statements=stmts, 
+                      lineno=p.lineno(2), col=_column(p, 2))
 
 def p_declarations(p):
     '''declarations : declarations var_decl
                     | declarations const_decl
                     | empty'''
+    # Paire (constantes, variables), complétée sur place à chaque déclaration
     if len(p) == 3:
-        decls = p[1] if p[1] else {'vars': [], 'consts': []}
+        decls = p[1]
         if isinstance(p[2], list):  # var_decl retourne une liste
-            decls['vars'].extend(p[2])
-        else:  # const_decl retourne un ConstDecl
-            decls['consts'].append(p[2])
+            decls[1].extend(p[2])
+        elif p[2] is not None:  # const_decl retourne un ConstDecl (None si erronée)
+            decls[0].append(p[2])
         p[0] = decls
     else:
-        p[0] = {'vars': [], 'consts': []}
+        p[0] = ([], [])
 
 def p_const_decl(p):
     '''const_decl : CONST ID EQUAL literal SEMI'''
-    p[0] = ConstDecl(name=p[2], value=p[4], 
-                     lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+    nodes = _nodes(p)
+    p[0] = nodes.named(nodes.ConstDecl(name=p[2], value=p[4], 
+                                       lineno=p.lineno(1), col=_column(p, 1)), _name_id(p, 2))
 
 def p_var_decl(p):
     '''var_decl : VAR id_list COLON type SEMI'''
-    vars_list = []
-    for name in p[2]:
-        vars_list.append(VarDecl(name=name, type=p[4], 
-                               lineno=p.lineno(1), col=find_column(source_text, p.slice[1])))
-    p[0] = vars_list
+    nodes = _nodes(p)
+    # Position du VAR calculée une fois pour tous les noms de la liste
+    type_, lineno, col = p[4], p.lineno(1), _column(p, 1)
+    p[0] = [nodes.named(nodes.VarDecl(name=name, type=type_, lineno=lineno, col=col), ident)
+            for name, ident in p[2]]
+
+# Récupération: une déclaration erronée est ignorée jusqu'au ';' suivant
+def p_const_decl_error(p):
+    '''const_decl : CONST error SEMI'''
+    p[0] = None
+    # Erreur absorbée: les suivantes sont de nouveau signalées
+    p.parser.errok()
+
+def p_var_decl_error(p):
+    '''var_decl : VAR error SEMI'''
+    p[0] = []
+    # Erreur absorbée: les suivantes sont de nouveau signalées
+    p.parser.errok()
 
 def p_id_list(p):
     '''id_list : ID
                | id_list COMMA ID'''
+    # Paires (nom, identifiant interné), ajoutées sur place: pas de recopie à chaque virgule
     if len(p) == 2:
-        p[0] = [p[1]]
+        p[0] = [(p[1], _name_id(p, 1))]
     else:
-        p[0] = p[1] + [p[3]]
+        names = p[1]
+        names.append((p[3], _name_id(p, 3)))
+        p[0] = names
 
 def p_type(p):
     '''type : INTEGER
@@ -94,6 +179,17 @@ def p_statement(p):
                  | empty_stmt'''
     p[0] = p[1]
 
+# Récupération: une instruction erronée est ignorée jusqu'au ';' ou au END suivant
+def p_statement_error(p):
+    '''statement : error'''
+    p[0] = None
+    # Erreur absorbée: les suivantes sont de nouveau signalées. La règle ne consomme
+    # aucun token: p_error abandonne le token fautif s'il échoue encore juste après
+    context = getattr(p.lexer, 'context', None)
+    if context is not None:
+        context.recovered = p.slice[1].value
+    p.parser.errok()
+
 # Ajouter une règle pour un statement vide (sans erreur)
 def p_empty_stmt(p):
     '''empty_stmt :'''
@@ -101,42 +197,50 @@ def p_empty_stmt(p):
 
 def p_assignment(p):
     '''assignment : ID ASSIGN expression'''
-    var_ref = VarRef(name=p[1], lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
-    p[0] = Assign(target=var_ref, value=p[3], 
-                 lineno=p.lineno(2), col=find_column(source_text, p.slice[2]))
+    nodes = _nodes(p)
+    var_ref = nodes.named(nodes.VarRef(name=p[1], lineno=p.lineno(1), col=_column(p, 1)),
+                          _name_id(p, 1))
+    p[0] = nodes.Assign(target=var_ref, value=p[3], 
+                       lineno=p.lineno(2), col=_column(p, 2))
 
 def p_if_stmt(p):
     '''if_stmt : IF expression THEN statement
                | IF expression THEN statement ELSE statement'''
+    nodes = _nodes(p)
     if len(p) == 5:
-        p[0] = If(condition=p[2], then_stmt=p[4], 
-                  lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+        p[0] = nodes.If(condition=p[2], then_stmt=p[4], 
+                        lineno=p.lineno(1), col=_column(p, 1))
     else:
-        p[0] = If(condition=p[2], then_stmt=p[4], else_stmt=p[6],
-                  lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+        p[0] = nodes.If(condition=p[2], then_stmt=p[4], else_stmt=p[6],
+                        lineno=p.lineno(1), col=_column(p, 1))
 
 def p_while_stmt(p):
     '''while_stmt : WHILE expression DO statement'''
-    p[0] = While(condition=p[2], body=p[4],
-                 lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+    nodes = _nodes(p)
+    p[0] = nodes.While(condition=p[2], body=p[4],
+                       lineno=p.lineno(1), col=_column(p, 1))
 
 def p_for_stmt(p):
     '''for_stmt : FOR ID ASSIGN expression TO expression DO statement
                 | FOR ID ASSIGN expression DOWNTO expression DO statement'''
-    var_ref = VarRef(name=p[2], lineno=p.lineno(2), col=find_column(source_text, p.slice[2]))
+    nodes = _nodes(p)
+    var_ref = nodes.named(nodes.VarRef(name=p[2], lineno=p.lineno(2), col=_column(p, 2)),
+                          _name_id(p, 2))
     direction = 'to' if p[5].lower() == 'to' else 'downto'
-    p[0] = For(var=var_ref, start=p[4], direction=direction, end=p[6], body=p[8],
-               lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+    p[0] = nodes.For(var=var_ref, start=p[4], direction=direction, end=p[6], body=p[8],
+                     lineno=p.lineno(1), col=_column(p, 1))
 
 def p_repeat_stmt(p):
     '''repeat_stmt : REPEAT statements UNTIL expression'''
-    p[0] = Repeat(body=p[2], condition=p[4],
-                  lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+    nodes = _nodes(p)
+    p[0] = nodes.Repeat(body=p[2], condition=p[4],
+                        lineno=p.lineno(1), col=_column(p, 1))
 
 def p_compound_stmt(p):
     '''compound_stmt : BEGIN statements END'''
-    p[0] = Compound(statements=p[2],
-                    lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+    nodes = _nodes(p)
+    p[0] = nodes.Compound(statements=p[2],
+                          lineno=p.lineno(1), col=_column(p, 1))
 
 # Expressions - version simplifiée pour éviter les conflits
 
@@ -147,8 +251,9 @@ def p_expression_binop(p):
                   | expression DIVIDE expression
                   | expression DIV expression
                   | expression MOD expression'''
-    p[0] = BinaryOp(op=p[2], left=p[1], right=p[3],
-                    lineno=p.lineno(2), col=find_column(source_text, p.slice[2]))
+    nodes = _nodes(p)
+    p[0] = nodes.BinaryOp(op=p[2], left=p[1], right=p[3],
+                          lineno=p.lineno(2), col=_column(p, 2))
 
 def p_expression_comparison(p):
     '''expression : expression EQUAL expression
@@ -159,15 +264,17 @@ def p_expression_comparison(p):
                   | expression GEQ expression
                   | expression AND expression
                   | expression OR expression'''
-    p[0] = BinaryOp(op=p[2], left=p[1], right=p[3],
-                    lineno=p.lineno(2), col=find_column(source_text, p.slice[2]))
+    nodes = _nodes(p)
+    p[0] = nodes.BinaryOp(op=p[2], left=p[1], right=p[3],
+                          lineno=p.lineno(2), col=_column(p, 2))
 
 def p_expression_unary(p):
     '''expression : NOT expression
                   | MINUS expression %prec UMINUS'''
+    nodes = _nodes(p)
     op = 'UMINUS' if p[1] == '-' else p[1]
-    p[0] = UnaryOp(op=op, operand=p[2],
-                   lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+    p[0] = nodes.UnaryOp(op=op, operand=p[2],
+                         lineno=p.lineno(1), col=_column(p, 1))
 
 def p_expression_group(p):
     '''expression : LPAREN expression RPAREN'''
@@ -177,17 +284,21 @@ def p_expression_literal(p):
     '''expression : INT_CONST
                   | REAL_CONST
                   | BOOL_CONST'''
-    p[0] = Literal(value=p[1], lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+    nodes = _nodes(p)
+    p[0] = nodes.Literal(value=p[1], lineno=p.lineno(1), col=_column(p, 1))
 
 def p_literal(p):
     '''literal : INT_CONST
                | REAL_CONST
                | BOOL_CONST'''
-    p[0] = Literal(value=p[1], lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+    nodes = _nodes(p)
+    p[0] = nodes.Literal(value=p[1], lineno=p.lineno(1), col=_column(p, 1))
 
 def p_expression_var(p):
     '''expression : ID'''
-    p[0] = VarRef(name=p[1], lineno=p.lineno(1), col=find_column(source_text, p.slice[1]))
+    nodes = _nodes(p)
+    p[0] = nodes.named(nodes.VarRef(name=p[1], lineno=p.lineno(1), col=_column(p, 1)),
+                       _name_id(p, 1))
 
 def p_empty(p):
     '''empty :'''
@@ -195,12 +306,111 @@ def p_empty(p):
 
 def p_error(p):
     if p:
-        col = find_column(source_text, p)
-        err_line = format_error_line(source_text, p.lineno, col)
+        context = getattr(p.lexer, 'context', None)
+        if context is None:
+            source_text = p.lexer.lexdata
+            col = find_column(source_text, p)
+            err_line = format_error_line(source_text, p.lineno, col)
+        else:
+            col = context.column(p)
+            err_line = format_error_line(context.source_text, p.lineno, col, context.line_index)
         msg = f"Erreur syntaxique: caractère inattendu '{p.value}' à la ligne {p.lineno}, colonne {col}\n{err_line}"
-    else:
-        msg = "Erreur syntaxique: fin de fichier inattendue"
-    raise SyntaxError_(msg)
+        error = SyntaxError_(msg, p.lineno, col)
+        if context is not None and context.errors is not None:
+            # Mode récupération: PLY reprend sur la production error suivante
+            if p is context.recovered and context.parser is not None:
+                # Déjà signalé et absorbé par statement : error, sans pouvoir être
+                # décalé ensuite (END d'un repeat...): il est abandonné, sinon
+                # l'analyse boucle sur la même erreur
+                context.recovered = None
+                context.parser.errok()
+                return context.parser.token()
+            context.errors.append(error)
+            return
+        raise error
+    raise unexpected_eof()
+
+def unexpected_eof():
+    return SyntaxError_("Erreur syntaxique: fin de fichier inattendue")
+
+def partial_program(parser, context):
+    """Program partiel après une fin de fichier inattendue (mode récupération):
+    déclarations et instructions complètes restées sur la pile de PLY (une dernière
+    déclaration que PLY n'a pas encore réduite, faute de token suivant, est perdue)"""
+    symbols = parser.symstack
+    if len(symbols) < 3 or symbols[1].type != 'PROGRAM' or symbols[2].type != 'ID':
+        return None
+    nodes = context.nodes
+    start = symbols[1]
+    consts, vars_ = [], []
+    begin = None
+    statements = []
+    for sym in symbols[3:]:
+        kind = sym.type
+        if begin is None:
+            if kind == 'declarations':
+                consts, vars_ = sym.value
+            elif kind == 'var_decl':
+                vars_.extend(sym.value)
+            elif kind == 'const_decl' and sym.value is not None:
+                consts.append(sym.value)
+            elif kind == 'BEGIN':
+                begin = sym
+            elif kind != 'SEMI':
+                break
+        elif kind == 'statements':
+            statements = sym.value
+        elif kind == 'statement':
+            if sym.value is not None:
+                statements.append(sym.value)
+        elif kind != 'SEMI':
+            # Instruction inachevée: ni elle ni la suite ne sont gardées
+            break
+    anchor = begin if begin is not None else start
+    block = nodes.Block(consts=consts, vars=vars_, statements=statements,
+                        lineno=anchor.lineno, col=context.column(anchor))
+    return nodes.Program(name=symbols[2].value, block=block,
+                         lineno=start.lineno, col=context.column(start))
+
+# Tables LALR précalculées (parsetab.py, à côté de ce module)
+TABMODULE = 'parsetab'
+TABDIR = os.path.dirname(os.path.abspath(__file__))
+
+def grammar_signature():
+    """Empreinte sha256 de la grammaire (tokens, précédences et règles)"""
+    parts = [' '.join(tokens)]
+    parts.extend(''.join(level) for level in precedence)
+    rules = sorted((f.__code__.co_firstlineno, f.__doc__) for name, f in globals().items()
+                   if name.startswith('p_') and name != 'p_error' and callable(f))
+    parts.extend(doc for _, doc in rules)
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+GRAMMAR_HASH = grammar_signature()
+
+
+def build_tables(outputdir=TABDIR):
+    """Étape de construction: régénère parsetab.py après un changement de grammaire
+    (python parser_1.py). Les tables sont écrites dans un fichier temporaire puis
+    mises en place par os.replace: un lecteur concurrent voit l'ancien fichier ou
+    le nouveau, jamais un fichier à moitié écrit. Retourne False si elles étaient à jour."""
+    with tempfile.TemporaryDirectory(dir=outputdir) as tmp:
+        # PLY ne réécrit les tables que si parsetab.py ne correspond pas à la grammaire
+        sys.modules.pop(TABMODULE, None)
+        yacc.yacc(module=sys.modules[__name__], debug=False, write_tables=True,
+                  tabmodule=TABMODULE, outputdir=tmp)
+        built = os.path.join(tmp, TABMODULE + '.py')
+        if not os.path.exists(built):
+            return False
+        os.replace(built, os.path.join(outputdir, TABMODULE + '.py'))
+        sys.modules.pop(TABMODULE, None)
+        return True
+
+
+# Construire le parser: PLY charge parsetab.py si sa signature correspond à la
+# grammaire courante, sinon il régénère les tables en mémoire sans rien écrire
+# (plusieurs processus peuvent démarrer en même temps); build_tables les met à jour
+parser = yacc.yacc(debug=False, write_tables=False, tabmodule=TABMODULE, outputdir=TABDIR)
+
 
-# Construire le parser avec débogage activé
-parser = yacc.yacc(debug=False, write_tables=False)
\ No newline at end of file
+if __name__ == '__main__':
+    print("parsetab.py régénéré" if build_tables() else "parsetab.py déjà à jour")
\ No newline at end of file
@@ -0,0 +1,88 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftORleftANDrightNOTnonassocEQUALNEQLTLEQGTGEQleftPLUSMINUSleftMULTDIVIDEDIVMODrightUMINUSAND ASSIGN BEGIN BOOLEAN BOOL_CONST COLON COMMA CONST DIV DIVIDE DO DOT DOWNTO ELSE END EQUAL FOR GEQ GT ID IF INTEGER INT_CONST LEQ LPAREN LT MINUS MOD MULT NEQ NOT OR PLUS PROGRAM REAL REAL_CONST REPEAT RPAREN SEMI THEN TO UNTIL VAR WHILEprogram : PROGRAM ID SEMI block DOTblock : declarations BEGIN statements ENDdeclarations : declarations var_decl\n                    | declarations const_decl\n                    | emptyconst_decl : CONST ID EQUAL literal SEMIvar_decl : VAR id_list COLON type SEMIconst_decl : CONST error SEMIvar_decl : VAR error SEMIid_list : ID\n               | id_list COMMA IDtype : INTEGER\n            | REAL\n            | BOOLEANstatements : statement\n                  | statements SEMI statementstatement : assignment\n                 | if_stmt\n                 | while_stmt\n                 | for_stmt\n                 | repeat_stmt\n                 | compound_stmt\n                 | empty_stmtstatement : errorempty_stmt :assignment : ID ASSIGN expressionif_stmt : IF expression THEN statement\n               | IF expression THEN statement ELSE statementwhile_stmt : WHILE expression DO statementfor_stmt : FOR ID ASSIGN expression TO expression DO statement\n                | FOR ID ASSIGN expression DOWNTO expression DO statementrepeat_stmt : REPEAT statements UNTIL expressioncompound_stmt : BEGIN statements ENDexpression : expression PLUS expression\n                  | expression MINUS expression\n                  | expression MULT expression\n                  | expression DIVIDE expression\n                  | expression DIV expression\n                  | expression MOD expressionexpression : expression EQUAL expression\n                  | expression NEQ expression\n                  | expression LT expression\n                  | expression LEQ expression\n                  | expression GT expression\n                  | expression GEQ expression\n                  | expression AND expression\n                  | expression OR expressionexpression : NOT expression\n                  | MINUS expression %prec UMINUSexpression : LPAREN expression RPARENexpression : INT_CONST\n                  | REAL_CONST\n                  | BOOL_CONSTliteral : INT_CONST\n               | REAL_CONST\n               | BOOL_CONSTexpression : IDempty :'
+    
+_lr_action_items = {'PROGRAM':([0,],[2,]),'$end':([1,8,],[0,-1,]),'ID':([2,9,12,13,14,26,27,28,29,37,38,40,41,42,51,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,76,77,78,109,110,111,115,116,],[3,25,32,33,25,46,46,48,25,25,46,46,46,46,83,25,46,46,46,46,46,46,46,46,46,46,46,46,46,46,25,46,46,25,46,46,25,25,]),'SEMI':([3,9,14,15,16,17,18,19,20,21,22,23,24,29,31,34,35,37,43,44,45,46,49,55,56,57,58,73,74,76,79,80,81,82,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,106,109,112,115,116,117,118,],[4,-25,-25,37,-15,-17,-18,-19,-20,-21,-22,-23,-24,-25,52,54,37,-25,-51,-52,-53,-57,37,-33,-16,-26,-25,-49,-48,-25,107,-12,-13,-14,108,-54,-55,-56,-27,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-50,-29,-32,-25,-28,-25,-25,-30,-31,]),'BEGIN':([4,6,7,9,10,11,14,29,37,52,54,58,76,107,108,109,115,116,],[-58,9,-5,14,-3,-4,14,14,14,-9,-8,14,14,-7,-6,14,14,14,]),'VAR':([4,6,7,10,11,52,54,107,108,],[-58,12,-5,-3,-4,-9,-8,-7,-6,]),'CONST':([4,6,7,10,11,52,54,107,108,],[-58,13,-5,-3,-4,-9,-8,-7,-6,]),'DOT':([5,36,],[8,-2,]),'error':([9,12,13,14,29,37,58,76,109,115,116,],[24,31,34,24,24,24,24,24,24,24,24,]),'IF':([9,14,29,37,58,76,109,115,116,],[26,26,26,26,26,26,26,26,26,]),'WHILE':([9,14,29,37,58,76,109,115,116,],[27,27,27,27,27,27,27,27,27,]),'FOR':([9,14,29,37,58,76,109,115,116,],[28,28,28,28,28,28,28,28,28,]),'REPEAT':([9,14,29,37,58,76,109,115,116,],[29,29,29,29,29,29,29,29,29,]),'END':([9,14,15,16,17,18,19,20,21,22,23,24,35,37,43,44,45,46,55,56,57,58,73,74,76,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,106,109,112,115,116,117,118,],[-25,-25,36,-15,-17,-18,-19,-20,-21,-22,-23,-24,55,-25,-51,-52,-53,-57,-33,-16,-26,-25,-49,-48,-25,-27,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-50,-29,-32,-25,-28,-25,-25,-30,-31,]),'UNTIL':([16,17,18,19,20,21,22,23,24,29,37,43,44,45,46,49,55,56,57,58,73,74,76,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,106,109,112,115,116,117,118,],[-15,-17,-18,-19,-20,-21,-22,-23,-24,-25,-25,-51,-52,-53,-57,78,-33,-16,-26,-25,-49,-48,-25,-27,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-50,-29,-32,-25,-28,-25,-25,-30,-31,]),'ELSE':([17,18,19,20,21,22,23,24,43,44,45,46,55,57,58,73,74,76,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,106,109,112,115,116,117,118,],[-17,-18,-19,-20,-21,-22,-23,-24,-51,-52,-53,-57,-33,-26,-25,-49,-48,-25,109,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-50,-29,-32,-25,-28,-25,-25,-30,-31,]),'ASSIGN':([25,48,],[38,77,]),'NOT':([26,27,38,40,41,42,59,60,61,62,63,64,65,66,67,68,69,70,71,72,77,78,110,111,],[41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,]),'MINUS':([26,27,38,39,40,41,42,43,44,45,46,47,57,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,77,78,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,110,111,113,114,],[40,40,40,60,40,40,40,-51,-52,-53,-57,60,60,40,40,40,40,40,40,40,40,40,40,40,40,40,40,-49,60,60,40,40,-34,-35,-36,-37,-38,-39,60,60,60,60,60,60,60,60,-50,60,60,40,40,60,60,]),'LPAREN':([26,27,38,40,41,42,59,60,61,62,63,64,65,66,67,68,69,70,71,72,77,78,110,111,],[42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,]),'INT_CONST':([26,27,38,40,41,42,53,59,60,61,62,63,64,65,66,67,68,69,70,71,72,77,78,110,111,],[43,43,43,43,43,43,85,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,]),'REAL_CONST':([26,27,38,40,41,42,53,59,60,61,62,63,64,65,66,67,68,69,70,71,72,77,78,110,111,],[44,44,44,44,44,44,86,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,]),'BOOL_CONST':([26,27,38,40,41,42,53,59,60,61,62,63,64,65,66,67,68,69,70,71,72,77,78,110,111,],[45,45,45,45,45,45,87,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,]),'COLON':([30,32,83,],[50,-10,-11,]),'COMMA':([30,32,83,],[51,-10,-11,]),'EQUAL':([33,39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[53,65,-51,-52,-53,-57,65,65,-49,65,65,-34,-35,-36,-37,-38,-39,None,None,None,None,None,None,65,65,-50,65,65,65,65,]),'THEN':([39,43,44,45,46,73,74,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,],[58,-51,-52,-53,-57,-49,-48,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-50,]),'PLUS':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[59,-51,-52,-53,-57,59,59,-49,59,59,-34,-35,-36,-37,-38,-39,59,59,59,59,59,59,59,59,-50,59,59,59,59,]),'MULT':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[61,-51,-52,-53,-57,61,61,-49,61,61,61,61,-36,-37,-38,-39,61,61,61,61,61,61,61,61,-50,61,61,61,61,]),'DIVIDE':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[62,-51,-52,-53,-57,62,62,-49,62,62,62,62,-36,-37,-38,-39,62,62,62,62,62,62,62,62,-50,62,62,62,62,]),'DIV':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[63,-51,-52,-53,-57,63,63,-49,63,63,63,63,-36,-37,-38,-39,63,63,63,63,63,63,63,63,-50,63,63,63,63,]),'MOD':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[64,-51,-52,-53,-57,64,64,-49,64,64,64,64,-36,-37,-38,-39,64,64,64,64,64,64,64,64,-50,64,64,64,64,]),'NEQ':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[66,-51,-52,-53,-57,66,66,-49,66,66,-34,-35,-36,-37,-38,-39,None,None,None,None,None,None,66,66,-50,66,66,66,66,]),'LT':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[67,-51,-52,-53,-57,67,67,-49,67,67,-34,-35,-36,-37,-38,-39,None,None,None,None,None,None,67,67,-50,67,67,67,67,]),'LEQ':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[68,-51,-52,-53,-57,68,68,-49,68,68,-34,-35,-36,-37,-38,-39,None,None,None,None,None,None,68,68,-50,68,68,68,68,]),'GT':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[69,-51,-52,-53,-57,69,69,-49,69,69,-34,-35,-36,-37,-38,-39,None,None,None,None,None,None,69,69,-50,69,69,69,69,]),'GEQ':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[70,-51,-52,-53,-57,70,70,-49,70,70,-34,-35,-36,-37,-38,-39,None,None,None,None,None,None,70,70,-50,70,70,70,70,]),'AND':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[71,-51,-52,-53,-57,71,71,-49,-48,71,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,71,-50,71,71,71,71,]),'OR':([39,43,44,45,46,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,106,113,114,],[72,-51,-52,-53,-57,72,72,-49,-48,72,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-50,72,72,72,72,]),'DO':([43,44,45,46,47,73,74,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,113,114,],[-51,-52,-53,-57,76,-49,-48,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-50,115,116,]),'RPAREN':([43,44,45,46,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,],[-51,-52,-53,-57,-49,-48,103,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-50,]),'TO':([43,44,45,46,73,74,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,],[-51,-52,-53,-57,-49,-48,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-50,110,]),'DOWNTO':([43,44,45,46,73,74,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,105,],[-51,-52,-53,-57,-49,-48,-34,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-50,111,]),'INTEGER':([50,],[80,]),'REAL':([50,],[81,]),'BOOLEAN':([50,],[82,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'block':([4,],[5,]),'declarations':([4,],[6,]),'empty':([4,],[7,]),'var_decl':([6,],[10,]),'const_decl':([6,],[11,]),'statements':([9,14,29,],[15,35,49,]),'statement':([9,14,29,37,58,76,109,115,116,],[16,16,16,56,88,104,112,117,118,]),'assignment':([9,14,29,37,58,76,109,115,116,],[17,17,17,17,17,17,17,17,17,]),'if_stmt':([9,14,29,37,58,76,109,115,116,],[18,18,18,18,18,18,18,18,18,]),'while_stmt':([9,14,29,37,58,76,109,115,116,],[19,19,19,19,19,19,19,19,19,]),'for_stmt':([9,14,29,37,58,76,109,115,116,],[20,20,20,20,20,20,20,20,20,]),'repeat_stmt':([9,14,29,37,58,76,109,115,116,],[21,21,21,21,21,21,21,21,21,]),'compound_stmt':([9,14,29,37,58,76,109,115,116,],[22,22,22,22,22,22,22,22,22,]),'empty_stmt':([9,14,29,37,58,76,109,115,116,],[23,23,23,23,23,23,23,23,23,]),'id_list':([12,],[30,]),'expression':([26,27,38,40,41,42,59,60,61,62,63,64,65,66,67,68,69,70,71,72,77,78,110,111,],[39,47,57,73,74,75,89,90,91,92,93,94,95,96,97,98,99,100,101,102,105,106,113,114,]),'type':([50,],[79,]),'literal':([53,],[84,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> PROGRAM ID SEMI block DOT','program',5,'p_program','parser_1.py',85),
+  ('block -> declarations BEGIN statements END','block',4,'p_block','parser_1.py',90),
+  ('declarations -> declarations var_decl','declarations',2,'p_declarations','parser_1.py',98),
+  ('declarations -> declarations const_decl','declarations',2,'p_declarations','parser_1.py',99),
+  ('declarations -> empty','declarations',1,'p_declarations','parser_1.py',100),
+  ('const_decl -> CONST ID EQUAL literal SEMI','const_decl',5,'p_const_decl','parser_1.py',113),
+  ('var_decl -> VAR id_list COLON type SEMI','var_decl',5,'p_var_decl','parser_1.py',119),
+  ('const_decl -> CONST error SEMI','const_decl',3,'p_const_decl_error','parser_1.py',128),
+  ('var_decl -> VAR error SEMI','var_decl',3,'p_var_decl_error','parser_1.py',132),
+  ('id_list -> ID','id_list',1,'p_id_list','parser_1.py',136),
+  ('id_list -> id_list COMMA ID','id_list',3,'p_id_list','parser_1.py',137),
+  ('type -> INTEGER','type',1,'p_type','parser_1.py',147),
+  ('type -> REAL','type',1,'p_type','parser_1.py',148),
+  ('type -> BOOLEAN','type',1,'p_type','parser_1.py',149),
+  ('statements -> statement','statements',1,'p_statements','parser_1.py',154),
+  ('statements -> statements SEMI statement','statements',3,'p_statements','parser_1.py',155),
+  ('statement -> assignment','statement',1,'p_statement','parser_1.py',165),
+  ('statement -> if_stmt','statement',1,'p_statement','parser_1.py',166),
+  ('statement -> while_stmt','statement',1,'p_statement','parser_1.py',167),
+  ('statement -> for_stmt','statement',1,'p_statement','parser_1.py',168),
+  ('statement -> repeat_stmt','statement',1,'p_statement','parser_1.py',169),
+  ('statement -> compound_stmt','statement',1,'p_statement','parser_1.py',170),
+  ('statement -> empty_stmt','statement',1,'p_statement','parser_1.py',171),
+  ('statement -> error','statement',1,'p_statement_error','parser_1.py',176),
+  ('empty_stmt -> <empty>','empty_stmt',0,'p_empty_stmt','parser_1.py',181),
+  ('assignment -> ID ASSIGN expression','assignment',3,'p_assignment','parser_1.py',185),
+  ('if_stmt -> IF expression THEN statement','if_stmt',4,'p_if_stmt','parser_1.py',193),
+  ('if_stmt -> IF expression THEN statement ELSE statement','if_stmt',6,'p_if_stmt','parser_1.py',194),
+  ('while_stmt -> WHILE expression DO statement','while_stmt',4,'p_while_stmt','parser_1.py',204),
+  ('for_stmt -> FOR ID ASSIGN expression TO expression DO statement','for_stmt',8,'p_for_stmt','parser_1.py',210),
+  ('for_stmt -> FOR ID ASSIGN expression DOWNTO expression DO statement','for_stmt',8,'p_for_stmt','parser_1.py',211),
+  ('repeat_stmt -> REPEAT statements UNTIL expression','repeat_stmt',4,'p_repeat_stmt','parser_1.py',220),
+  ('compound_stmt -> BEGIN statements END','compound_stmt',3,'p_compound_stmt','parser_1.py',226),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser_1.py',234),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser_1.py',235),
+  ('expression -> expression MULT expression','expression',3,'p_expression_binop','parser_1.py',236),
+  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','parser_1.py',237),
+  ('expression -> expression DIV expression','expression',3,'p_expression_binop','parser_1.py',238),
+  ('expression -> expression MOD expression','expression',3,'p_expression_binop','parser_1.py',239),
+  ('expression -> expression EQUAL expression','expression',3,'p_expression_comparison','parser_1.py',245),
+  ('expression -> expression NEQ expression','expression',3,'p_expression_comparison','parser_1.py',246),
+  ('expression -> expression LT expression','expression',3,'p_expression_comparison','parser_1.py',247),
+  ('expression -> expression LEQ expression','expression',3,'p_expression_comparison','parser_1.py',248),
+  ('expression -> expression GT expression','expression',3,'p_expression_comparison','parser_1.py',249),
+  ('expression -> expression GEQ expression','expression',3,'p_expression_comparison','parser_1.py',250),
+  ('expression -> expression AND expression','expression',3,'p_expression_comparison','parser_1.py',251),
+  ('expression -> expression OR expression','expression',3,'p_expression_comparison','parser_1.py',252),
+  ('expression -> NOT expression','expression',2,'p_expression_unary','parser_1.py',258),
+  ('expression -> MINUS expression','expression',2,'p_expression_unary','parser_1.py',259),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser_1.py',266),
+  ('expression -> INT_CONST','expression',1,'p_expression_literal','parser_1.py',270),
+  ('expression -> REAL_CONST','expression',1,'p_expression_literal','parser_1.py',271),
+  ('expression -> BOOL_CONST','expression',1,'p_expression_literal','parser_1.py',272),
+  ('literal -> INT_CONST','literal',1,'p_literal','parser_1.py',277),
+  ('literal -> REAL_CONST','literal',1,'p_literal','parser_1.py',278),
+  ('literal -> BOOL_CONST','literal',1,'p_literal','parser_1.py',279),
+  ('expression -> ID','expression',1,'p_expression_var','parser_1.py',284),
+  ('empty -> <empty>','empty',0,'p_empty','parser_1.py',290),
+]
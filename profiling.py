@@ -0,0 +1,207 @@
+"""
+Mesures par phase de compilation: temps horloge et CPU, tokens, nœuds et,
+en option, pic mémoire (tracemalloc)
+
+PascalCompiler(profile=True) remplit compiler.stats (CompilationStats), exportable
+en JSON ou au format texte de Prometheus.
+"""
+import json
+import time
+import tracemalloc
+
+from ast_1 import CHILD_FIELDS
+
+# Ordre d'affichage des phases connues (les autres suivent dans l'ordre de mesure)
+PHASES = ('cache', 'lexical', 'columns', 'syntactic', 'semantic', 'rendering',
+          'optimization', 'execution')
+
+
+class PhaseStats:
+    """Mesures d'une phase; tokens, nodes et peak_bytes valent None s'ils ne sont pas mesurés.
+    nodes est toujours count_nodes de l'AST à la sortie de la phase (comparable d'une phase à l'autre)."""
+    __slots__ = ('name', 'wall', 'cpu', 'tokens', 'nodes', 'peak_bytes')
+
+    def __init__(self, name):
+        self.name = name
+        self.wall = 0.0          # secondes
+        self.cpu = 0.0           # secondes de CPU du processus
+        self.tokens = None
+        self.nodes = None
+        self.peak_bytes = None   # mémoire allouée au plus haut pendant la phase
+
+    def as_dict(self):
+        return {'phase': self.name, 'wall_ms': round(self.wall * 1000, 3),
+                'cpu_ms': round(self.cpu * 1000, 3), 'tokens': self.tokens,
+                'nodes': self.nodes, 'peak_bytes': self.peak_bytes}
+
+    def __repr__(self):
+        return f"<PhaseStats {self.name}: {self.wall * 1000:.2f} ms>"
+
+
+class CompilationStats:
+    """Mesures de la dernière compilation, par phase (une phase remesurée remplace l'ancienne)"""
+
+    def __init__(self, source_bytes=0):
+        self.source_bytes = source_bytes
+        self.phases = {}
+
+    def add(self, phase):
+        self.phases[phase.name] = phase
+
+    def __getitem__(self, name):
+        return self.phases[name]
+
+    def __contains__(self, name):
+        return name in self.phases
+
+    def __iter__(self):
+        rank = {name: index for index, name in enumerate(PHASES)}
+        return iter(sorted(self.phases.values(), key=lambda phase: rank.get(phase.name, len(rank))))
+
+    def __len__(self):
+        return len(self.phases)
+
+    @property
+    def wall(self):
+        return sum(phase.wall for phase in self.phases.values())
+
+    @property
+    def cpu(self):
+        return sum(phase.cpu for phase in self.phases.values())
+
+    def as_dict(self):
+        return {'source_bytes': self.source_bytes,
+                'wall_ms': round(self.wall * 1000, 3), 'cpu_ms': round(self.cpu * 1000, 3),
+                'phases': [phase.as_dict() for phase in self]}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def to_prometheus(self, prefix='pascal_compiler', labels=None):
+        """Texte d'exposition Prometheus: une jauge par mesure, étiquetée par phase"""
+        extra = ''.join(f',{name}="{_escape(value)}"' for name, value in (labels or {}).items())
+        metrics = (
+            ('phase_wall_seconds', "Durée (horloge) de la phase", lambda p: p.wall),
+            ('phase_cpu_seconds', "Temps CPU de la phase", lambda p: p.cpu),
+            ('phase_tokens', "Tokens traités par la phase", lambda p: p.tokens),
+            ('phase_nodes', "Nœuds de l'AST traités par la phase", lambda p: p.nodes),
+            ('phase_peak_bytes', "Pic de mémoire allouée pendant la phase (tracemalloc)",
+             lambda p: p.peak_bytes),
+        )
+        lines = []
+        for name, help_text, value_of in metrics:
+            samples = [(phase.name, value_of(phase)) for phase in self]
+            samples = [(phase, value) for phase, value in samples if value is not None]
+            if not samples:
+                continue
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            for phase, value in samples:
+                lines.append(f'{prefix}_{name}{{phase="{_escape(phase)}"{extra}}} {value!r}')
+        lines.append(f"# HELP {prefix}_source_bytes Taille du source compilé")
+        lines.append(f"# TYPE {prefix}_source_bytes gauge")
+        lines.append(f"{prefix}_source_bytes{{{extra[1:]}}} {self.source_bytes}" if extra
+                     else f"{prefix}_source_bytes {self.source_bytes}")
+        return '\n'.join(lines) + '\n'
+
+    def __str__(self):
+        lines = [f"{'phase':12} {'horloge ms':>11} {'CPU ms':>9} {'tokens':>8} {'nœuds':>8} {'pic Kio':>9}"]
+        for phase in self:
+            peak = f"{phase.peak_bytes / 1024:9.1f}" if phase.peak_bytes is not None else f"{'-':>9}"
+            lines.append(f"{phase.name:12} {phase.wall * 1000:11.2f} {phase.cpu * 1000:9.2f} "
+                         f"{_count(phase.tokens):>8} {_count(phase.nodes):>8} {peak}")
+        lines.append(f"{'total':12} {self.wall * 1000:11.2f} {self.cpu * 1000:9.2f}")
+        return '\n'.join(lines)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _count(value):
+    return '-' if value is None else str(value)
+
+
+def count_nodes(root):
+    """Nombre de nœuds d'un AST (pile explicite)"""
+    count = 0
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        count += 1
+        for name, is_list in CHILD_FIELDS[node.__class__]:
+            value = getattr(node, name)
+            if is_list:
+                stack.extend(item for item in value if item is not None)
+            elif value is not None:
+                stack.append(value)
+    return count
+
+
+class Profiler:
+    """Mesure des phases, éventuellement imbriquées:
+        with profiler.phase('lexical') as phase:
+            ...
+        phase.tokens = ...
+    memory: pic de mémoire par phase avec tracemalloc (ralentit nettement l'exécution)"""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.stats = CompilationStats()
+        self._open = []       # phases en cours: [PhaseStats, mémoire au début, pic vu]
+        self._tracing = False  # tracemalloc démarré par ce profiler
+
+    def reset(self, source_bytes=0):
+        self.stats = CompilationStats(source_bytes)
+
+    def phase(self, name):
+        return _Measure(self, name)
+
+    def _enter(self, phase):
+        start_memory = peak = 0
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open:
+                # Le pic de la phase englobante est retenu avant la remise à zéro
+                parent = self._open[-1]
+                parent[2] = max(parent[2], peak)
+            tracemalloc.reset_peak()
+            start_memory = current
+        self._open.append([phase, start_memory, start_memory])
+
+    def _leave(self):
+        phase, start_memory, seen = self._open.pop()
+        if self.memory:
+            peak = max(seen, tracemalloc.get_traced_memory()[1])
+            phase.peak_bytes = peak - start_memory
+            if self._open:
+                parent = self._open[-1]
+                parent[2] = max(parent[2], peak)
+            elif self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+        self.stats.add(phase)
+
+
+class _Measure:
+    """Contexte d'une phase: temps horloge et CPU, mémoire si demandée"""
+    __slots__ = ('profiler', 'phase', 'wall', 'cpu')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.phase = PhaseStats(name)
+
+    def __enter__(self):
+        self.profiler._enter(self.phase)
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self.phase
+
+    def __exit__(self, *exc):
+        self.phase.wall = time.perf_counter() - self.wall
+        self.phase.cpu = time.process_time() - self.cpu
+        self.profiler._leave()
+        return False
@@ -0,0 +1,61 @@
+# Sémantique d'exécution Mini-Pascal partagée par les moteurs d'exécution
+
+import operator
+
+from errors import RuntimeError_
+
+
+def pascal_div(a, b):
+    """Division entière Pascal: quotient tronqué vers zéro (et non arrondi vers -inf)"""
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b > 0) else -q
+
+
+def pascal_mod(a, b):
+    """Reste Pascal: a - (a div b) * b, du signe du dividende"""
+    return a - pascal_div(a, b) * b
+
+
+# Opérateurs binaires (les mots-clés sont normalisés en minuscules)
+# 'and' et 'or' sont évalués en court-circuit par les moteurs, pas via cette table
+BINARY_OPS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    'div': pascal_div,
+    'mod': pascal_mod,
+    '=': operator.eq,
+    '<>': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'and': lambda a, b: a and b,
+    'or': lambda a, b: a or b,
+}
+
+UNARY_OPS = {
+    'uminus': operator.neg,
+    'not': operator.not_,
+}
+
+# Valeur initiale d'une variable selon son type déclaré
+DEFAULT_VALUES = {'integer': 0, 'real': 0.0, 'boolean': False}
+
+
+def normalize_op(op):
+    """Les opérateurs mots-clés gardent la casse du source ('DIV', 'Not'...)"""
+    return op.lower()
+
+
+def arithmetic_error(error, lineno, col):
+    """Erreur d'exécution Pascal pour une exception arithmétique de Python
+    (même message pour tous les moteurs)"""
+    if isinstance(error, ZeroDivisionError):
+        message = "Division par zéro"
+    elif isinstance(error, OverflowError):
+        message = "Dépassement de capacité"
+    else:
+        message = f"Erreur arithmétique ({error})"
+    return RuntimeError_(f"{message} à la ligne {lineno}, colonne {col}", lineno, col)
@@ -1,35 +1,216 @@
 #Analyse semantique
 
-class SemanticAnalyzer:
+from ast_1 import ConstDecl, Assign, If, While, For, Repeat, CHILD_FIELDS
+from errors import SemanticError
+from runtime import normalize_op
+from symbol_table import SymbolTable, CONSTANT, name_id
+from walker import Walker, SKIP
+
+INTEGER, REAL, BOOLEAN = 'integer', 'real', 'boolean'
+NUMERIC = (INTEGER, REAL)
+
+_ARITHMETIC = ('+', '-', '*')
+_COMPARISONS = ('=', '<>', '<', '<=', '>', '>=')
+
+
+def literal_type(value):
+    """Type Pascal d'une valeur littérale"""
+    if value.__class__ is bool:
+        return BOOLEAN
+    if value.__class__ is int:
+        return INTEGER
+    if value.__class__ is float:
+        return REAL
+    return None
+
+
+def binary_type(op, left, right):
+    """Type du résultat de left op right, ou None si les opérandes sont invalides"""
+    if op in _ARITHMETIC:
+        if left in NUMERIC and right in NUMERIC:
+            return INTEGER if left == right == INTEGER else REAL
+    elif op == '/':
+        if left in NUMERIC and right in NUMERIC:
+            return REAL
+    elif op in ('div', 'mod'):
+        if left == right == INTEGER:
+            return INTEGER
+    elif op in ('and', 'or'):
+        if left == right == BOOLEAN:
+            return BOOLEAN
+    elif op in _COMPARISONS:
+        if (left in NUMERIC and right in NUMERIC) or left == right == BOOLEAN:
+            return BOOLEAN
+    return None
+
+
+def assignable(target, value):
+    """Un entier peut être affecté à un réel, pas l'inverse"""
+    return target == value or (target == REAL and value == INTEGER)
+
+
+class SemanticAnalyzer(Walker):
+    """Vérification des types en un seul parcours.
+    Chaque expression reçoit son type dans inferred_type (None si invalide);
+    une expression déjà annotée n'est pas réanalysée."""
+
+    # Les expressions d'une instruction sont typées par expression_type, à son entrée
+    children = {**CHILD_FIELDS,
+                ConstDecl: (), Assign: (), For: (('body', False),),
+                If: (('then_stmt', False), ('else_stmt', False)),
+                While: (('body', False),), Repeat: (('body', True),)}
+
     def __init__(self, ast):
         self.ast = ast
         self.errors = []
         self.symbol_table = SymbolTable()
-        
+
     def analyze(self):
-        self.visit(self.ast)
+        self.walk(self.ast)
         return self.errors
-    
+
     def visit(self, node):
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-    
-    def visit_Program(self, node):
-        self.visit(node.block)
-    
-    def visit_Block(self, node):
-        for const in node.consts:
-            self.visit(const)
-        for var in node.vars:
-            self.visit(var)
-        for stmt in node.statements:
-            self.visit(stmt)
-    
-    def visit_VarDecl(self, node):
-        if self.symbol_table.exists(node.name):
-            self.errors.append(f"Variable déjà déclarée: {node.name}")
+        self.walk(node)
+
+    def generic_visit(self, node):
+        self.error(f"Nœud non supporté: {type(node).__name__}", node)
+
+    def error(self, message, node):
+        self.errors.append(SemanticError(
+            f"{message} à la ligne {node.lineno}, colonne {node.col}", node.lineno, node.col))
+
+    # Déclarations
+
+    def enter_ConstDecl(self, node):
+        ident = name_id(node)
+        if self.symbol_table.declared_here(ident):
+            self.error(f"Identificateur déjà déclaré: {node.name}", node)
+            return
+        value = node.value.value if node.value is not None else None
+        self.symbol_table.declare(ident, literal_type(value), value, CONSTANT, node.name)
+        if node.value is not None:
+            node.value.inferred_type = literal_type(value)
+
+    def enter_VarDecl(self, node):
+        ident = name_id(node)
+        if self.symbol_table.declared_here(ident):
+            self.error(f"Variable déjà déclarée: {node.name}", node)
+        else:
+            self.symbol_table.declare(ident, node.type, spelling=node.name)
+
+    # Instructions (les branches et corps sont parcourus par Walker.walk)
+
+    def _variable(self, ref):
+        """Type de la variable affectée, ou None (erreur déjà signalée)"""
+        table = self.symbol_table
+        slot = table.lookup(name_id(ref))
+        if slot < 0:
+            self.error(f"Variable non déclarée: {ref.name}", ref)
+            return None
+        if table.is_constant(slot):
+            self.error(f"Affectation à la constante {ref.name}", ref)
+            return None
+        kind = ref.inferred_type = table.type_of(slot)
+        return kind
+
+    def enter_Assign(self, node):
+        target = self._variable(node.target)
+        value = self.expression_type(node.value, node)
+        if target is not None and value is not None and not assignable(target, value):
+            self.error(f"Affectation d'une valeur {value} à {node.target.name} ({target})", node)
+
+    def _condition(self, condition, node, statement):
+        kind = self.expression_type(condition, node)
+        if kind is not None and kind != BOOLEAN:
+            self.error(f"La condition de {statement} doit être booléenne (trouvé: {kind})",
+                       condition)
+
+    def enter_If(self, node):
+        self._condition(node.condition, node, 'if')
+
+    def enter_While(self, node):
+        self._condition(node.condition, node, 'while')
+
+    def leave_Repeat(self, node):
+        self._condition(node.condition, node, 'repeat')
+
+    def enter_For(self, node):
+        if node.var is None:
+            self.error("Variable de contrôle manquante", node)
         else:
-            self.symbol_table.add_symbol(node.name, node.type)
-    
-    # ... autres méthodes de visite
\ No newline at end of file
+            kind = self._variable(node.var)
+            if kind is not None and kind != INTEGER:
+                self.error(f"La variable de contrôle {node.var.name} doit être entière", node.var)
+        for bound in (node.start, node.end):
+            kind = self.expression_type(bound, node)
+            if kind is not None and kind != INTEGER:
+                self.error(f"Les bornes d'une boucle for doivent être entières (trouvé: {kind})",
+                           bound)
+
+    # Expressions
+
+    def expression_type(self, root, statement):
+        """Type de l'expression, calculé en post-ordre par Walker.walk"""
+        if root is None:
+            self.error("Expression manquante", statement)
+            return None
+        kind = getattr(root, 'inferred_type', None)
+        if kind is None:
+            self.walk(root)
+            kind = getattr(root, 'inferred_type', None)
+        return kind
+
+    def enter_Literal(self, node):
+        node.inferred_type = literal_type(node.value)
+
+    def enter_VarRef(self, node):
+        if getattr(node, 'inferred_type', None) is None:
+            self._var_ref(node)
+
+    def enter_BinaryOp(self, node):
+        if getattr(node, 'inferred_type', None) is not None:
+            return SKIP
+
+    enter_UnaryOp = enter_BinaryOp
+
+    def leave_BinaryOp(self, node):
+        self._binary(node, _type(node.left), _type(node.right))
+
+    def leave_UnaryOp(self, node):
+        self._unary(node, _type(node.operand))
+
+    def _var_ref(self, node):
+        table = self.symbol_table
+        slot = table.lookup(name_id(node))
+        if slot < 0:
+            self.error(f"Variable non déclarée: {node.name}", node)
+            return None
+        kind = node.inferred_type = table.type_of(slot)
+        return kind
+
+    def _binary(self, node, left, right):
+        if left is None or right is None:
+            return None
+        kind = binary_type(normalize_op(node.op), left, right)
+        if kind is None:
+            self.error(f"Opérandes invalides pour {node.op}: {left} et {right}", node)
+            return None
+        node.inferred_type = kind
+        return kind
+
+    def _unary(self, node, operand):
+        if operand is None:
+            return None
+        op = normalize_op(node.op)
+        if (op == 'uminus' and operand in NUMERIC) or (op == 'not' and operand == BOOLEAN):
+            node.inferred_type = operand
+            return operand
+        symbol = '-' if op == 'uminus' else node.op
+        self.error(f"Opérande invalide pour {symbol}: {operand}", node)
+        return None
+
+
+
+def _type(node):
+    """Type déjà calculé d'un opérande (None s'il est absent ou invalide)"""
+    return getattr(node, 'inferred_type', None) if node is not None else None
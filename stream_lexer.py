@@ -0,0 +1,189 @@
+"""
+Analyse lexicale en flux: le source est lu par morceaux depuis un fichier,
+un mmap ou l'entrée standard, et les tokens sont produits au fur et à mesure
+
+La mémoire reste bornée par la taille d'un morceau plus le plus long token:
+seul le début d'un token coupé par la fin d'un morceau est reporté au suivant,
+et un commentaire { ... } ouvert n'est jamais conservé, seulement parcouru.
+
+Usage: python stream_lexer.py [-c] [--chunk-size N] [fichier]   (sans fichier: stdin)
+"""
+import argparse
+import codecs
+import mmap
+import os
+import sys
+from collections import namedtuple
+
+from errors import LexicalError
+from lexer import lexer as shared_lexer
+
+CHUNK_SIZE = 1 << 16
+# Caractères qui peuvent encore prolonger un token en fin de morceau:
+# "12" + ".5" devient un réel, ":" + "=" une affectation
+_LOOKAHEAD = 2
+
+# Token compact: un tuple, les mêmes informations que PascalCompiler.tokens
+Token = namedtuple('Token', 'type value line column')
+
+
+class StreamLexer:
+    """Itérateur de Token sur un flux texte ou binaire (UTF-8) lu par morceaux"""
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError("La taille des morceaux doit être positive")
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.lexer = shared_lexer.clone()
+        # Le lexer demande ses colonnes d'erreur au contexte (voir lexer._column)
+        self.lexer.context = self
+        self._decoder = None
+        self._base = 0          # offset absolu du début du tampon en cours
+        self._line_start = 0    # offset absolu du début de la ligne au début du tampon
+        self.characters = 0     # caractères lus
+        self.max_buffer = 0     # plus grand tampon analysé, en caractères
+
+    def _read(self):
+        """Morceau suivant du flux, décodé; '' à la fin"""
+        while True:
+            data = self.stream.read(self.chunk_size)
+            if not isinstance(data, str):
+                if self._decoder is None:
+                    self._decoder = codecs.getincrementaldecoder('utf-8')()
+                end = not data
+                data = self._decoder.decode(data, final=end)
+                if not data and not end:
+                    # Caractère multi-octets coupé: il reste dans le décodeur
+                    continue
+            self.characters += len(data)
+            return data
+
+    def column(self, token):
+        """Colonne d'un token du tampon en cours (utilisée pour les erreurs)"""
+        newline = token.lexer.lexdata.rfind('\n', 0, token.lexpos)
+        start = self._base + newline + 1 if newline >= 0 else self._line_start
+        return self._base + token.lexpos - start + 1
+
+    def __iter__(self):
+        lexer = self.lexer
+        next_token = lexer.token
+        pending = ''            # début de token reporté du morceau précédent
+        line = 1
+        comment = None          # (ligne, colonne) d'un commentaire encore ouvert
+        while True:
+            chunk = self._read()
+            last = not chunk
+            if comment is not None:
+                if last:
+                    line, col = comment
+                    raise LexicalError(
+                        f"Caractère non reconnu '{{' à la ligne {line}, colonne {col}", line, col)
+                close = chunk.find('}')
+                scanned = len(chunk) if close < 0 else close
+                newline = chunk.rfind('\n', 0, scanned)
+                if newline >= 0:
+                    line += chunk.count('\n', 0, scanned)
+                    self._line_start = self._base + newline + 1
+                if close < 0:
+                    self._base += len(chunk)
+                    continue
+                comment = None
+                self._base += close + 1
+                chunk = chunk[close + 1:]
+            buffer = pending + chunk if pending else chunk
+            if len(buffer) > self.max_buffer:
+                self.max_buffer = len(buffer)
+            base = self._base
+            limit = len(buffer)
+            safe = limit if last else limit - _LOOKAHEAD
+            if not last:
+                # Un { sans } dans le tampon ouvre un commentaire qui continue plus loin
+                opening = buffer.find('{', buffer.rfind('}') + 1)
+                if opening >= 0:
+                    limit = safe = opening
+            lexer.input(buffer if limit == len(buffer) else buffer[:limit])
+            lexer.lineno = line
+            cut = limit
+            scan = 0
+            line_start = self._line_start
+            while True:
+                tok = next_token()
+                if tok is None:
+                    line = lexer.lineno
+                    break
+                if lexer.lexpos > safe:
+                    # Token peut-être coupé: il sera relu avec le morceau suivant
+                    cut = tok.lexpos
+                    line = tok.lineno
+                    break
+                pos = tok.lexpos
+                newline = buffer.rfind('\n', scan, pos)
+                if newline >= 0:
+                    line_start = base + newline + 1
+                scan = pos
+                yield Token(tok.type, tok.value, tok.lineno, base + pos - line_start + 1)
+            if last:
+                return
+            newline = buffer.rfind('\n', scan, cut)
+            if newline >= 0:
+                self._line_start = base + newline + 1
+            else:
+                self._line_start = line_start
+            if cut == limit and limit < len(buffer):
+                # Commentaire ouvert: on retient sa position et on parcourt la suite
+                comment = (line, base + limit - self._line_start + 1)
+                rest = buffer[limit + 1:]
+                newline = rest.rfind('\n')
+                if newline >= 0:
+                    line += rest.count('\n')
+                    self._line_start = base + limit + 1 + newline + 1
+                self._base = base + len(buffer)
+                pending = ''
+            else:
+                self._base = base + cut
+                pending = buffer[cut:]
+
+
+def tokenize(stream, chunk_size=CHUNK_SIZE):
+    """Générateur de Token pour un flux (fichier texte ou binaire, mmap, stdin)"""
+    return iter(StreamLexer(stream, chunk_size))
+
+
+def tokenize_file(path, chunk_size=CHUNK_SIZE):
+    """Générateur de Token pour un fichier, projeté en mémoire (mmap) s'il n'est pas vide"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from StreamLexer(mapped, chunk_size)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Analyse lexicale en flux d'un programme Mini-Pascal")
+    arg_parser.add_argument('file', nargs='?', help="fichier source (défaut: entrée standard)")
+    arg_parser.add_argument('-c', '--count', action='store_true',
+                            help="n'afficher que le nombre de tokens par type")
+    arg_parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help=f"taille des morceaux lus (défaut: {CHUNK_SIZE})")
+    args = arg_parser.parse_args(argv)
+
+    tokens = (tokenize_file(args.file, args.chunk_size) if args.file
+              else tokenize(sys.stdin.buffer, args.chunk_size))
+    counts = {}
+    try:
+        for token in tokens:
+            if args.count:
+                counts[token.type] = counts.get(token.type, 0) + 1
+            else:
+                print(f"{token.line}:{token.column}\t{token.type}\t{token.value!r}")
+    except LexicalError as e:
+        print(f"Erreur lexicale: {e}", file=sys.stderr)
+        return 1
+    for kind, count in sorted(counts.items()):
+        print(f"{kind}\t{count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
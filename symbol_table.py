@@ -1,14 +1,162 @@
-#table de synbole 
+#table de synbole
+
+import threading
+from array import array
+
+
+class Interner:
+    """Noms repliés en minuscules -> identifiants entiers denses.
+    Le lexer interne chaque ID une fois; les étapes suivantes comparent des entiers."""
 
-class SymbolTable:
     def __init__(self):
-        self.symbols = {}
-        
-    def add_symbol(self, name, type, value=None):
-        self.symbols[name] = {'type': type, 'value': value}
-    
+        self._ids = {}
+        self._names = []
+        self._lock = threading.Lock()
+
+    def intern(self, name):
+        return self.intern_folded(name.lower())
+
+    def intern_folded(self, key):
+        """Comme intern(), pour un nom déjà en minuscules"""
+        ident = self._ids.get(key)
+        if ident is None:
+            with self._lock:
+                ident = self._ids.get(key)
+                if ident is None:
+                    ident = len(self._names)
+                    self._names.append(key)
+                    self._ids[key] = ident
+        return ident
+
+    def find(self, name):
+        """Identifiant de name s'il est déjà interné, sinon None (sans l'ajouter)"""
+        return self._ids.get(name.lower())
+
+    def name(self, ident):
+        return self._names[ident]
+
+    def __len__(self):
+        return len(self._names)
+
+
+# Table partagée par le lexer, le parser et les analyses
+NAMES = Interner()
+
+
+def name_id(node):
+    """Identifiant interné du nom d'un nœud (calculé et retenu s'il manque,
+    par exemple après un pickle ou pour un nœud construit à la main)"""
+    try:
+        return node.name_id
+    except AttributeError:
+        ident = node.name_id = NAMES.intern(node.name)
+        return ident
+
+
+KINDS = ('variable', 'constant')
+VARIABLE, CONSTANT = 0, 1
+TYPES = (None, 'integer', 'real', 'boolean')
+_TYPE_CODES = {name: code for code, name in enumerate(TYPES)}
+
+
+class SymbolTable:
+    """Symboles indexés par slot dense, attributs dans des tableaux parallèles.
+    Portées imbriquées: _binding donne en O(1) le slot visible pour un identifiant
+    de nom, et chaque portée garde de quoi restaurer les noms qu'elle masque.
+    _binding est un dictionnaire: sa taille suit les noms déclarés dans la table,
+    pas le nombre de noms internés depuis le début du processus."""
+
+    def __init__(self, names=NAMES):
+        self.interner = names
+        self.name_ids = array('l')     # slot -> identifiant du nom
+        self.kinds = array('B')        # slot -> VARIABLE / CONSTANT
+        self.types = array('B')        # slot -> indice dans TYPES
+        self.depths = array('H')       # slot -> profondeur de la portée
+        self.values = []               # slot -> valeur (constantes)
+        self.spellings = []            # slot -> nom tel qu'écrit, ou None
+        self._binding = {}             # identifiant de nom -> slot visible
+        self._scopes = [[]]            # par portée: (identifiant, slot masqué)
+
+    @property
+    def depth(self):
+        return len(self._scopes) - 1
+
+    def enter_scope(self):
+        self._scopes.append([])
+
+    def exit_scope(self):
+        if len(self._scopes) == 1:
+            raise ValueError("Impossible de quitter la portée globale")
+        binding = self._binding
+        for ident, previous in reversed(self._scopes.pop()):
+            if previous < 0:
+                del binding[ident]
+            else:
+                binding[ident] = previous
+
+    def lookup(self, ident):
+        """Slot visible pour un identifiant de nom, ou -1"""
+        return self._binding.get(ident, -1)
+
+    def declared_here(self, ident):
+        """Vrai si le nom est déjà déclaré dans la portée courante"""
+        slot = self.lookup(ident)
+        return slot >= 0 and self.depths[slot] == self.depth
+
+    def declare(self, ident, type, value=None, kind=VARIABLE, spelling=None):
+        """Ajoute un symbole dans la portée courante; retourne son slot"""
+        binding = self._binding
+        slot = len(self.name_ids)
+        self.name_ids.append(ident)
+        self.kinds.append(kind)
+        self.types.append(_TYPE_CODES[type])
+        self.depths.append(len(self._scopes) - 1)
+        self.values.append(value)
+        self.spellings.append(spelling)
+        self._scopes[-1].append((ident, binding.get(ident, -1)))
+        binding[ident] = slot
+        return slot
+
+    def spelling(self, slot):
+        """Nom du symbole tel qu'écrit à sa déclaration (sinon en minuscules)"""
+        spelling = self.spellings[slot]
+        return spelling if spelling is not None else self.interner.name(self.name_ids[slot])
+
+    def type_of(self, slot):
+        return TYPES[self.types[slot]]
+
+    def is_constant(self, slot):
+        return self.kinds[slot] == CONSTANT
+
+    def __len__(self):
+        return len(self.name_ids)
+
+    def entries(self):
+        """(nom, nature, type, valeur) de chaque symbole, par slot"""
+        for slot in range(len(self.name_ids)):
+            yield (self.spelling(slot), KINDS[self.kinds[slot]],
+                   TYPES[self.types[slot]], self.values[slot])
+
+    # Interface par nom: la déclaration interne le nom, les recherches n'ajoutent
+    # rien à NAMES (un nom jamais interné n'est déclaré dans aucune table).
+    # get_symbol construit un dictionnaire à chaque appel: environ 5 fois plus lent
+    # que l'ancienne table par dictionnaires; les analyses utilisent lookup().
+
+    def _find(self, name):
+        ident = self.interner.find(name)
+        return -1 if ident is None else self._binding.get(ident, -1)
+
+    def add_symbol(self, name, type, value=None, kind='variable'):
+        return self.declare(self.interner.intern(name), type, value,
+                            KINDS.index(kind), spelling=name)
+
     def get_symbol(self, name):
-        return self.symbols.get(name)
-    
+        ident = self.interner.find(name)
+        slot = -1 if ident is None else self._binding.get(ident, -1)
+        if slot < 0:
+            return None
+        return {'type': TYPES[self.types[slot]], 'value': self.values[slot],
+                'kind': KINDS[self.kinds[slot]]}
+
     def exists(self, name):
-        return name in self.symbols
\ No newline at end of file
+        return self._find(name) >= 0
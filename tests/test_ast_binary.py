@@ -0,0 +1,117 @@
+"""Aller-retour du format binaire (ast_binary) et rejet des données invalides"""
+import random
+import unittest
+
+import ast_binary
+from ast_1 import (Program, Block, ConstDecl, VarDecl, Assign, If, While, For,
+                   Repeat, Compound, BinaryOp, UnaryOp, VarRef, Literal)
+from compiler import PascalCompiler
+
+SOURCE = ("program all; const A = 1; const D = 2.5; const C = true;\n"
+          "var x : integer; var b : boolean; var r : real;\n"
+          "begin ; x := -x; if not (x = 1) then begin end else x := A;;\n"
+          "  repeat ; x := x div 2; until (x > 2) or b;\n"
+          "  for x := 10 downto 1 do b := false; while b and true do r := r / D;\n"
+          "  if b then x := x mod 3 end.")
+
+
+def ref(name='x'):
+    return VarRef(name, 3, 7)
+
+
+def program(*statements):
+    return Program('p', Block([], [], list(statements), 1, 2), 1, 1)
+
+
+# Un exemple par classe, avec enfants présents puis absents (None, listes vides)
+SAMPLES = {
+    Program: [program(), Program('vide', Block(), 0, 0)],
+    Block: [Block([ConstDecl('K', Literal(3, 1, 2), 1, 1)], [VarDecl('x', 'integer', 2, 5)],
+                  [None, Assign(ref(), Literal(1)), None], 4, 0), Block()],
+    ConstDecl: [ConstDecl('Pi', Literal(3.14159), 1, 7)],
+    VarDecl: [VarDecl('Total', 'real', 12, 300)],
+    Assign: [Assign(ref(), BinaryOp('+', ref(), Literal(1)), 2, 3), Assign(ref(), None)],
+    If: [If(ref('b'), Assign(ref(), Literal(1)), Assign(ref(), Literal(2))),
+         If(ref('b'), None, None)],
+    While: [While(Literal(True), Compound([])), While(ref('b'), None)],
+    For: [For(ref('i'), Literal(1), 'to', Literal(10), Assign(ref(), ref('i'))),
+          For(None, None, 'downto', None, None)],
+    Repeat: [Repeat([None, Assign(ref(), Literal(0))], ref('b')), Repeat([], None)],
+    Compound: [Compound([Compound([None]), None]), Compound([])],
+    BinaryOp: [BinaryOp('div', ref(), Literal(2)), BinaryOp('and', None, None)],
+    UnaryOp: [UnaryOp('not', ref('b')), UnaryOp('-', None)],
+    VarRef: [VarRef('Été', 2**40, 0)],
+    Literal: [Literal(value) for value in
+              (None, True, False, 0, -1, 2**70, -2**70, 0.5, float('inf'), 'texte')],
+}
+
+
+def round_trip(node):
+    return ast_binary.loads(ast_binary.dumps(node))
+
+
+class RoundTripTest(unittest.TestCase):
+
+    def test_every_node_class(self):
+        self.assertEqual(set(SAMPLES), set(ast_binary.TAGS))
+        for cls, nodes in SAMPLES.items():
+            for node in nodes:
+                with self.subTest(node=repr(node)):
+                    back = round_trip(node)
+                    self.assertIs(back.__class__, cls)
+                    self.assertEqual(back, node)
+
+    def test_literal_types_are_kept(self):
+        for node in SAMPLES[Literal]:
+            with self.subTest(value=node.value):
+                # True == 1: le type doit aussi être conservé
+                self.assertIs(type(round_trip(node).value), type(node.value))
+
+    def test_parsed_program(self):
+        compiler = PascalCompiler()
+        self.assertTrue(compiler.compile(SOURCE), compiler.errors)
+        self.assertEqual(round_trip(compiler.ast).to_tree_string(), compiler.ast.to_tree_string())
+
+
+class InvalidDataTest(unittest.TestCase):
+
+    def setUp(self):
+        compiler = PascalCompiler()
+        compiler.compile(SOURCE)
+        self.data = ast_binary.dumps(compiler.ast)
+
+    def test_bad_header(self):
+        for data in (b'', b'PAS', b'XAST\x01', b'PAST', b'PAST\x63'):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                ast_binary.loads(data)
+
+    def test_trailing_bytes(self):
+        with self.assertRaises(ValueError):
+            ast_binary.loads(self.data + b'garbage')
+        with self.assertRaises(ValueError):
+            ast_binary.loads(self.data + b'\x00')
+
+    def test_truncated(self):
+        for end in range(len(self.data)):
+            with self.subTest(end=end), self.assertRaises(ValueError):
+                ast_binary.loads(self.data[:end])
+
+    def test_string_past_end(self):
+        # Une seule chaîne annoncée, de 100 octets, dont 3 seulement sont présents
+        with self.assertRaises(ValueError):
+            ast_binary.loads(b'PAST\x01\x01\x64abc')
+
+    def test_corrupted(self):
+        rng = random.Random(20240610)
+        for _ in range(3000):
+            data = bytearray(self.data)
+            for _ in range(rng.randint(1, 4)):
+                data[rng.randrange(len(data))] = rng.randrange(256)
+            try:
+                ast_binary.loads(bytes(data))
+            except ValueError:
+                pass
+
+
+if __name__ == '__main__':
+    unittest.main()
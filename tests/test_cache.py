@@ -0,0 +1,68 @@
+"""Cache de compilation sur disque: les fichiers invalides sont des absences, jamais des erreurs"""
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from cache import CompilationCache, source_key
+from compiler import PascalCompiler
+
+SOURCE = "program p; var x : integer; begin x := 1; x := x * 2 end."
+
+
+class _Missing:
+    """Classe dont le module disparaît avant la relecture du pickle"""
+
+
+class DiskCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def path(self):
+        return os.path.join(self.directory, f"{source_key(SOURCE)}.pickle")
+
+    def compile(self):
+        compiler = PascalCompiler(cache=CompilationCache(directory=self.directory))
+        return compiler, compiler.compile(SOURCE)
+
+    def test_round_trip(self):
+        first, ok = self.compile()
+        self.assertTrue(ok)
+        self.assertTrue(os.path.exists(self.path()))
+        second, ok = self.compile()
+        self.assertTrue(ok)
+        self.assertEqual(second.cache.disk_hits, 1)
+        self.assertEqual(second.get_ast_tree(), first.get_ast_tree())
+        self.assertEqual(len(second.tokens), len(first.tokens))
+
+    def test_invalid_files_are_misses(self):
+        expected, _ = self.compile()
+        missing = pickle.dumps(_Missing()).replace(__name__.encode(), b'module_absent')
+        contents = {
+            'entier': pickle.dumps(1),
+            'tuple': pickle.dumps((True, [], None, [])),
+            'clés manquantes': pickle.dumps({'success': True}),
+            'types faux': pickle.dumps({'success': 1, 'tokens': [], 'ast': 'x', 'errors': ()}),
+            'module absent': missing,
+            'tronqué': pickle.dumps({'success': True, 'tokens': None})[:-5],
+            'pas un pickle': b'\x00\x01 pas un pickle',
+            'vide': b'',
+        }
+        for label, data in contents.items():
+            with self.subTest(contenu=label):
+                with open(self.path(), 'wb') as f:
+                    f.write(data)
+                compiler, ok = self.compile()
+                self.assertTrue(ok)
+                self.assertEqual(compiler.cache.disk_hits, 0)
+                self.assertEqual(compiler.get_ast_tree(), expected.get_ast_tree())
+                # Le fichier invalide a été remplacé par une entrée valide
+                again, _ = self.compile()
+                self.assertEqual(again.cache.disk_hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
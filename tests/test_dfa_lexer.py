@@ -0,0 +1,127 @@
+"""Test différentiel: le lexer à automate (dfa_lexer) donne exactement les tokens du lexer PLY"""
+import random
+import unittest
+
+from dfa_lexer import DFALexer
+from errors import LexicalError
+from lexer import lexer as ply_lexer
+from parser_1 import ParserContext
+
+SEED = 19
+CASES = 5000
+
+# Fragments choisis pour les frontières: mots réservés en casse mélangée,
+# réels incomplets, opérateurs à deux caractères, commentaires, caractères invalides
+PIECES = ['program', 'BEGIN', 'End', 'x', 'y1', '_a', 'trUe', 'false', 'div', 'mod',
+          'downto', 'Do', 'integer', '12', '3.5', '7.', '.', ':', '=', ':=', '<', '>',
+          '<>', '<=', '>=', '{', '}', '{ c }', '{\n}', ' ', '\t', '\n', '\r', '٣',
+          'x٣', 'é', '$', ';', ',', '(', ')', '+', '-', '*', '/']
+
+SAMPLES = [
+    """program example;
+const MAX = 10;
+var x, y : integer;
+begin
+    if x < MAX then
+        x := x + 1
+    else
+        x := 0;
+    y := 5 * 2;
+end.""",
+    """program loops;
+var i, sum : integer;
+begin
+    sum := 0; { commentaire
+    sur deux lignes }
+    for i := 1 to 10 do sum := sum + i;
+    while sum > 0 do begin sum := sum - 1 end;
+    repeat sum := sum + 2 until sum >= 20
+end.""",
+    """program calculus;
+const PI = 3.14159;
+var radius, area : real;
+begin
+    radius := 5.0;
+    area := PI * radius * radius;
+    if not (area <> 50) and true then radius := radius / 2 else radius := radius * 2
+end.""",
+    "program e; var x : integer; begin x := 3 # 4; x := x @ 1 end.",
+    "program c; begin { jamais fermé",
+    "",
+]
+
+
+def fuzz_cases():
+    rng = random.Random(SEED)
+    return [''.join(rng.choice(PIECES) for _ in range(rng.randrange(1, 30)))
+            for _ in range(CASES)]
+
+
+def lex_all(lexer, text, recover=False):
+    """Tokens (type, valeur, type de la valeur, ligne, position, identifiant),
+    puis l'erreur qui a arrêté l'analyse ou les erreurs notées en mode récupération"""
+    context = ParserContext(text)
+    if recover:
+        context.errors = []
+    lexer.context = context
+    lexer.input(text)
+    lexer.lineno = 1
+    result = []
+    try:
+        for tok in iter(lexer.token, None):
+            result.append((tok.type, tok.value, type(tok.value), tok.lineno, tok.lexpos,
+                           getattr(tok, 'name_id', None)))
+    except LexicalError as e:
+        result.append((str(e), e.lineno, e.col))
+    for e in context.errors or ():
+        result.append((str(e), e.lineno, e.col))
+    return result
+
+
+class DifferentialTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ply = ply_lexer.clone()
+        self.dfa = DFALexer()
+
+    def compare(self, texts, recover=False):
+        for text in texts:
+            expected = lex_all(self.ply, text, recover)
+            actual = lex_all(self.dfa, text, recover)
+            if actual != expected:
+                self.assertEqual(actual, expected, f"texte {text!r}")
+
+    def test_samples(self):
+        self.compare(SAMPLES)
+
+    def test_fuzzed(self):
+        self.compare(fuzz_cases())
+
+    def test_samples_recovery(self):
+        self.compare(SAMPLES, recover=True)
+
+    def test_fuzzed_recovery(self):
+        self.compare(fuzz_cases()[:1000], recover=True)
+
+    def test_clone_mid_stream(self):
+        # Un clone pris en cours d'analyse reprend au même point, comme avec PLY,
+        # sans prendre de tokens à l'original
+        for lexer in (self.ply, self.dfa):
+            with self.subTest(lexer=type(lexer).__name__):
+                lexer.input(SAMPLES[0])
+                lexer.lineno = 1
+                head = [lexer.token().value for _ in range(3)]
+                clone = lexer.clone()
+                rest = [tok.value for tok in iter(lexer.token, None)]
+                self.assertEqual([tok.value for tok in iter(clone.token, None)], rest)
+                self.assertEqual(head + rest, [t[1] for t in lex_all(self.ply, SAMPLES[0])])
+
+    def test_fuzz_reaches_errors(self):
+        # Le tirage doit bien couvrir les caractères invalides et les tokens valides
+        results = [lex_all(self.ply, text) for text in fuzz_cases()[:500]]
+        self.assertTrue(any(len(result[-1]) == 3 for result in results if result))
+        self.assertTrue(any(len(result) > 5 for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
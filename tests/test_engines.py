@@ -0,0 +1,136 @@
+"""Les trois moteurs d'exécution (interpréteur, bytecode, Python) donnent les mêmes résultats"""
+import unittest
+
+import bytecode
+import transpile
+from compiler import PascalCompiler
+from errors import RuntimeError_
+from interpreter import Interpreter
+
+ENGINES = ('interpreter', 'bytecode', 'python')
+BIG = '9' * 400 + '.0'
+
+PROGRAMS = {
+    'boucles': """program boucles;
+const N = 50;
+var i, s : integer;
+var r : real;
+var fini : boolean;
+begin
+    s := 0;
+    for i := 1 to N do s := s + i mod 7;
+    for i := N downto 1 do s := s - i div 3;
+    r := s / 4;
+    repeat s := s + 1 until s > 100;
+    while s > 0 do s := s - 9;
+    fini := (s <= 0) and not (r > 1000.0)
+end.""",
+    # Réels non finis: le code Python généré ne doit pas contenir inf ou nan nus
+    'infini': f"program p; var r : real; begin r := {BIG} end.",
+    'moins_infini': f"program p; var r : real; begin r := -{BIG} end.",
+    'nan': f"program p; var r : real; begin r := {BIG} - {BIG} end.",
+    'constante_infinie': "program p; const H = 1" + "0" * 300 + ".0; var r : real; "
+                         "begin r := H * H * H end.",
+    # Après optimize(), -0.0 est un littéral distinct de 0.0 (même s'ils sont égaux)
+    'zero_negatif': "program p; var x : real; var y : real; begin x := 0.0; y := -0.0 end.",
+}
+
+
+def run(source, engine, optimize):
+    compiler = PascalCompiler()
+    if not compiler.compile(source):
+        raise AssertionError(compiler.errors)
+    if optimize:
+        compiler.optimize()
+    return compiler.execute(engine)
+
+
+class EnginesTest(unittest.TestCase):
+
+    def test_same_results(self):
+        for label, source in PROGRAMS.items():
+            for optimize in (False, True):
+                results = {engine: run(source, engine, optimize) for engine in ENGINES}
+                with self.subTest(programme=label, optimise=optimize):
+                    expected = repr(results['interpreter'])
+                    self.assertIsNone(results['interpreter'][1])
+                    for engine in ENGINES[1:]:
+                        # repr: nan n'est pas égal à lui-même
+                        self.assertEqual(repr(results[engine]), expected, engine)
+
+    def test_negative_zero(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                self.assertEqual(repr(run(PROGRAMS['zero_negatif'], engine, True)[0]['y']), '-0.0')
+
+    def test_non_finite_values(self):
+        self.assertEqual(run(PROGRAMS['infini'], 'python', True)[0]['r'], float('inf'))
+        self.assertEqual(run(PROGRAMS['moins_infini'], 'python', False)[0]['r'], float('-inf'))
+
+
+class ArithmeticErrorTest(unittest.TestCase):
+    """Exceptions arithmétiques de Python: erreurs d'exécution Pascal, avec position"""
+
+    HUGE = '1' + '0' * 400
+
+    def check(self, source, engines, message, lineno, col):
+        for engine in engines:
+            with self.subTest(engine=engine):
+                compiler = PascalCompiler()
+                self.assertTrue(compiler.compile(source), compiler.errors)
+                result, error = compiler.execute(engine)
+                self.assertIsNone(result)
+                self.assertEqual(error, f"Erreur d'exécution: {message} à la ligne {lineno}, "
+                                        f"colonne {col}")
+
+    def test_division_position(self):
+        # Plusieurs divisions dans l'instruction: c'est celle qui échoue qui est signalée
+        source = ("program p; var x : integer; var y : integer; var r : real;\n"
+                  "begin\n  y := 0;\n  x := 10 div 2 + 7 mod 3 + 5 div y;\n"
+                  "  r := 1 / 2 + x / y\nend.")
+        self.check(source, ENGINES, "Division par zéro", 4, 31)
+        self.check(source.replace("5 div y", "5 div 1"), ENGINES, "Division par zéro", 5, 18)
+
+    def test_overflow(self):
+        # Entier trop grand pour un réel: à l'affectation, puis à l'opérateur
+        self.check(f"program p; var r : real;\nbegin\n  r := {self.HUGE}\nend.",
+                   ENGINES, "Dépassement de capacité", 3, 5)
+        self.check(f"program p; const BIG = {self.HUGE}; var r : real;\nbegin\n  r := BIG / 3\nend.",
+                   ENGINES, "Dépassement de capacité", 3, 12)
+        self.check(f"program p; const BIG = {self.HUGE}; var x : integer; var r : real;\n"
+                   "begin\n  x := BIG;\n  r := x * 1.5\nend.",
+                   ENGINES, "Dépassement de capacité", 4, 10)
+
+
+class UncheckedProgramTest(unittest.TestCase):
+    """AST rejeté par l'analyse sémantique, exécuté directement par chaque moteur"""
+
+    SOURCE = "program p; var i, x : integer; begin x := 1; for i := 1.5 to 3 do x := x + 1 end."
+
+    def setUp(self):
+        self.compiler = PascalCompiler()
+        self.assertFalse(self.compiler.compile(self.SOURCE))
+
+    def test_real_for_bounds(self):
+        runs = {
+            'interpreter': lambda ast: Interpreter(ast).run(),
+            'bytecode': lambda ast: bytecode.run(bytecode.compile_program(ast)),
+            'python': lambda ast: transpile.run(transpile.compile_program(ast)),
+        }
+        for engine, run_ast in runs.items():
+            with self.subTest(engine=engine):
+                with self.assertRaises(RuntimeError_) as raised:
+                    run_ast(self.compiler.ast)
+                self.assertIn("bornes d'une boucle for", str(raised.exception))
+                self.assertEqual(raised.exception.lineno, 1)
+
+    def test_execute_refuses_failed_compile(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                result, error = self.compiler.execute(engine)
+                self.assertIsNone(result)
+                self.assertIn("Compilation échouée", error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Profilage par phase de PascalCompiler"""
+import json
+import unittest
+
+from compiler import PascalCompiler
+from profiling import count_nodes
+
+SOURCE = ("program p; const K = 3; var x : integer; var b : boolean;\n"
+          "begin x := K * 2; if not b then x := x - 1; while x > 0 do x := x div 2 end.")
+
+
+class ProfilingTest(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        compiler = PascalCompiler()
+        compiler.compile(SOURCE)
+        self.assertIsNone(compiler.stats)
+
+    def test_phases_and_counts(self):
+        compiler = PascalCompiler(profile=True)
+        self.assertTrue(compiler.compile(SOURCE))
+        compiler.build_ast()
+        stats = compiler.stats
+        self.assertEqual([phase.name for phase in stats],
+                         ['lexical', 'columns', 'syntactic', 'semantic', 'rendering'])
+        nodes = count_nodes(compiler.ast)
+        # Même définition du nombre de nœuds pour toutes les phases
+        for name in ('syntactic', 'semantic', 'rendering'):
+            self.assertEqual(stats[name].nodes, nodes, name)
+        self.assertEqual(stats['lexical'].tokens, len(compiler.tokens))
+        self.assertEqual(stats.source_bytes, len(SOURCE.encode('utf-8')))
+        self.assertEqual(len(json.loads(stats.to_json())['phases']), len(stats))
+        self.assertIn('pascal_compiler_phase_nodes{phase="semantic"}', stats.to_prometheus())
+
+    def test_reset_on_each_compile(self):
+        compiler = PascalCompiler(profile=True)
+        compiler.compile(SOURCE)
+        compiler.build_ast()
+        compiler.compile(SOURCE)
+        self.assertNotIn('rendering', compiler.stats)
+
+    def test_memory(self):
+        compiler = PascalCompiler(profile_memory=True)
+        compiler.compile(SOURCE)
+        self.assertTrue(all(phase.peak_bytes is not None for phase in compiler.stats))
+
+
+if __name__ == '__main__':
+    unittest.main()
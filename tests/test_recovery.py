@@ -0,0 +1,58 @@
+"""Mode récupération: toutes les erreurs sont signalées, un AST partiel est toujours rendu"""
+import unittest
+
+from ast_1 import Assign, Program
+from compiler import PascalCompiler
+
+
+def compile_recovering(source):
+    compiler = PascalCompiler(recover=True)
+    success = compiler.compile(source)
+    return success, compiler.syntax_errors, compiler.ast
+
+
+class RecoveryTest(unittest.TestCase):
+
+    def test_each_declaration_error(self):
+        # Deux déclarations erronées à la suite: errok permet de signaler la seconde
+        success, errors, ast = compile_recovering(
+            "program p; var x : integer; var : integer; const = 3; begin end.")
+        self.assertFalse(success)
+        self.assertEqual([(e.lineno, e.col) for e in errors], [(1, 33), (1, 50)])
+        self.assertEqual([v.name for v in ast.block.vars], ['x'])
+
+    def test_each_statement_error(self):
+        success, errors, ast = compile_recovering(
+            "program p; var x : integer;\nbegin\n  x := ;\n  x := 1 + ;\n  x := 2\nend.")
+        self.assertEqual([(e.lineno, e.col) for e in errors], [(3, 8), (4, 12)])
+        self.assertEqual([s.value.value for s in ast.block.statements], [2])
+
+    def test_unshiftable_token(self):
+        # END dans un repeat: absorbé par statement : error puis abandonné, sans boucler
+        success, errors, ast = compile_recovering(
+            "program p; var x : integer; begin repeat x := 1 end.")
+        self.assertFalse(success)
+        self.assertEqual(str(errors[-1]), "Erreur syntaxique: fin de fichier inattendue")
+        self.assertIsInstance(ast, Program)
+
+    def test_unexpected_eof(self):
+        # Le programme s'arrête au milieu d'un repeat: l'AST garde l'instruction complète
+        success, errors, ast = compile_recovering(
+            "program p; var x : integer;\nbegin\n  x := 1;\n  repeat x := x + 1")
+        self.assertFalse(success)
+        self.assertEqual([str(e) for e in errors], ["Erreur syntaxique: fin de fichier inattendue"])
+        self.assertEqual(ast.name, 'p')
+        self.assertEqual([v.name for v in ast.block.vars], ['x'])
+        self.assertEqual(len(ast.block.statements), 1)
+        self.assertIsInstance(ast.block.statements[0], Assign)
+
+    def test_eof_after_error(self):
+        # Erreur puis fin de fichier pendant la reprise: les deux sont signalées
+        success, errors, ast = compile_recovering("program p; var x : integer; begin x := ;")
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(str(errors[-1]), "Erreur syntaxique: fin de fichier inattendue")
+        self.assertIsInstance(ast, Program)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Compilations concurrentes: chaque PascalCompiler garde son lexer, son parser et son contexte"""
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from compiler import PascalCompiler
+
+THREADS = 8
+ROUNDS = 6
+
+
+def make_program(statements, per_line, name, error=False):
+    """Programme de taille et de disposition propres à chaque source; avec error,
+    une expression incomplète dont la position diffère d'un programme à l'autre"""
+    body = []
+    for n in range(statements):
+        kind = n % 4
+        if kind == 0:
+            body.append(f"x := x + {n} * K")
+        elif kind == 1:
+            body.append("if x > y then y := x - 1 else y := y + 2")
+        elif kind == 2:
+            body.append("for i := 1 to 3 do x := x + i div 2")
+        else:
+            body.append("while y > 100 do y := y mod 7")
+    if error:
+        body[statements // 2] = "y := y mod"
+    lines = [f"program {name};", "const K = 3;", "var i, x, y : integer;", "begin"]
+    for start in range(0, len(body), per_line):
+        lines.append("  " + "; ".join(body[start:start + per_line]) + ";")
+    lines.append("end.")
+    return "\n".join(lines)
+
+
+SOURCES = [make_program(20 + 13 * n, 1 + n % 3, f"p{n}", error=n % 4 == 3) for n in range(16)]
+
+
+def compile_source(source, **options):
+    compiler = PascalCompiler(**options)
+    ok = compiler.compile(source)
+    return ok, compiler.errors, compiler.get_ast_tree() if ok else None, len(compiler.tokens)
+
+
+class ThreadIsolationTest(unittest.TestCase):
+
+    def check(self, **options):
+        expected = [compile_source(source, **options) for source in SOURCES]
+        self.assertTrue(any(not result[0] for result in expected))
+        self.assertTrue(any(result[0] for result in expected))
+        # Tous les threads démarrent ensemble pour entrelacer les compilations
+        barrier = threading.Barrier(THREADS)
+
+        def job(index):
+            if index < THREADS:
+                barrier.wait(timeout=60)
+            return compile_source(SOURCES[index % len(SOURCES)], **options)
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(job, range(len(SOURCES) * ROUNDS)))
+        for index, result in enumerate(results):
+            with self.subTest(source=index % len(SOURCES)):
+                self.assertEqual(result, expected[index % len(SOURCES)])
+
+    def test_ply_lexer(self):
+        self.check()
+
+    def test_dfa_lexer(self):
+        self.check(lexer_backend='dfa')
+
+    def test_error_recovery(self):
+        self.check(recover=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Tokens rangés par colonnes: un tableau typé par attribut plutôt qu'un dictionnaire
+par token, et une vue séquence qui recrée les dictionnaires à la demande
+"""
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+
+from lexer import tokens as TOKEN_TYPES
+
+TYPE_CODES = {name: code for code, name in enumerate(TOKEN_TYPES)}
+
+
+class TokenStore(Sequence):
+    """Tokens d'une analyse lexicale: types en array('B'), lignes et colonnes
+    en array('I'), valeurs dans une table à part où chaque valeur distincte
+    n'apparaît qu'une fois. store[i] rend {'type', 'value', 'line', 'column'}."""
+
+    __slots__ = ('types', 'lines', 'columns', 'value_ids', 'values', '_value_index')
+
+    def __init__(self):
+        self.types = array('B')        # token -> code dans TOKEN_TYPES
+        self.lines = array('I')
+        self.columns = array('I')
+        self.value_ids = array('I')    # token -> indice dans values
+        self.values = []               # valeurs distinctes
+        self._value_index = {}         # valeur -> indice dans values
+
+    @classmethod
+    def from_lextokens(cls, tokens, column):
+        """Store des LexToken; column(lexpos) donne la colonne d'un token"""
+        store = cls()
+        store.extend_lextokens(tokens, column)
+        return store
+
+    def _value_id(self, value):
+        # Les chaînes sont leur propre clé; 1, 1.0 et True restent distincts
+        key = value if value.__class__ is str else (value.__class__, value)
+        index = self._value_index.get(key)
+        if index is None:
+            index = self._value_index[key] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def extend_lextokens(self, tokens, column):
+        """Ajoute des LexToken à la fin"""
+        codes = TYPE_CODES
+        index = self._value_index
+        value_id = self._value_id
+        add_type, add_line = self.types.append, self.lines.append
+        add_column, add_value = self.columns.append, self.value_ids.append
+        for tok in tokens:
+            add_type(codes[tok.type])
+            add_line(tok.lineno)
+            add_column(column(tok.lexpos))
+            value = tok.value
+            if value.__class__ is str:
+                found = index.get(value)
+                add_value(found if found is not None else value_id(value))
+            else:
+                add_value(value_id(value))
+
+    def splice(self, start, stop, middle, suffix, column, lines, resync_line):
+        """Nouveau store: les tokens [0, start) repris, les LexToken middle ajoutés,
+        puis ceux de [stop, fin) décalés de lines lignes. suffix: les LexToken
+        correspondant à [stop, fin), dont on relit les colonnes sur la ligne resync_line.
+        Le store d'origine n'est pas modifié (il peut être partagé par le cache)."""
+        store = TokenStore()
+        store.values = list(self.values)
+        store._value_index = dict(self._value_index)
+        store.types = self.types[:start]
+        store.lines = self.lines[:start]
+        store.columns = self.columns[:start]
+        store.value_ids = self.value_ids[:start]
+        store.extend_lextokens(middle, column)
+        # Ligne de reprise: son début peut être dans la zone modifiée
+        resync = 0
+        while resync < len(suffix) and suffix[resync].lineno == resync_line:
+            store.columns.append(column(suffix[resync].lexpos))
+            resync += 1
+        store.columns.extend(self.columns[stop + resync:])
+        store.types.extend(self.types[stop:])
+        store.value_ids.extend(self.value_ids[stop:])
+        if lines:
+            store.lines.extend(array('I', [line + lines for line in self.lines[stop:]]))
+        else:
+            store.lines.extend(self.lines[stop:])
+        return store
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.types)))]
+        return {'type': TOKEN_TYPES[self.types[index]],
+                'value': self.values[self.value_ids[index]],
+                'line': self.lines[index],
+                'column': self.columns[index]}
+
+    def __iter__(self):
+        types, values = TOKEN_TYPES, self.values
+        for code, value_id, line, col in zip(self.types, self.value_ids, self.lines, self.columns):
+            yield {'type': types[code], 'value': values[value_id], 'line': line, 'column': col}
+
+    def __eq__(self, other):
+        if isinstance(other, TokenStore):
+            return (self.types == other.types and self.lines == other.lines
+                    and self.columns == other.columns
+                    and self.value_list() == other.value_list())
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<TokenStore: {len(self)} tokens, {len(self.values)} valeurs distinctes>"
+
+    def __getstate__(self):
+        return (self.types, self.lines, self.columns, self.value_ids, self.values)
+
+    def __setstate__(self, state):
+        self.types, self.lines, self.columns, self.value_ids, self.values = state
+        self._value_index = {value if value.__class__ is str else (value.__class__, value): index
+                             for index, value in enumerate(self.values)}
+
+    # Accès par colonne et comptages (les boucles tournent en C)
+
+    def value_list(self):
+        values = self.values
+        return [values[i] for i in self.value_ids]
+
+    def type_names(self):
+        return [TOKEN_TYPES[code] for code in self.types]
+
+    def count_type(self, name):
+        """Nombre de tokens du type name"""
+        code = TYPE_CODES.get(name)
+        return self.types.count(code) if code is not None else 0
+
+    def distinct_types(self):
+        return len(set(self.types))
+
+    def type_counts(self):
+        """Nombre de tokens par type"""
+        return {TOKEN_TYPES[code]: count for code, count in Counter(self.types).items()}
+
+    def as_columns(self):
+        """Dictionnaire de colonnes (type, value, line, column), par exemple pour un tableau"""
+        return {'type': self.type_names(), 'value': self.value_list(),
+                'line': self.lines.tolist(), 'column': self.columns.tolist()}
@@ -0,0 +1,352 @@
+"""
+Traduction d'un AST Mini-Pascal en source Python, compilé avec compile()
+
+Le programme devient une fonction dont les variables sont des locales Python;
+les objets code sont mis en cache par empreinte du source.
+
+Les opérateurs restent en ligne dans le code généré; en cas d'erreur, l'instruction
+Python fautive (co_positions) est rapprochée de l'opérateur Pascal correspondant.
+"""
+import ast
+import hashlib
+import math
+import sys
+import threading
+from collections import OrderedDict
+
+from ast_1 import (Program, Assign, If, While, For, Repeat, Compound,
+                   BinaryOp, UnaryOp, VarRef, Literal)
+from errors import RuntimeError_
+from runtime import DEFAULT_VALUES, arithmetic_error, normalize_op, pascal_div, pascal_mod
+from symbol_table import NAMES, name_id
+
+FUNCTION_NAME = '_pascal_main'
+FILENAME = '<mini-pascal>'
+CODE_CACHE_SIZE = 128
+
+# Priorités Python: un opérande plus faible que son parent est parenthésé
+_OR, _AND, _NOT, _COMPARE, _SUM, _PRODUCT, _UNARY, _ATOM = range(1, 9)
+
+_BINARY = {
+    '+': (' + ', _SUM), '-': (' - ', _SUM),
+    '*': (' * ', _PRODUCT), '/': (' / ', _PRODUCT),
+    '=': (' == ', _COMPARE), '<>': (' != ', _COMPARE),
+    '<': (' < ', _COMPARE), '<=': (' <= ', _COMPARE),
+    '>': (' > ', _COMPARE), '>=': (' >= ', _COMPARE),
+    'and': (' and ', _AND), 'or': (' or ', _OR),
+}
+# div et mod gardent la sémantique Pascal (troncature vers zéro)
+_CALLS = {'div': '_div', 'mod': '_mod'}
+# Opérateurs qui peuvent lever une erreur arithmétique: leur position est retenue
+_ARITHMETIC = ('+', '-', '*', '/', 'div', 'mod')
+# Leur forme dans l'arbre Python du code généré
+_PY_ARITHMETIC = (ast.Add, ast.Sub, ast.Mult, ast.Div)
+
+# Seules fonctions visibles par le code généré
+_GLOBALS = {'_div': pascal_div, '_mod': pascal_mod,
+            '__builtins__': {'range': range, 'float': float}}
+
+
+class PythonProgram:
+    """Programme traduit: fonction compilée, source Python et table des positions"""
+
+    def __init__(self, name, source, function, positions, names):
+        self.name = name
+        self.source = source
+        self.function = function
+        # ligne Python -> (ligne, colonne, opérateurs): position de l'instruction, puis
+        # celle de chaque opérateur arithmétique de la ligne, dans l'ordre du texte
+        self.positions = positions
+        self.names = names            # noms déclarés, dans l'ordre du tuple retourné
+        self._operators = None
+
+    def operator_spans(self, lineno):
+        """(début, fin) en colonnes des opérations arithmétiques Python de la ligne,
+        dans l'ordre du texte; calculé à la première erreur seulement"""
+        if self._operators is None:
+            spans = {}
+            for node in ast.walk(ast.parse(self.source)):
+                if node.__class__ is ast.BinOp and isinstance(node.op, _PY_ARITHMETIC):
+                    # Ordre du texte: l'opérateur suit son opérande gauche
+                    order = node.left.end_col_offset
+                elif (node.__class__ is ast.Call and node.func.__class__ is ast.Name
+                      and node.func.id in _CALLS.values()):
+                    order = node.args[0].end_col_offset
+                else:
+                    continue
+                spans.setdefault(node.lineno, []).append((order, node.col_offset, node.end_col_offset))
+            self._operators = {line: [span[1:] for span in sorted(items)]
+                               for line, items in spans.items()}
+        return self._operators.get(lineno, [])
+
+    @property
+    def code(self):
+        return self.function.__code__
+
+
+class PythonTranspiler:
+    """Traduit un Program en source Python; une table par classe de nœud"""
+
+    def __init__(self, program):
+        if not isinstance(program, Program):
+            raise TypeError("Le transpileur attend un nœud Program")
+        self.program = program
+        self.locals = {}          # identifiant de nom -> locale Python
+        self.types = {}           # identifiant de nom -> type déclaré
+        self.names = []
+        self.constants = {}       # identifiant de nom -> valeur
+        self.lines = []
+        self.positions = {}
+        # Opérateurs arithmétiques de la ligne en cours, dans l'ordre du texte
+        # (None pour une opération ajoutée par la traduction)
+        self._operators = []
+        self._statements = {
+            Assign: self._assign, If: self._if, While: self._while, For: self._for,
+            Repeat: self._repeat, Compound: self._compound,
+        }
+
+    def source(self):
+        """Source Python complet du programme"""
+        block = self.program.block
+        for const in block.consts:
+            key = name_id(const)
+            if key in self.constants:
+                raise RuntimeError_(f"Identificateur déjà déclaré: {const.name}", const.lineno, const.col)
+            self.constants[key] = const.value.value if const.value else None
+        self.lines.append(f"def {FUNCTION_NAME}():")
+        for var in block.vars:
+            key = name_id(var)
+            if key in self.constants or key in self.locals:
+                raise RuntimeError_(f"Identificateur déjà déclaré: {var.name}", var.lineno, var.col)
+            local = self.locals[key] = f"v_{NAMES.name(key)}"
+            self.types[key] = var.type
+            self.names.append(var.name)
+            self.lines.append(f"    {local} = {DEFAULT_VALUES.get(var.type)!r}")
+        self._sequence(block.statements, 1)
+        result = ''.join(f"{local}, " for local in self.locals.values())
+        self.lines.append(f"    return ({result.rstrip()})")
+        return '\n'.join(self.lines) + '\n'
+
+    # Instructions
+
+    def _emit(self, text, depth, node):
+        """Ajoute une ligne et retient la position Pascal de l'instruction"""
+        self.lines.append(f"{'    ' * depth}{text}")
+        self.positions[len(self.lines)] = (node.lineno, node.col, tuple(self._operators))
+        self._operators.clear()
+
+    def _sequence(self, statements, depth):
+        start = len(self.lines)
+        for stmt in statements:
+            if stmt is not None:
+                self._statements[stmt.__class__](stmt, depth)
+        if len(self.lines) == start:
+            self.lines.append(f"{'    ' * depth}pass")
+
+    def _local(self, ref, for_write=False):
+        key = name_id(ref)
+        if key in self.constants:
+            if for_write:
+                raise RuntimeError_(f"Affectation à la constante {ref.name}", ref.lineno, ref.col)
+            return None
+        name = self.locals.get(key)
+        if name is None:
+            raise RuntimeError_(f"Variable non déclarée: {ref.name}", ref.lineno, ref.col)
+        return name
+
+    def _assign(self, node, depth):
+        target = self._local(node.target, for_write=True)
+        value = self._expression(node.value, node)[0]
+        # Valeur déjà réelle (littéral ou type inféré): pas de conversion
+        if self.types[name_id(node.target)] == 'real' and not (
+                getattr(node.value, 'inferred_type', None) == 'real'
+                or (isinstance(node.value, Literal) and isinstance(node.value.value, float))):
+            value = f"float({value})"
+        self._emit(f"{target} = {value}", depth, node)
+
+    def _if(self, node, depth):
+        self._emit(f"if {self._expression(node.condition, node)[0]}:", depth, node)
+        self._sequence((node.then_stmt,), depth + 1)
+        if node.else_stmt is not None:
+            self.lines.append(f"{'    ' * depth}else:")
+            self._sequence((node.else_stmt,), depth + 1)
+
+    def _while(self, node, depth):
+        self._emit(f"while {self._expression(node.condition, node)[0]}:", depth, node)
+        self._sequence((node.body,), depth + 1)
+
+    def _for(self, node, depth):
+        target = self._local(node.var, for_write=True)
+        start = self._expression(node.start, node)[0]
+        end, precedence = self._expression(node.end, node)
+        if precedence < _SUM:
+            end = f"({end})"
+        # Le + 1 / - 1 de range() n'est pas un opérateur Pascal
+        self._operators.append(None)
+        if node.direction == 'to':
+            bounds = f"{start}, {end} + 1"
+        else:
+            bounds = f"{start}, {end} - 1, -1"
+        self._emit(f"for {target} in range({bounds}):", depth, node)
+        self._sequence((node.body,), depth + 1)
+
+    def _repeat(self, node, depth):
+        self.lines.append(f"{'    ' * depth}while True:")
+        self._sequence(node.body, depth + 1)
+        self._emit(f"if {self._expression(node.condition, node)[0]}:", depth + 1, node)
+        self.lines.append(f"{'    ' * (depth + 2)}break")
+
+    def _compound(self, node, depth):
+        self._sequence(node.statements, depth)
+
+    # Expressions: retourne (texte Python, priorité)
+
+    def _expression(self, node, statement):
+        if node is None:
+            raise RuntimeError_("Expression manquante", statement.lineno, statement.col)
+        cls = node.__class__
+        if cls is Literal:
+            return self._literal(node.value)
+        if cls is VarRef:
+            name = self._local(node)
+            if name is None:
+                return self._literal(self.constants[name_id(node)])
+            return name, _ATOM
+        if cls is BinaryOp:
+            return self._binary(node, statement)
+        if cls is UnaryOp:
+            return self._unary(node, statement)
+        raise RuntimeError_(f"Expression non supportée: {cls.__name__}", statement.lineno, statement.col)
+
+    def _literal(self, value):
+        if value.__class__ is float and not math.isfinite(value):
+            # repr donnerait inf / nan, des noms inconnus du code généré
+            return f"float('{value!r}')", _ATOM
+        text = repr(value)
+        return text, _UNARY if text.startswith('-') else _ATOM
+
+    def _binary(self, node, statement):
+        op = normalize_op(node.op)
+        left, left_precedence = self._expression(node.left, statement)
+        if op in _ARITHMETIC:
+            # Après l'opérande gauche: même ordre que les opérateurs dans le texte
+            self._operators.append((node.lineno, node.col))
+        right, right_precedence = self._expression(node.right, statement)
+        call = _CALLS.get(op)
+        if call is not None:
+            return f"{call}({left}, {right})", _ATOM
+        if op not in _BINARY:
+            raise RuntimeError_(f"Opérateur inconnu: {node.op}", node.lineno, node.col)
+        symbol, precedence = _BINARY[op]
+        # Les comparaisons Python s'enchaînent (a < b < c): toujours parenthéser
+        if left_precedence < precedence or (precedence == _COMPARE and left_precedence == _COMPARE):
+            left = f"({left})"
+        if right_precedence <= precedence:
+            right = f"({right})"
+        return f"{left}{symbol}{right}", precedence
+
+    def _unary(self, node, statement):
+        op = normalize_op(node.op)
+        operand, precedence = self._expression(node.operand, statement)
+        if op == 'uminus':
+            symbol, result = '-', _UNARY
+        elif op == 'not':
+            symbol, result = 'not ', _NOT
+        else:
+            raise RuntimeError_(f"Opérateur inconnu: {node.op}", node.lineno, node.col)
+        if precedence < result:
+            operand = f"({operand})"
+        return f"{symbol}{operand}", result
+
+
+_code_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def transpile(program, transpiler=None, source=None):
+    """Traduit et compile un Program, sans passer par le cache"""
+    if transpiler is None:
+        transpiler = PythonTranspiler(program)
+    try:
+        if source is None:
+            source = transpiler.source()
+        code = compile(source, FILENAME, 'exec')
+    except (RecursionError, MemoryError):
+        raise RuntimeError_("Expression trop profonde pour le moteur Python",
+                            program.lineno, program.col) from None
+    namespace = dict(_GLOBALS)
+    exec(code, namespace)
+    return PythonProgram(program.name, source, namespace[FUNCTION_NAME],
+                         transpiler.positions, transpiler.names)
+
+
+def compile_program(program, key=None):
+    """Programme traduit, mis en cache par key (empreinte du source Pascal).
+    Sans clé, l'empreinte du source Python généré évite seulement compile()."""
+    transpiler = source = None
+    if key is None:
+        transpiler = PythonTranspiler(program)
+        source = transpiler.source()
+        key = 'py:' + hashlib.sha256(source.encode('utf-8')).hexdigest()
+    with _cache_lock:
+        compiled = _code_cache.get(key)
+        if compiled is not None:
+            _code_cache.move_to_end(key)
+            return compiled
+    compiled = transpile(program, transpiler, source)
+    with _cache_lock:
+        _code_cache[key] = compiled
+        while len(_code_cache) > CODE_CACHE_SIZE:
+            _code_cache.popitem(last=False)
+    return compiled
+
+
+def clear_cache():
+    with _cache_lock:
+        _code_cache.clear()
+
+
+def run(compiled):
+    """Exécute le programme traduit; retourne les variables finales"""
+    try:
+        values = compiled.function()
+    except TypeError as e:
+        lineno, col = _error_position(compiled)
+        if "'float' object cannot be interpreted as an integer" in str(e):
+            raise RuntimeError_("Les bornes d'une boucle for doivent être entières",
+                                lineno, col) from None
+        raise RuntimeError_(f"Erreur de type: {e}", lineno, col) from None
+    except ArithmeticError as e:
+        # Position de l'opérateur fautif (sinon de l'instruction, par exemple pour float())
+        raise arithmetic_error(e, *_error_position(compiled, operator=True)) from None
+    except RecursionError as e:
+        lineno, col = _error_position(compiled)
+        raise RuntimeError_(f"{e} à la ligne {lineno}, colonne {col}", lineno, col) from None
+    return dict(zip(compiled.names, values))
+
+
+def _error_position(compiled, operator=False):
+    """Position Pascal de l'instruction où l'exception en cours a été levée;
+    avec operator, celle de l'opérateur arithmétique fautif s'il est connu"""
+    tb = sys.exc_info()[2]
+    code = compiled.code
+    frame_tb = None
+    while tb is not None:
+        if tb.tb_frame.f_code is code:
+            frame_tb = tb
+        tb = tb.tb_next
+    if frame_tb is None:
+        return 0, 0
+    position = compiled.positions.get(frame_tb.tb_lineno)
+    if position is None:
+        return 0, 0
+    line, col, operators = position
+    if operator and operators and hasattr(code, 'co_positions'):
+        # Colonnes Python de l'instruction fautive (opération, ou appel de _div / _mod)
+        _, _, start, end = list(code.co_positions())[frame_tb.tb_lasti // 2]
+        spans = compiled.operator_spans(frame_tb.tb_lineno)
+        if len(spans) == len(operators) and (start, end) in spans:
+            found = operators[spans.index((start, end))]
+            if found is not None:
+                return found
+    return line, col
@@ -0,0 +1,167 @@
+"""
+Parcours de l'AST sans récursion, partagé par les analyses
+
+Walker appelle enter_<Classe>(nœud) avant les enfants et leave_<Classe>(nœud) après,
+avec une pile explicite: la profondeur de l'arbre ne touche pas la pile Python.
+Transformer reconstruit l'arbre en post-ordre: leave_<Classe> rend le nœud de
+remplacement, et seuls les nœuds dont un enfant a changé sont recopiés.
+
+Les méthodes sont cherchées une fois par sous-classe (__init_subclass__), pas à chaque nœud.
+"""
+from dataclasses import replace
+
+from ast_1 import CHILD_FIELDS
+
+# Retour de enter_*: ne pas descendre dans les enfants du nœud
+SKIP = object()
+# Retour de leave_* (Transformer): nœud supprimé de sa liste (None hors d'une liste)
+REMOVED = object()
+
+
+def _dispatch(cls, prefix, node_classes):
+    """Classe de nœud -> méthode prefix<Classe>, pour celles que cls définit"""
+    table = {}
+    for node_cls in node_classes:
+        method = getattr(cls, prefix + node_cls.__name__, None)
+        if method is not None:
+            table[node_cls] = method
+    return table
+
+
+class Walker:
+    """Parcours en profondeur, enfants dans l'ordre de children (par défaut
+    ast_1.CHILD_FIELDS); les éléments None des listes et champs sont ignorés"""
+
+    # Classe de nœud -> champs enfants parcourus: (nom, True) pour une liste
+    children = CHILD_FIELDS
+    _enter = _leave = {}
+    # Enfants dans l'ordre inverse, pour la pile
+    _pushed = {node_cls: tuple(reversed(fields)) for node_cls, fields in CHILD_FIELDS.items()}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._enter = _dispatch(cls, 'enter_', cls.children)
+        cls._leave = _dispatch(cls, 'leave_', cls.children)
+        cls._pushed = {node_cls: tuple(reversed(fields))
+                       for node_cls, fields in cls.children.items()}
+
+    def generic_visit(self, node):
+        """Nœud d'une classe absente de children"""
+        raise TypeError(f"Nœud non supporté: {type(node).__name__}")
+
+    def walk(self, root):
+        if root is None:
+            return
+        enter, leave, pushed = self._enter, self._leave, self._pushed
+        stack = [root]
+        pop, push = stack.pop, stack.append
+        while stack:
+            node = pop()
+            cls = node.__class__
+            if cls is _Leave:
+                node = node.node
+                leave[node.__class__](self, node)
+                continue
+            fields = pushed.get(cls)
+            if fields is None:
+                self.generic_visit(node)
+                continue
+            hook = enter.get(cls)
+            if hook is not None and hook(self, node) is SKIP:
+                continue
+            if cls in leave:
+                push(_Leave(node))
+            for name, is_list in fields:
+                value = getattr(node, name)
+                if value is None:
+                    continue
+                if is_list:
+                    for position in range(len(value) - 1, -1, -1):
+                        if value[position] is not None:
+                            push(value[position])
+                else:
+                    push(value)
+
+
+class _Leave:
+    """Nœud dont les enfants ont été parcourus"""
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+
+class Transformer(Walker):
+    """Réécriture en post-ordre: leave_<Classe>(nœud) rend le nœud, un autre nœud
+    ou REMOVED. L'arbre d'entrée n'est jamais modifié. enter_* peut rendre SKIP
+    pour garder un sous-arbre tel quel."""
+
+    def transform(self, root):
+        """Retourne la racine réécrite (root lui-même si rien n'a changé)"""
+        if root is None:
+            return None
+        result = [None]
+        stack = [(root, result, 0)]
+        pop = stack.pop
+        while stack:
+            node, parent, index = pop()
+            if node.__class__ is _Frame:
+                # Enfants terminés: on reconstruit le nœud et on le rend au parent
+                parent[index] = self._rebuild(node)
+            else:
+                parent[index] = self._enter_node(node, parent, index, stack)
+        return result[0]
+
+    def _enter_node(self, node, parent, index, stack):
+        """Empile la fin du nœud puis ses enfants; les résultats arrivent dans values.
+        Retourne la valeur provisoire de la place du nœud chez son parent."""
+        cls = node.__class__
+        fields = self._pushed.get(cls)
+        if fields is None:
+            self.generic_visit(node)
+            return node
+        hook = self._enter.get(cls)
+        if hook is not None and hook(self, node) is SKIP:
+            return node
+        values = {}
+        stack.append((_Frame(node, values), parent, index))
+        push = stack.append
+        for name, is_list in fields:
+            value = getattr(node, name)
+            if value is None:
+                continue
+            if is_list:
+                items = values[name] = list(value)
+                for position in range(len(items) - 1, -1, -1):
+                    if items[position] is not None:
+                        push((items[position], items, position))
+            else:
+                values[name] = value
+                push((value, values, name))
+        return node
+
+    def _rebuild(self, frame):
+        node = frame.node
+        changes = {}
+        for name, value in frame.values.items():
+            original = getattr(node, name)
+            if value.__class__ is list:
+                if any(item is REMOVED for item in value):
+                    value = [item for item in value if item is not REMOVED]
+                if len(value) != len(original) or any(a is not b for a, b in zip(value, original)):
+                    changes[name] = value
+            elif value is not original:
+                changes[name] = None if value is REMOVED else value
+        if changes:
+            node = replace(node, **changes)
+        hook = self._leave.get(node.__class__)
+        return hook(self, node) if hook is not None else node
+
+
+class _Frame:
+    """Nœud dont les enfants sont en cours de réécriture (values: champ -> résultat)"""
+    __slots__ = ('node', 'values')
+
+    def __init__(self, node, values):
+        self.node = node
+        self.values = values